@@ -0,0 +1,355 @@
+"""
+Analyse de cohérence de l'adressage et des références de couches.
+
+Les net devices (et certains nœuds) désignent par index une pile
+`phyLayer[i]` / `macLayer[i]` / `networkLayer[i]` ; les applications visent
+des adresses IPv4 qui doivent appartenir à un sous-réseau déclaré. Les
+erreurs n'apparaissent sinon qu'à l'exécution ns-3.
+
+Contrôles :
+- piles : nombres de couches différents, types phy/mac incohérents, adresse
+  ou masque invalides, passerelle hors du sous-réseau, sous-réseaux en double
+  ou qui se chevauchent ;
+- nœuds : index de couche mal formé (pas un entier) ou inexistant, type du
+  net device différent de celui de la pile, adresse d'application invalide / hors de tout sous-réseau /
+  adresse de réseau ou de diffusion ;
+- LTE : rôle manquant, bearers sur un eNB ou absents sur un UE, pile sans eNB,
+  rôle ou bearers sur un device Wi-Fi.
+
+Index tenus à jour nœud par nœud : pile -> nœuds qui l'utilisent, adresse ->
+nœuds qui la visent, nombre d'eNB par pile. Une modification ne réanalyse
+que le nœud touché et, si besoin, ceux qui dépendent de la même pile ou
+adresse. Les nœuds paresseux non décodés sont analysés depuis leur JSON brut.
+"""
+import ipaddress
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Literal, Optional, Set, Tuple
+
+from backend.models import Scenario
+from backend.serializer import LazyNode
+from backend.tracking import SECTIONS, NodeTracker
+
+ADDRESS_FIELDS = (("destination_ipv4_address", "DestinationIpv4Address"), ("remote_address", "RemoteAddress"))
+
+# --- Résultats ---
+
+@dataclass(frozen=True)
+class Issue:
+    severity: Literal["error", "warning"]
+    code: str
+    message: str
+    path: Tuple[Any, ...] = ()   # relatif au nœud (ou à la racine pour les piles)
+
+Issues = Tuple[Issue, ...]
+
+# --- Faits extraits d'un nœud ---
+
+@dataclass
+class NodeFacts:
+    devices: List[Tuple[Optional[str], Optional[int], Optional[str], int]] = field(default_factory=list)
+    layer: Optional[int] = None                                            # network_layer du nœud
+    addresses: List[Tuple[Tuple[Any, ...], str]] = field(default_factory=list)
+    invalid: List[Tuple[Tuple[Any, ...], Any]] = field(default_factory=list)  # index de couche mal formés
+
+def _layer_ref(facts: NodeFacts, path: Tuple[Any, ...], value: Any) -> Optional[int]:
+    """Index de couche utilisable ; une autre valeur qu'un entier est notée comme anomalie."""
+    if value is None or type(value) is int:
+        return value
+    facts.invalid.append((path, value))
+    return None
+
+def _count(value: Any) -> int:
+    return len(value) if isinstance(value, list) else 0
+
+def _raw_facts(raw: Dict[str, Any]) -> NodeFacts:
+    facts = NodeFacts()
+    facts.layer = _layer_ref(facts, ("network_layer",), raw.get("networkLayer"))
+    for d, dev in enumerate(raw.get("netDevices") or []):
+        if isinstance(dev, dict):
+            layer = _layer_ref(facts, ("net_devices", d, "network_layer"), dev.get("networkLayer"))
+            facts.devices.append((dev.get("type"), layer, dev.get("role"), _count(dev.get("bearers"))))
+    for a, app in enumerate(raw.get("applications") or []):
+        if not isinstance(app, dict):
+            continue
+        attrs = {item.get("name"): item.get("value") for item in app.get("attributes") or [] if isinstance(item, dict)}
+        for field_name, ns3_name in ADDRESS_FIELDS:
+            if attrs.get(ns3_name):
+                facts.addresses.append((("applications", a, field_name), attrs[ns3_name]))
+    return facts
+
+def node_facts(node) -> NodeFacts:
+    """Références d'un nœud (dataclass, ou JSON brut pour un LazyNode non décodé)."""
+    if isinstance(node, LazyNode):
+        raw, node = node.peek()
+        if raw is not None:
+            return _raw_facts(raw)
+    facts = NodeFacts()
+    facts.layer = _layer_ref(facts, ("network_layer",), getattr(node, "network_layer", None))
+    for d, dev in enumerate(getattr(node, "net_devices", None) or []):
+        layer = _layer_ref(facts, ("net_devices", d, "network_layer"), dev.network_layer)
+        facts.devices.append((dev.type, layer, dev.role, _count(dev.bearers)))
+    for a, app in enumerate(getattr(node, "applications", None) or []):
+        for field_name, _ in ADDRESS_FIELDS:
+            value = getattr(app, field_name, None)
+            if value:
+                facts.addresses.append((("applications", a, field_name), value))
+    return facts
+
+# --- Piles de couches ---
+
+@dataclass
+class _Stack:
+    phy: Optional[str]
+    mac: Optional[str]
+    network: Optional[ipaddress.IPv4Network]
+
+def _parse_network(layer) -> Tuple[Optional[ipaddress.IPv4Network], Optional[str]]:
+    try:
+        return ipaddress.IPv4Network(f"{layer.address}/{layer.mask}", strict=False), None
+    except (ipaddress.AddressValueError, ipaddress.NetmaskValueError, ValueError) as e:
+        return None, str(e)
+
+def _layer_issues(scenario: Scenario) -> Tuple[List[_Stack], List[Issue]]:
+    phy, mac, net = scenario.phyLayer or [], scenario.macLayer or [], scenario.networkLayer or []
+    issues = []
+    if not (len(phy) == len(mac) == len(net)):
+        issues.append(Issue("warning", "layer-count",
+                            f"Nombre de couches différent : phy {len(phy)}, mac {len(mac)}, réseau {len(net)}"))
+    stacks = []
+    for i in range(max(len(phy), len(mac), len(net))):
+        p = phy[i].type if i < len(phy) else None
+        m = mac[i].type if i < len(mac) else None
+        if p and m and p != m:
+            issues.append(Issue("error", "layer-type", f"Pile {i} : phy {p} / mac {m}", ("macLayer", i, "type")))
+        network = None
+        if i < len(net):
+            network, error = _parse_network(net[i])
+            if error:
+                issues.append(Issue("error", "subnet-invalid", f"Réseau {i} : {error}", ("networkLayer", i)))
+            elif net[i].gateway:
+                try:
+                    gateway = ipaddress.IPv4Address(net[i].gateway)
+                except ipaddress.AddressValueError:
+                    issues.append(Issue("error", "gateway-invalid", f"Réseau {i} : passerelle {net[i].gateway} invalide",
+                                        ("networkLayer", i, "gateway")))
+                else:
+                    if gateway not in network:
+                        issues.append(Issue("warning", "gateway-subnet",
+                                            f"Réseau {i} : passerelle {gateway} hors de {network}",
+                                            ("networkLayer", i, "gateway")))
+        stacks.append(_Stack(p, m, network))
+
+    for i, a in enumerate(stacks):
+        for j in range(i + 1, len(stacks)):
+            b = stacks[j]
+            if a.network is None or b.network is None:
+                continue
+            if a.network == b.network:
+                issues.append(Issue("error", "subnet-duplicate", f"Réseaux {i} et {j} : même sous-réseau {a.network}",
+                                    ("networkLayer", j, "address")))
+            elif a.network.overlaps(b.network):
+                issues.append(Issue("warning", "subnet-overlap",
+                                    f"Réseaux {i} ({a.network}) et {j} ({b.network}) se chevauchent",
+                                    ("networkLayer", j, "address")))
+    return stacks, issues
+
+# --- Moteur ---
+
+class ConsistencyAnalyzer(NodeTracker):
+    """
+    Analyse incrémentale. Chaque méthode de mise à jour retourne les nœuds dont
+    la liste d'anomalies a changé : {id(nœud): anomalies} (tuple vide = corrigé).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stacks: List[_Stack] = []
+        self.layer_issues: List[Issue] = []
+        self._facts: Dict[int, NodeFacts] = {}
+        self._issues: Dict[int, Issues] = {}
+        self._layer_users: Dict[int, Set[int]] = {}    # index de pile -> nœuds
+        self._address_refs: Dict[str, Set[int]] = {}   # adresse visée -> nœuds
+        self._enb: Counter = Counter()                  # index de pile -> nombre d'eNB
+
+    def build(self, scenario: Scenario) -> Dict[int, Issues]:
+        self.__init__()
+        self.stacks, self.layer_issues = _layer_issues(scenario)
+        for section in SECTIONS:
+            for node in getattr(scenario, section, None) or []:
+                self._register(section, node)
+        return self._recheck(self._nodes)
+
+    # Index
+
+    def _register(self, section: str, node):
+        key = id(node)
+        facts = node_facts(node)
+        self._track(section, node)
+        self._facts[key] = facts
+        for layer in self._layers_of(facts):
+            self._layer_users.setdefault(layer, set()).add(key)
+        for _, address in facts.addresses:
+            self._address_refs.setdefault(address, set()).add(key)
+        for dev_type, layer, role, _ in facts.devices:
+            if dev_type == "lte" and role == "eNB" and layer is not None:
+                self._enb[layer] += 1
+
+    def _unregister(self, node) -> Optional[NodeFacts]:
+        key = id(node)
+        if self._untrack(node) is None:
+            return None
+        facts = self._facts.pop(key)
+        for layer in self._layers_of(facts):
+            users = self._layer_users.get(layer)
+            if users is not None:
+                users.discard(key)
+                if not users:
+                    del self._layer_users[layer]
+        for _, address in facts.addresses:
+            refs = self._address_refs.get(address)
+            if refs is not None:
+                refs.discard(key)
+                if not refs:
+                    del self._address_refs[address]
+        for dev_type, layer, role, _ in facts.devices:
+            if dev_type == "lte" and role == "eNB" and layer is not None:
+                self._enb[layer] -= 1
+                if self._enb[layer] <= 0:
+                    del self._enb[layer]
+        return facts
+
+    @staticmethod
+    def _layers_of(facts: NodeFacts) -> Set[int]:
+        layers = {layer for _, layer, _, _ in facts.devices if layer is not None}
+        if facts.layer is not None:
+            layers.add(facts.layer)
+        return layers
+
+    # Mises à jour
+
+    def update_node(self, section: str, node) -> Dict[int, Issues]:
+        """Réanalyse un nœud modifié (et les UE de ses piles si son rôle eNB a changé)."""
+        key = id(node)
+        enb_before = set(self._enb)
+        old_facts = self._unregister(node)
+        self._register(section, node)
+        dirty = {key}
+        if old_facts is not None:
+            # Nombre d'eNB modifié : les UE des piles concernées changent de diagnostic
+            for layer in enb_before ^ set(self._enb):
+                dirty |= self._layer_users.get(layer, set())
+        return self._recheck(dirty)
+
+    def remove_node(self, node) -> Dict[int, Issues]:
+        key = id(node)
+        enb_before = set(self._enb)
+        facts = self._unregister(node)
+        if facts is None:
+            return {}
+        self._issues.pop(key, None)
+        changed = {key: ()}
+        dirty = set()
+        for layer in enb_before ^ set(self._enb):
+            dirty |= self._layer_users.get(layer, set())
+        changed.update(self._recheck(dirty))
+        return changed
+
+    def update_layers(self, scenario: Scenario) -> Dict[int, Issues]:
+        """Piles modifiées : seuls les nœuds utilisant une pile changée ou visant une adresse sont revus."""
+        old = self.stacks
+        self.stacks, self.layer_issues = _layer_issues(scenario)
+        dirty = set()
+        for i in range(max(len(old), len(self.stacks))):
+            before = old[i] if i < len(old) else None
+            after = self.stacks[i] if i < len(self.stacks) else None
+            if before != after:
+                dirty |= self._layer_users.get(i, set())
+        if [s.network for s in old] != [s.network for s in self.stacks]:
+            for refs in self._address_refs.values():
+                dirty |= refs
+        return self._recheck(dirty)
+
+    # Diagnostic
+
+    def _recheck(self, keys: Iterable[int]) -> Dict[int, Issues]:
+        changed = {}
+        for key in keys:
+            facts = self._facts.get(key)
+            if facts is None:
+                continue
+            issues = tuple(self._node_issues(facts))
+            if self._issues.get(key, ()) != issues:
+                changed[key] = issues
+            if issues:
+                self._issues[key] = issues
+            else:
+                self._issues.pop(key, None)
+        return changed
+
+    def _node_issues(self, facts: NodeFacts) -> List[Issue]:
+        issues = [
+            Issue("error", "layer-invalid", f"Index de couche {value!r} : entier attendu", path)
+            for path, value in facts.invalid
+        ]
+        count = len(self.stacks)
+        if facts.layer is not None and not 0 <= facts.layer < count:
+            issues.append(Issue("error", "layer-dangling", f"Couche réseau {facts.layer} inexistante", ("network_layer",)))
+
+        for d, (dev_type, layer, role, bearers) in enumerate(facts.devices):
+            path = ("net_devices", d)
+            if layer is not None:
+                if not 0 <= layer < count:
+                    issues.append(Issue("error", "layer-dangling", f"Device {d} : couche {layer} inexistante",
+                                        path + ("network_layer",)))
+                else:
+                    stack = self.stacks[layer]
+                    stack_type = stack.phy or stack.mac
+                    if stack_type and dev_type and dev_type != stack_type:
+                        issues.append(Issue("error", "layer-type",
+                                            f"Device {d} ({dev_type}) sur une pile {stack_type} (couche {layer})",
+                                            path + ("type",)))
+            if dev_type == "lte":
+                if role is None:
+                    issues.append(Issue("error", "lte-role", f"Device LTE {d} sans rôle (UE / eNB)", path + ("role",)))
+                elif role == "eNB" and bearers:
+                    issues.append(Issue("warning", "lte-bearer", f"Device {d} : bearers définis sur un eNB",
+                                        path + ("bearers",)))
+                elif role == "UE":
+                    if not bearers:
+                        issues.append(Issue("warning", "lte-bearer", f"Device {d} : UE sans bearer", path + ("bearers",)))
+                    if layer is not None and 0 <= layer < count and not self._enb.get(layer):
+                        issues.append(Issue("error", "lte-enb", f"Device {d} : aucun eNB sur la couche {layer}",
+                                            path + ("network_layer",)))
+            elif role is not None or bearers:
+                issues.append(Issue("warning", "lte-role", f"Device {d} ({dev_type}) : rôle/bearers LTE ignorés",
+                                    path + ("role",)))
+
+        networks = [s.network for s in self.stacks if s.network is not None]
+        for path, address in facts.addresses:
+            try:
+                ip = ipaddress.IPv4Address(address)
+            except ipaddress.AddressValueError:
+                issues.append(Issue("error", "address-invalid", f"Adresse {address} invalide", path))
+                continue
+            containing = [n for n in networks if ip in n]
+            if not containing:
+                if networks and not (ip.is_loopback or ip.is_multicast or ip == ipaddress.IPv4Address("255.255.255.255")):
+                    issues.append(Issue("warning", "address-subnet", f"Adresse {address} hors des sous-réseaux déclarés", path))
+            elif any(ip == n.network_address or ip == n.broadcast_address for n in containing if n.prefixlen < 31):
+                issues.append(Issue("error", "address-reserved", f"Adresse {address} : adresse de réseau ou de diffusion", path))
+        return issues
+
+    # Consultation
+
+    def issues_for(self, node) -> Issues:
+        return self._issues.get(id(node), ())
+
+    def flagged(self) -> Dict[int, Issues]:
+        return dict(self._issues)
+
+    def users_of_layer(self, layer: int) -> List[Any]:
+        return [self._nodes[k][1] for k in self._layer_users.get(layer, ())]
+
+    def nodes_targeting(self, address: str) -> List[Any]:
+        return [self._nodes[k][1] for k in self._address_refs.get(address, ())]
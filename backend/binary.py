@@ -0,0 +1,206 @@
+"""
+Format binaire compact pour les scénarios (.iodb).
+
+Disposition du fichier (entiers non signés 64 bits little-endian) :
+
+    MAGIC (8 octets) | version | offset/longueur du graphe | offset/compte du pool float64
+    | offset/compte du pool int64 | empreinte du schéma (16 octets)
+    | [graphe] | [pool float64] | [pool int64]
+
+- Le graphe de dataclasses est sérialisé avec `pickle` (protocole 5). Le
+  chargement n'accepte que les classes de `backend.models`.
+- Les listes numériques homogènes (positions, boundaries, speed_coefficients,
+  power_consumption, ...) sont sorties du graphe et rangées dans deux pools
+  typés alignés sur 8 octets, lisibles par `mmap` sans copie (`open_pools`).
+
+La conversion vers/depuis le JSON IoD-Sim passe par `serializer` et est sans
+perte : le graphe contient exactement les dataclasses produites par le décodeur.
+
+Le graphe dépend des noms de classes et de champs de `backend.models` :
+l'empreinte du schéma est vérifiée au chargement, et un fichier écrit avec un
+autre modèle est refusé avec un message explicite (le JSON reste le format
+d'échange durable ; `.iodb` se régénère depuis le JSON).
+"""
+import copy
+import gc
+import hashlib
+import io
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from dataclasses import fields, is_dataclass
+from typing import Dict, Tuple
+
+from backend import models
+from backend.models import Scenario
+from backend.serializer import LAZY_SECTIONS, resolve
+
+MAGIC = b"IODSIMB\x00"
+VERSION = 2
+EXTENSION = ".iodb"
+
+_HEADER = struct.Struct("<8s7Q16s")
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_LITTLE = sys.byteorder == "little"
+
+def schema_digest() -> bytes:
+    """Empreinte des classes de `backend.models` et de leurs noms de champs (ce dont dépend le graphe)."""
+    layout = sorted(
+        f"{name}:{','.join(sorted(f.name for f in fields(cls)))}"
+        for name, cls in vars(models).items()
+        if isinstance(cls, type) and is_dataclass(cls) and cls.__module__ == models.__name__
+    )
+    return hashlib.blake2b("\n".join(layout).encode("utf-8"), digest_size=16).digest()
+
+SCHEMA = schema_digest()
+
+# --- Écriture ---
+
+class _PoolPickler(pickle.Pickler):
+    """Remplace les listes numériques homogènes par une référence dans un pool typé."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=5)
+        self.floats = array("d")
+        self.ints = array("q")
+
+    def persistent_id(self, obj):
+        if type(obj) is not list or not obj:
+            return None
+        kinds = {type(v) for v in obj}
+        if kinds == {float}:
+            offset = len(self.floats)
+            self.floats.extend(obj)
+            return ("d", offset, len(obj))
+        if kinds == {int} and _INT64_MIN <= min(obj) and max(obj) <= _INT64_MAX:
+            offset = len(self.ints)
+            self.ints.extend(obj)
+            return ("q", offset, len(obj))
+        return None
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+def dumps_binary(scenario: Scenario) -> bytes:
+    # Nœuds paresseux : on enregistre les dataclasses, pas les proxies
+    scenario = copy.copy(scenario)
+    for section in LAZY_SECTIONS:
+        setattr(scenario, section, [resolve(node) for node in getattr(scenario, section)])
+
+    buf = io.BytesIO()
+    pickler = _PoolPickler(buf)
+    pickler.dump(scenario)
+    graph = buf.getvalue()
+
+    floats, ints = pickler.floats, pickler.ints
+    if not _LITTLE:
+        floats.byteswap()
+        ints.byteswap()
+
+    graph_off = _HEADER.size
+    float_off = graph_off + len(graph) + _pad(graph_off + len(graph))
+    int_off = float_off + len(floats) * 8
+
+    header = _HEADER.pack(MAGIC, VERSION, graph_off, len(graph), float_off, len(floats), int_off, len(ints), SCHEMA)
+    return b"".join([
+        header, graph, b"\0" * _pad(graph_off + len(graph)),
+        floats.tobytes(), ints.tobytes(),
+    ])
+
+def save_scenario_binary(scenario: Scenario, file_path: str):
+    data = dumps_binary(scenario)
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+# --- Lecture ---
+
+class _PoolUnpickler(pickle.Unpickler):
+    """Restaure les listes depuis les pools et n'autorise que les dataclasses du modèle."""
+
+    def __init__(self, file, pools):
+        super().__init__(file)
+        self.pools = pools
+
+    def persistent_load(self, pid):
+        kind, offset, count = pid
+        return self.pools[kind][offset:offset + count].tolist()
+
+    def find_class(self, module, name):
+        if module == models.__name__:
+            cls = getattr(models, name, None)
+            if isinstance(cls, type) and is_dataclass(cls):
+                return cls
+        raise pickle.UnpicklingError(f"Classe interdite dans un fichier {EXTENSION}: {module}.{name}")
+
+_REGENERATE = f"régénérez le fichier {EXTENSION} depuis le scénario JSON (binary.json_to_binary)"
+
+def _read_header(buf) -> Tuple[int, ...]:
+    if len(buf) < 16:
+        raise ValueError("Fichier binaire tronqué")
+    magic, version = struct.unpack_from("<8sQ", buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas un scénario binaire IoD-Sim")
+    if version != VERSION:
+        raise ValueError(f"Version de format {EXTENSION} non supportée : {version} (attendue : {VERSION}) ; {_REGENERATE}")
+    if len(buf) < _HEADER.size:
+        raise ValueError("Fichier binaire tronqué")
+    _, _, *offsets, schema = _HEADER.unpack_from(buf, 0)
+    if schema != SCHEMA:
+        raise ValueError(f"Fichier {EXTENSION} écrit avec une autre version du modèle (backend/models.py) ; {_REGENERATE}")
+    return tuple(offsets)
+
+def _pools_from(buf, offsets) -> Dict[str, memoryview]:
+    _, _, float_off, float_count, int_off, int_count = offsets
+    view = memoryview(buf)
+    floats = view[float_off:float_off + float_count * 8]
+    ints = view[int_off:int_off + int_count * 8]
+    if _LITTLE:
+        return {"d": floats.cast("d"), "q": ints.cast("q")}
+    # Plateforme big-endian : copie et inversion des octets
+    f, i = array("d", floats.tobytes()), array("q", ints.tobytes())
+    f.byteswap()
+    i.byteswap()
+    return {"d": memoryview(f), "q": memoryview(i)}
+
+def loads_binary(data) -> Scenario:
+    offsets = _read_header(data)
+    graph_off, graph_len = offsets[0], offsets[1]
+    pools = _pools_from(data, offsets)
+    # Le GC cyclique n'a rien à collecter pendant la construction du graphe
+    # mais se déclenche des milliers de fois : on le suspend le temps du chargement.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        graph = data[graph_off:graph_off + graph_len]
+        return _PoolUnpickler(io.BytesIO(graph), pools).load()
+    finally:
+        if gc_enabled:
+            gc.enable()
+        for view in pools.values():
+            view.release()
+
+def load_scenario_binary(file_path: str) -> Scenario:
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return loads_binary(mm)
+
+def open_pools(file_path: str) -> Tuple[mmap.mmap, Dict[str, memoryview]]:
+    """
+    Projette les pools numériques en mémoire sans copie.
+    Retourne (mmap, {"d": float64, "q": int64}) ; libérer les vues avant de fermer le mmap.
+    """
+    with open(file_path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return mm, _pools_from(mm, _read_header(mm))
+
+# --- Conversion JSON <-> binaire ---
+
+def json_to_binary(json_path: str, binary_path: str):
+    from backend import serializer
+    save_scenario_binary(serializer.load_scenario(json_path), binary_path)
+
+def binary_to_json(binary_path: str, json_path: str, indent: bool = True):
+    from backend import serializer
+    serializer.save_scenario(load_scenario_binary(binary_path), json_path, indent=indent)
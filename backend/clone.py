@@ -0,0 +1,158 @@
+"""
+Duplication rapide de nœuds.
+
+Pour chaque type de dataclass, un copieur est compilé une seule fois à partir
+des annotations de ses champs : les primitifs sont partagés, les listes de
+primitifs copiées à plat, les sous-objets copiés par leur propre copieur.
+Aucune introspection n'a lieu pendant la copie (contrairement à deepcopy).
+"""
+import copy
+import ipaddress
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Union, get_args, get_origin
+
+from backend.models import ConstantPositionMobilityModel, ParametricSpeedDroneMobilityModel
+from backend.serializer import resolve
+
+_IMMUTABLE = (str, int, float, bool, type(None))
+_COPIERS: Dict[type, Callable[[Any], Any]] = {}
+
+# --- Copieurs ---
+
+def _copy_value(value: Any) -> Any:
+    """Copie profonde générique (champs `Any`, dicts, unions hétérogènes)."""
+    t = type(value)
+    if t in _IMMUTABLE:
+        return value
+    if t is list:
+        return [_copy_value(v) for v in value]
+    if t is dict:
+        return {k: _copy_value(v) for k, v in value.items()}
+    if is_dataclass(value):
+        return get_copier(t)(value)
+    return copy.deepcopy(value)
+
+def _copy_dataclass(value: Any) -> Any:
+    if value is None:
+        return None
+    # Dispatch sur le type réel : une liste de NodeConfig peut contenir des DroneConfig
+    return get_copier(type(value))(value)
+
+def _copy_flat_list(value: Optional[list]) -> Optional[list]:
+    return None if value is None else value[:]
+
+def _is_immutable_type(tp) -> bool:
+    if tp in _IMMUTABLE:
+        return True
+    if get_origin(tp) is Literal:
+        return True
+    if get_origin(tp) is Union:
+        return all(_is_immutable_type(t) for t in get_args(tp))
+    return False
+
+def _field_copier(tp) -> Optional[Callable[[Any], Any]]:
+    """Fonction de copie pour une annotation (None = valeur partagée)."""
+    if _is_immutable_type(tp):
+        return None
+
+    origin = get_origin(tp)
+    if origin is Union:
+        members = [t for t in get_args(tp) if t is not type(None)]
+        if all(is_dataclass(t) for t in members):
+            return _copy_dataclass
+        if len(members) == 1:
+            return _field_copier(members[0])
+        return _copy_value
+
+    if origin in (list, List):
+        item_type = get_args(tp)[0] if get_args(tp) else Any
+        if _is_immutable_type(item_type):
+            return _copy_flat_list
+        item_copier = _field_copier(item_type) or (lambda v: v)
+        return lambda value: None if value is None else [item_copier(v) for v in value]
+
+    if is_dataclass(tp):
+        return _copy_dataclass
+
+    return _copy_value
+
+def compile_copier(cls) -> Callable[[Any], Any]:
+    """Compile (et met en cache) le copieur profond d'une dataclass."""
+    plan = [(f.name, _field_copier(f.type)) for f in fields(cls)]
+    shared = [name for name, fn in plan if fn is None]
+    copied = [(name, fn) for name, fn in plan if fn is not None]
+
+    def copier(obj):
+        src = obj.__dict__
+        state = {name: src[name] for name in shared}
+        for name, fn in copied:
+            state[name] = fn(src[name])
+        new = object.__new__(cls)
+        new.__dict__.update(state)
+        return new
+
+    copier.__name__ = f"copy_{cls.__name__}"
+    _COPIERS[cls] = copier
+    return copier
+
+def get_copier(cls) -> Callable[[Any], Any]:
+    copier = _COPIERS.get(cls)
+    return copier if copier is not None else compile_copier(cls)
+
+def fast_copy(obj: Any) -> Any:
+    """Copie profonde d'un graphe de dataclasses du modèle."""
+    return _copy_value(resolve(obj))
+
+# --- Surcharges par copie ---
+
+def _offset_position(position: List[float], offset: Sequence[float], factor: int) -> List[float]:
+    return [p + d * factor for p, d in zip(position, offset)] + list(position[len(offset):])
+
+def _apply_offset(node, offset: Sequence[float], factor: int):
+    model = node.mobility_model
+    if isinstance(model, ConstantPositionMobilityModel):
+        model.position = _offset_position(model.position, offset, factor)
+    elif isinstance(model, ParametricSpeedDroneMobilityModel):
+        for point in model.flight_plan:
+            point.position = _offset_position(point.position, offset, factor)
+
+def _increment_ip(address: Optional[str], step: int) -> Optional[str]:
+    if not address:
+        return address
+    try:
+        return str(ipaddress.IPv4Address(address) + step)
+    except (ipaddress.AddressValueError, ValueError):
+        return address
+
+def _apply_ip_step(node, step: int):
+    for app in node.applications:
+        app.destination_ipv4_address = _increment_ip(app.destination_ipv4_address, step)
+        app.remote_address = _increment_ip(app.remote_address, step)
+
+def clone_node(template, count: int, name_pattern: str = "{name}_{i}", start: int = 1,
+               position_offset: Sequence[float] = None, ip_step: int = 0) -> list:
+    """
+    Retourne `count` copies indépendantes de `template`.
+
+    - name_pattern : format du nom ({name} = nom du modèle, {i} = start + k, {k} = rang 0..count-1)
+    - position_offset : décalage (dx, dy, dz) cumulé par copie, appliqué à la position
+      fixe ou à chaque point du plan de vol
+    - ip_step : incrément cumulé par copie des adresses IPv4 des applications
+      (`destination_ipv4_address`, `remote_address`). Un nœud n'a pas d'adresse
+      propre dans le modèle (elle est attribuée par la couche réseau) : seules
+      les adresses visées par ses applications changent.
+    """
+    template = resolve(template)
+    copier = get_copier(type(template))
+    base_name = getattr(template, "name", None) or type(template).__name__
+    clones = []
+    for k in range(count):
+        node = copier(template)
+        if hasattr(node, "name"):
+            node.name = name_pattern.format(name=base_name, i=start + k, k=k)
+        if position_offset is not None and getattr(node, "mobility_model", None) is not None:
+            _apply_offset(node, position_offset, k + 1)
+        if ip_step and hasattr(node, "applications"):
+            _apply_ip_step(node, ip_step * (k + 1))
+        clones.append(node)
+    return clones
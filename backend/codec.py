@@ -0,0 +1,129 @@
+"""
+Couche d'encodage/décodage JSON.
+
+Travaille sur des structures Python simples (dict, list, str, nombres) et
+directement sur des `bytes`. Utilise `orjson` s'il est installé, sinon le
+module `json` standard. La sortie reste du JSON standard consommé par IoD-Sim.
+
+Les deux backends produisent le même texte (indentation de 4 espaces,
+flottants écrits comme `repr()`) pour qu'un fichier versionné ne change pas
+de forme selon l'installation, et rejettent de la même façon NaN / Infinity
+(ValueError), qui ne sont pas du JSON valide : `json` les écrirait tels
+quels, `orjson` les remplacerait par `null`. Ce qu'orjson refuse d'encoder
+(entiers de plus de 64 bits, clés non textuelles) passe par `json`.
+"""
+import json
+import math
+import re
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+INDENT = 4
+_LEADING_SPACES = re.compile(rb"^( +)", re.MULTILINE)
+# orjson écrit les petits flottants en décimal (0.00001) et l'exposant sans
+# signe ni zéro (1e-7, 1e16) ; `json` suit repr() (1e-05, 1e-07, 1e+16)
+_FLOAT_CANDIDATE = rb"(?<![\w.])-?(?:\d+(?:\.\d+)?e[-+]?\d+|0\.0000\d+)(?![\w.])"
+_HAS_FLOAT_CANDIDATE = re.compile(_FLOAT_CANDIDATE)
+_STRING_OR_FLOAT = re.compile(rb'"(?:[^"\\]|\\.)*"|' + _FLOAT_CANDIDATE)
+
+def _repr_float(match) -> bytes:
+    token = match.group(0)
+    return token if token[:1] == b'"' else repr(float(token)).encode("ascii")
+
+def _non_finite_path(obj: Any, path: Tuple[Any, ...] = ()) -> Optional[Tuple[Any, ...]]:
+    """Chemin du premier nombre NaN / infini de `obj` (None s'il n'y en a pas)."""
+    t = type(obj)
+    if t is float:
+        return None if math.isfinite(obj) else path
+    if t is dict:
+        items = obj.items()
+    elif t in (list, tuple):
+        items = enumerate(obj)
+    else:
+        return None
+    for key, value in items:
+        found = _non_finite_path(value, path + (key,))
+        if found is not None:
+            return found
+    return None
+
+def _non_finite_error(obj: Any) -> ValueError:
+    path = _non_finite_path(obj)
+    where = "/".join(str(p) for p in path) if path else "?"
+    return ValueError(f"Nombre non fini en {where} : NaN / Infinity ne sont pas du JSON valide")
+
+def _reject_constant(name: str):
+    raise ValueError(f"{name} n'est pas du JSON valide")
+
+# --- Backends ---
+
+class _StdlibCodec:
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, parse_constant=_reject_constant)
+
+    def dumps(self, obj: Any, indent: bool = True) -> bytes:
+        try:
+            if indent:
+                text = json.dumps(obj, indent=INDENT, ensure_ascii=False, allow_nan=False)
+            else:
+                text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+        except ValueError:
+            raise _non_finite_error(obj) from None
+        return text.encode("utf-8")
+
+class _OrjsonCodec:
+    name = "orjson"
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, indent: bool = True) -> bytes:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # Entier > 64 bits, clé non textuelle... : `json` les accepte
+            return BACKENDS["json"].dumps(obj, indent=indent)
+        # orjson écrit NaN / Infinity comme `null` : on ne parcourt l'objet que si la sortie en contient
+        if b"null" in data and _non_finite_path(obj) is not None:
+            raise _non_finite_error(obj)
+        if _HAS_FLOAT_CANDIDATE.search(data):
+            # Les chaînes sont reconnues et recopiées telles quelles
+            data = _STRING_OR_FLOAT.sub(_repr_float, data)
+        if indent:
+            # orjson n'indente que de 2 espaces ; un saut de ligne ne peut apparaître
+            # dans une chaîne JSON (échappé), les espaces de début de ligne sont donc
+            # toujours de l'indentation
+            data = _LEADING_SPACES.sub(lambda m: m.group(1) * (INDENT // 2), data)
+        return data
+
+BACKENDS = {"json": _StdlibCodec()}
+if orjson is not None:
+    BACKENDS["orjson"] = _OrjsonCodec()
+
+_default = BACKENDS["orjson"] if "orjson" in BACKENDS else BACKENDS["json"]
+
+# --- API ---
+
+def get_backend(name: str = None):
+    """Retourne le backend demandé (ou celui par défaut)."""
+    if name is None:
+        return _default
+    if name not in BACKENDS:
+        raise ValueError(f"Backend JSON indisponible: {name} (disponibles: {', '.join(BACKENDS)})")
+    return BACKENDS[name]
+
+def set_default_backend(name: str):
+    global _default
+    _default = get_backend(name)
+
+def loads(data: bytes, backend: str = None) -> Any:
+    return get_backend(backend).loads(data)
+
+def dumps(obj: Any, indent: bool = True, backend: str = None) -> bytes:
+    return get_backend(backend).dumps(obj, indent=indent)
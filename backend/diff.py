@@ -0,0 +1,316 @@
+"""
+Diff structurel et fusion à trois entre scénarios.
+
+Chaque sous-arbre (dataclass, liste, dict) reçoit une empreinte calculée une
+seule fois par comparaison, à partir de celles de ses enfants : les régions
+identiques sont sautées sans être parcourues. Les listes de nœuds nommés
+(drones, ZSPs, ...) sont alignées par `name` pour que l'insertion d'un drone ne
+décale pas tout le reste du diff.
+
+Un chemin est un tuple d'éléments : `str` pour un champ ou une clé de dict,
+`int` pour un index de liste (ex. ("drones", 3, "mobility_model", "curve_step")).
+Les index d'un changement "removed" désignent la position dans l'ancien
+scénario ; ceux de "added" et "modified", la position dans le nouveau (les
+deux diffèrent quand une liste de nœuds nommés a été réordonnée ou raccourcie).
+"""
+import copy
+import gc
+import hashlib
+import pickle
+from contextlib import contextmanager
+from dataclasses import dataclass, is_dataclass
+from operator import attrgetter
+from typing import Any, Dict, List, Literal, Optional, Tuple, get_args, get_type_hints
+
+from backend.serializer import LazyNode, resolve
+from backend.tracking import SCALARS, field_names
+
+Path = Tuple[Any, ...]
+
+# --- Résultats ---
+
+@dataclass
+class Change:
+    """Différence sémantique entre deux scénarios (index : ancien pour "removed", nouveau sinon)."""
+    path: Path
+    kind: Literal["added", "removed", "modified"]
+    old: Any = None
+    new: Any = None
+
+@dataclass
+class Conflict:
+    """Modification concurrente d'un même chemin (la valeur de `ours` est conservée)."""
+    path: Path
+    base: Any
+    ours: Any
+    theirs: Any
+
+_MISSING = object()
+
+def format_path(path: Path) -> str:
+    """("drones", 3, "mobility_model") -> drones[3].mobility_model"""
+    out = ""
+    for part in path:
+        if isinstance(part, int):
+            out += f"[{part}]"
+        else:
+            out += f".{part}" if out else str(part)
+    return out or "<racine>"
+
+# --- Empreintes de sous-arbres ---
+
+def _is_container(value) -> bool:
+    return isinstance(value, (dict, list, tuple, LazyNode)) or is_dataclass(value)
+
+_SCALARS = SCALARS + (type(None),)
+
+def _holds_dataclass(tp) -> bool:
+    """L'annotation `tp` peut-elle contenir une dataclass (List[FlightPoint], Optional[...], ...) ?"""
+    if isinstance(tp, type):
+        return is_dataclass(tp)
+    return any(_holds_dataclass(arg) for arg in get_args(tp))
+
+_PLANS: Dict[type, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+
+def _plan(cls) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """(champs simples, champs pouvant contenir des dataclasses), d'après les annotations."""
+    plan = _PLANS.get(cls)
+    if plan is None:
+        hints = get_type_hints(cls)
+        names = field_names(cls)
+        nested = tuple(n for n in names if _holds_dataclass(hints.get(n)))
+        plan = _PLANS[cls] = (tuple(n for n in names if n not in nested), nested)
+    return plan
+
+def _blake(*parts: bytes) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+def _leaf_digest(value: Any) -> bytes:
+    if type(value) in _SCALARS:
+        return _blake(type(value).__name__.encode(), repr(value).encode())
+    return _blake(b"P", pickle.dumps(value, protocol=5))
+
+class SubtreeHasher:
+    """
+    Calcule et mémorise l'empreinte (blake2b 128 bits) de chaque sous-arbre.
+
+    L'empreinte d'une dataclass, liste ou dict est composée de celles de ses
+    enfants (arbre de Merkle) : chaque objet n'est haché qu'une fois, quelle que
+    soit la profondeur de la descente du diff. Les champs qui, d'après leur
+    annotation, ne contiennent pas de dataclass (nombres, listes de nombres,
+    JSON brut d'`extra_attributes`) sont hachés ensemble via un seul `repr`.
+    Deux empreintes égales garantissent des contenus égaux ; l'inverse n'est pas
+    garanti (1 et 1.0, ordre des clés d'un dict), ce qui coûte au pire une
+    descente inutile, jamais un changement manqué.
+    """
+
+    def __init__(self):
+        # id(obj) -> (obj, empreinte) ; la référence garde l'id valide
+        self._cache: Dict[int, Tuple[Any, bytes]] = {}
+
+    def _child(self, value: Any) -> bytes:
+        if type(value) in _SCALARS:
+            return _leaf_digest(value)
+        return self.digest(value) if _is_container(value) else _leaf_digest(value)
+
+    def digest(self, obj: Any) -> bytes:
+        # Les nœuds paresseux sont décodés pour être comparés à des dataclasses
+        obj = resolve(obj)
+        cached = self._cache.get(id(obj))
+        if cached is not None and cached[0] is obj:
+            return cached[1]
+        cls = type(obj)
+        h = hashlib.blake2b(f"{cls.__module__}.{cls.__qualname__}".encode(), digest_size=16)
+        if is_dataclass(obj):
+            plain, nested = _plan(cls)
+            h.update(repr(tuple(getattr(obj, name) for name in plain)).encode())
+            for name in nested:
+                h.update(self._child(getattr(obj, name)))
+        elif isinstance(obj, dict):
+            # Indépendante de l'ordre des clés
+            for item in sorted(_blake(self._child(k), self._child(v)) for k, v in obj.items()):
+                h.update(item)
+        elif isinstance(obj, (list, tuple)):
+            item_cls = type(obj[0]) if obj else None
+            if all(type(v) in _SCALARS for v in obj):
+                h.update(repr(obj).encode())   # liste de valeurs simples : un seul `repr` (en C)
+            elif is_dataclass(item_cls) and not _plan(item_cls)[1] and all(type(v) is item_cls for v in obj):
+                # Liste d'objets sans sous-objet (FlightPoint, ...) : hachée d'un bloc,
+                # les éléments ne sont hachés un à un que si le diff y descend
+                h.update(f"{item_cls.__module__}.{item_cls.__qualname__}".encode())
+                get = attrgetter(*_plan(item_cls)[0])
+                h.update(repr([get(v) for v in obj]).encode())
+            else:
+                for item in obj:
+                    h.update(self._child(item))
+        else:
+            h.update(_leaf_digest(obj))
+        digest = h.digest()
+        self._cache[id(obj)] = (obj, digest)
+        return digest
+
+    def same(self, a: Any, b: Any) -> bool:
+        a, b = resolve(a), resolve(b)
+        if a is b:
+            return True
+        if type(a) is not type(b):
+            return False
+        if _is_container(a):
+            return self.digest(a) == self.digest(b)
+        return a == b
+
+def _name_keys(items: list) -> Optional[List[Any]]:
+    """Clés d'alignement par `name` si tous les éléments sont nommés de façon unique."""
+    keys = []
+    for item in items:
+        name = getattr(item, "name", None) if is_dataclass(item) or isinstance(item, LazyNode) else None
+        if name is None:
+            return None
+        keys.append(name)
+    return keys if len(set(keys)) == len(keys) else None
+
+@contextmanager
+def _gc_paused():
+    # Comme au chargement binaire : les empreintes créent des centaines de milliers
+    # d'objets sans cycle, le GC cyclique se déclencherait sans rien collecter
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+# --- Diff ---
+
+def diff(old: Any, new: Any, hasher: SubtreeHasher = None) -> List[Change]:
+    """Liste des changements sémantiques pour passer de `old` à `new`."""
+    changes: List[Change] = []
+    with _gc_paused():
+        _diff(old, new, (), hasher or SubtreeHasher(), changes)
+    return changes
+
+def _diff(old, new, path, hasher, out):
+    old, new = resolve(old), resolve(new)
+    if hasher.same(old, new):
+        return
+
+    if is_dataclass(old) and type(old) is type(new):
+        for name in field_names(type(old)):
+            _diff(getattr(old, name), getattr(new, name), path + (name,), hasher, out)
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                out.append(Change(path + (key,), "removed", old=old[key]))
+            else:
+                _diff(old[key], new[key], path + (key,), hasher, out)
+        for key in new:
+            if key not in old:
+                out.append(Change(path + (key,), "added", new=new[key]))
+        return
+
+    if isinstance(old, list) and isinstance(new, list):
+        old_keys, new_keys = _name_keys(old), _name_keys(new)
+        if old_keys is not None and new_keys is not None:
+            new_index = {k: i for i, k in enumerate(new_keys)}
+            old_set = set(old_keys)
+            for i, key in enumerate(old_keys):
+                if key not in new_index:
+                    out.append(Change(path + (i,), "removed", old=old[i]))
+                else:
+                    j = new_index[key]
+                    _diff(old[i], new[j], path + (j,), hasher, out)
+            for j, key in enumerate(new_keys):
+                if key not in old_set:
+                    out.append(Change(path + (j,), "added", new=new[j]))
+            return
+
+        common = min(len(old), len(new))
+        for i in range(common):
+            _diff(old[i], new[i], path + (i,), hasher, out)
+        for i in range(common, len(old)):
+            out.append(Change(path + (i,), "removed", old=old[i]))
+        for i in range(common, len(new)):
+            out.append(Change(path + (i,), "added", new=new[i]))
+        return
+
+    out.append(Change(path, "modified", old=old, new=new))
+
+# --- Fusion à trois ---
+
+def merge3(base: Any, ours: Any, theirs: Any, hasher: SubtreeHasher = None) -> Tuple[Any, List[Conflict]]:
+    """
+    Fusionne les modifications de `ours` et `theirs` par rapport à `base`.
+    Retourne (résultat, conflits). En cas de conflit, la valeur de `ours` est gardée.
+    Le résultat partage les sous-arbres non modifiés avec les entrées.
+    """
+    conflicts: List[Conflict] = []
+    with _gc_paused():
+        merged = _merge(base, ours, theirs, (), hasher or SubtreeHasher(), conflicts)
+    return merged, conflicts
+
+def _same(hasher, a, b):
+    if a is _MISSING or b is _MISSING:
+        return a is b
+    return hasher.same(a, b)
+
+def _merge(base, ours, theirs, path, hasher, conflicts):
+    base, ours, theirs = resolve(base), resolve(ours), resolve(theirs)
+    if _same(hasher, ours, theirs):
+        return ours
+    if _same(hasher, base, ours):
+        return theirs
+    if _same(hasher, base, theirs):
+        return ours
+
+    # Les deux côtés ont changé : on descend si la structure le permet
+    if all(v is not _MISSING for v in (base, ours, theirs)):
+        if is_dataclass(base) and type(base) is type(ours) is type(theirs):
+            result = copy.copy(ours)
+            for name in field_names(type(base)):
+                value = _merge(getattr(base, name), getattr(ours, name), getattr(theirs, name),
+                               path + (name,), hasher, conflicts)
+                setattr(result, name, value)
+            return result
+
+        if isinstance(base, dict) and isinstance(ours, dict) and isinstance(theirs, dict):
+            return _merge_keyed(base, ours, theirs, path, hasher, conflicts, as_dict=True)
+
+        if isinstance(base, list) and isinstance(ours, list) and isinstance(theirs, list):
+            keys = [_name_keys(v) for v in (base, ours, theirs)]
+            if all(k is not None for k in keys):
+                return _merge_keyed(
+                    dict(zip(keys[0], base)), dict(zip(keys[1], ours)), dict(zip(keys[2], theirs)),
+                    path, hasher, conflicts, as_dict=False,
+                )
+            if len(base) == len(ours) == len(theirs):
+                return [
+                    _merge(b, o, t, path + (i,), hasher, conflicts)
+                    for i, (b, o, t) in enumerate(zip(base, ours, theirs))
+                ]
+
+    conflicts.append(Conflict(
+        path,
+        None if base is _MISSING else base,
+        None if ours is _MISSING else ours,
+        None if theirs is _MISSING else theirs,
+    ))
+    return ours
+
+def _merge_keyed(base, ours, theirs, path, hasher, conflicts, as_dict):
+    # Ordre : celui de `ours`, puis les ajouts de `theirs`
+    order = list(ours) + [k for k in theirs if k not in ours]
+    result = {}
+    for key in order:
+        b, o, t = base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING)
+        sub_path = path + ((key,) if as_dict else (len(result),))
+        value = _merge(b, o, t, sub_path, hasher, conflicts)
+        if value is not _MISSING:
+            result[key] = value
+    # Suppressions des deux côtés ou d'un seul côté sans modification de l'autre : clé absente
+    return result if as_dict else list(result.values())
@@ -0,0 +1,309 @@
+"""
+Import en flux de journaux de points de passage (CSV ou JSONL).
+
+Chaque ligne décrit un point d'un drone :
+
+    drone,x,y,z,interest,rest_time        (CSV, noms de colonnes configurables)
+    {"drone": "d1", "position": [x, y, z], "interest": 1, "restTime": 2.0}   (JSONL)
+
+Les lignes sont lues par générateurs et regroupées par drone ; un fichier
+trié par drone est traité drone par drone, la mémoire ne contenant alors que
+la trace (éventuellement sous-échantillonnée) du drone en cours. Le
+sous-échantillonnage garde un point chaque fois que la distance parcourue
+franchit un multiple de `min_distance` ; il est vectorisé avec NumPy s'il est
+installé et traité par blocs de `chunk_size` points.
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backend import codec, serializer
+from backend.clone import clone_node
+from backend.models import (
+    ConstantPositionMobilityModel, DroneConfig, FlightPoint, ParametricSpeedDroneMobilityModel, Scenario,
+)
+from backend.serializer import resolve
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Noms de colonnes acceptés (le premier présent est utilisé)
+DEFAULT_COLUMNS = {
+    "drone": ("drone", "drone_id", "id", "name"),
+    "x": ("x",),
+    "y": ("y",),
+    "z": ("z", "alt", "altitude"),
+    "interest": ("interest",),
+    "rest_time": ("rest_time", "restTime"),
+}
+
+@dataclass
+class Waypoint:
+    drone: str
+    position: Tuple[float, float, float]
+    interest: int = 0
+    rest_time: Optional[float] = None
+
+class UnsortedInputError(ValueError):
+    """Points d'un drone non contigus alors que le fichier est lu comme trié."""
+
+# --- Lecture ---
+
+def _resolve_columns(header: Sequence[str], columns: Dict[str, str] = None) -> Dict[str, Optional[str]]:
+    resolved = {}
+    for key, candidates in DEFAULT_COLUMNS.items():
+        if columns and key in columns:
+            candidates = (columns[key],)
+        resolved[key] = next((c for c in candidates if c in header), None)
+    missing = [k for k in ("drone", "x", "y") if resolved[k] is None]
+    if missing:
+        raise ValueError(f"Colonnes introuvables: {', '.join(missing)} (en-tête: {', '.join(header)})")
+    return resolved
+
+def _optional_float(value) -> Optional[float]:
+    return None if value in (None, "") else float(value)
+
+def _iter_csv(path: str, columns: Dict[str, str] = None) -> Iterator[Waypoint]:
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        cols = _resolve_columns(header, columns)
+        # Indices de colonnes (csv.reader évite la construction d'un dict par ligne)
+        i_drone, i_x, i_y = (header.index(cols[k]) for k in ("drone", "x", "y"))
+        i_z, i_interest, i_rest = (header.index(cols[k]) if cols[k] else None for k in ("z", "interest", "rest_time"))
+        for row in reader:
+            if not row:
+                continue
+            z = row[i_z] if i_z is not None else ""
+            interest = row[i_interest] if i_interest is not None else ""
+            yield Waypoint(
+                row[i_drone],
+                (float(row[i_x]), float(row[i_y]), float(z) if z else 0.0),
+                int(float(interest)) if interest else 0,
+                _optional_float(row[i_rest]) if i_rest is not None else None,
+            )
+
+def _iter_jsonl(path: str, columns: Dict[str, str] = None) -> Iterator[Waypoint]:
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = codec.loads(line)
+            cols = _resolve_columns(list(row) + (["x", "y"] if "position" in row else []), columns)
+            if "position" in row:
+                pos = row["position"]
+                position = (float(pos[0]), float(pos[1]), float(pos[2]) if len(pos) > 2 else 0.0)
+            else:
+                position = (float(row[cols["x"]]), float(row[cols["y"]]), float(row.get(cols["z"]) or 0.0))
+            yield Waypoint(
+                drone=str(row[cols["drone"]]),
+                position=position,
+                interest=int(row.get(cols["interest"]) or 0) if cols["interest"] else 0,
+                rest_time=_optional_float(row.get(cols["rest_time"])) if cols["rest_time"] else None,
+            )
+
+def iter_waypoints(path: str, fmt: str = None, columns: Dict[str, str] = None) -> Iterator[Waypoint]:
+    """Points de passage d'un fichier, lus ligne par ligne. `fmt` : "csv" ou "jsonl" (défaut : extension)."""
+    fmt = fmt or ("jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson") else "csv")
+    if fmt == "csv":
+        return _iter_csv(path, columns)
+    if fmt == "jsonl":
+        return _iter_jsonl(path, columns)
+    raise ValueError(f"Format de points de passage inconnu: {fmt}")
+
+# --- Sous-échantillonnage ---
+
+def _crossings_numpy(positions, start_point, start_cum, min_distance):
+    pts = np.asarray(positions, dtype=float)
+    prev = np.vstack([np.asarray(start_point, dtype=float)[None, :], pts[:-1]])
+    cum = start_cum + np.cumsum(np.linalg.norm(pts - prev, axis=1))
+    buckets = np.floor(cum / min_distance)
+    prev_buckets = np.concatenate(([math.floor(start_cum / min_distance)], buckets[:-1]))
+    return np.nonzero(buckets > prev_buckets)[0].tolist(), float(cum[-1])
+
+def _crossings_python(positions, start_point, start_cum, min_distance):
+    keep = []
+    cum, prev = start_cum, start_point
+    for i, p in enumerate(positions):
+        new_cum = cum + math.dist(prev, p)
+        if math.floor(new_cum / min_distance) > math.floor(cum / min_distance):
+            keep.append(i)
+        cum, prev = new_cum, p
+    return keep, cum
+
+class _TrackThinner:
+    """Sous-échantillonnage en flux d'une trace (état conservé d'un bloc à l'autre)."""
+
+    def __init__(self, min_distance: float):
+        self.min_distance = min_distance
+        self.kept: List[Waypoint] = []
+        self.last_point: Optional[Waypoint] = None   # dernier point lu (gardé en fin de trace)
+        self.last_kept = True
+        self.cum = 0.0
+
+    def feed(self, chunk: List[Waypoint]):
+        if not chunk:
+            return
+        if self.min_distance <= 0:
+            self.kept.extend(chunk)
+            self.last_point, self.last_kept = chunk[-1], True
+            return
+
+        if self.last_point is None:
+            # Premier point de la trace : toujours conservé
+            self.kept.append(chunk[0])
+            self.last_point, self.last_kept = chunk[0], True
+            chunk = chunk[1:]
+            if not chunk:
+                return
+
+        positions = [w.position for w in chunk]
+        crossings = _crossings_numpy if np is not None else _crossings_python
+        keep, self.cum = crossings(positions, self.last_point.position, self.cum, self.min_distance)
+        keep_set = set(keep)
+        for i, w in enumerate(chunk):
+            # Les points d'intérêt ou de pause ne sont jamais supprimés
+            if i in keep_set or w.interest or w.rest_time:
+                self.kept.append(w)
+        self.last_point = chunk[-1]
+        self.last_kept = (len(chunk) - 1) in keep_set or bool(chunk[-1].interest or chunk[-1].rest_time)
+
+    def finish(self) -> List[Waypoint]:
+        if self.last_point is not None and not self.last_kept:
+            self.kept.append(self.last_point)
+        return self.kept
+
+def downsample(waypoints: Sequence[Waypoint], min_distance: float) -> List[Waypoint]:
+    thinner = _TrackThinner(min_distance)
+    thinner.feed(list(waypoints))
+    return thinner.finish()
+
+# --- Regroupement par drone ---
+
+def group_by_drone(waypoints: Iterable[Waypoint], min_distance: float = 0.0, chunk_size: int = 65536,
+                   sorted_input: bool = True) -> Iterator[Tuple[str, List[Waypoint]]]:
+    """
+    Regroupe les points par drone (dans l'ordre de première apparition).
+    Avec `sorted_input`, un drone est émis dès que le suivant commence ; sinon
+    les traces sont conservées jusqu'à la fin du fichier.
+    """
+    thinners: Dict[str, _TrackThinner] = {}
+    buffers: Dict[str, List[Waypoint]] = {}
+    emitted = set()
+    current = None
+
+    def flush(drone):
+        emitted.add(drone)
+        thinners[drone].feed(buffers.pop(drone))
+        return drone, thinners.pop(drone).finish()
+
+    for w in waypoints:
+        if w.drone != current:
+            if sorted_input and current is not None and w.drone not in buffers:
+                yield flush(current)
+            if w.drone in emitted:
+                raise UnsortedInputError(f"Points du drone {w.drone} non contigus (fichier non trié, utiliser sorted_input=False)")
+            current = w.drone
+        if current not in buffers:
+            thinners[current] = _TrackThinner(min_distance)
+            buffers[current] = []
+        buffer = buffers[current]
+        buffer.append(w)
+        if len(buffer) >= chunk_size:
+            thinners[current].feed(buffer)
+            buffers[current] = []
+
+    for drone in list(buffers):
+        yield flush(drone)
+
+# --- Construction des nœuds ---
+
+def build_drone(name: str, track: Sequence[Waypoint], template: DroneConfig = None,
+                speed_coefficients: List[float] = None) -> DroneConfig:
+    """Drone immobile (un seul point) ou suivant un plan de vol paramétrique."""
+    node = clone_node(template, 1)[0] if template is not None else DroneConfig()
+    node.name = name
+    if len(track) == 1:
+        node.mobility_model = ConstantPositionMobilityModel(
+            name="ns3::ConstantPositionMobilityModel", position=list(track[0].position),
+        )
+        return node
+
+    model = ParametricSpeedDroneMobilityModel(
+        name="ns3::ParametricSpeedDroneMobilityModel",
+        flight_plan=[FlightPoint(position=list(w.position), interest=w.interest, rest_time=w.rest_time) for w in track],
+    )
+    previous = template.mobility_model if template is not None else None
+    if speed_coefficients is not None:
+        model.speed_coefficients = list(speed_coefficients)
+    elif isinstance(previous, ParametricSpeedDroneMobilityModel):
+        model.speed_coefficients = list(previous.speed_coefficients)
+        model.curve_step = previous.curve_step
+    node.mobility_model = model
+    return node
+
+def import_waypoints(path: str, fmt: str = None, columns: Dict[str, str] = None, min_distance: float = 0.0,
+                     template: DroneConfig = None, speed_coefficients: List[float] = None,
+                     sorted_input: bool = True, chunk_size: int = 65536) -> Iterator[DroneConfig]:
+    """Drones construits au fil de la lecture du fichier."""
+    tracks = group_by_drone(iter_waypoints(path, fmt, columns), min_distance, chunk_size, sorted_input)
+    for drone, track in tracks:
+        yield build_drone(drone, track, template, speed_coefficients)
+
+def read_drones(path: str, sorted_input: Optional[bool] = True, **options) -> List[DroneConfig]:
+    """
+    Drones d'un fichier de points de passage, tous construits avant d'être
+    retournés. `sorted_input=None` : lecture en flux (fichier supposé trié),
+    relue en conservant toutes les traces si des points s'avèrent non contigus.
+    """
+    if sorted_input is None:
+        try:
+            return list(import_waypoints(path, sorted_input=True, **options))
+        except UnsortedInputError:
+            sorted_input = False
+    return list(import_waypoints(path, sorted_input=sorted_input, **options))
+
+def import_into(scenario: Scenario, path: str, **options) -> int:
+    """
+    Ajoute au scénario les drones d'un fichier de points de passage. Retourne
+    leur nombre. Le scénario n'est modifié que si tout le fichier a été lu.
+    """
+    drones = read_drones(path, **options)
+    scenario.drones.extend(drones)
+    return len(drones)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.importer",
+        description="Ajoute à un scénario IoD-Sim les drones d'un journal de points de passage (CSV / JSONL).",
+    )
+    parser.add_argument("scenario", help="Scénario cible (.json ou .iodb)")
+    parser.add_argument("waypoints", help="Fichier de points de passage (.csv, .jsonl)")
+    parser.add_argument("-o", "--output", default=None, help="Fichier de sortie (défaut : le scénario cible)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default=None, help="Format (défaut : extension)")
+    parser.add_argument("--min-distance", type=float, default=0.0, help="Distance minimale entre points conservés")
+    parser.add_argument("--template", default=None, help="Nom du drone existant servant de modèle")
+    parser.add_argument("--unsorted", action="store_true", help="Points de drones différents entremêlés")
+    args = parser.parse_args(argv)
+
+    scenario = serializer.load_scenario(args.scenario)
+    template = None
+    if args.template:
+        template = next((d for d in scenario.drones if resolve(d).name == args.template), None)
+        if template is None:
+            parser.error(f"Drone modèle introuvable: {args.template}")
+
+    count = import_into(scenario, args.waypoints, fmt=args.format, min_distance=args.min_distance,
+                        template=template, sorted_input=not args.unsorted)
+    serializer.save_scenario(scenario, args.output or args.scenario)
+    print(f"{count} drone(s) importé(s) dans {args.output or args.scenario}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+Index inversé des nœuds d'un scénario (drones, ZSPs, remotes, nodes).
+
+Termes indexés par nœud :
+- nom du nœud, section ("drones", ...)
+- types ns-3 (`name` de chaque Ns3Model du sous-arbre : mobilité, applications...)
+- attributs : champs primitifs des dataclasses du sous-arbre et `extra_attributes`
+  (noms normalisés en snake_case : "CurveStep" et "curve_step" sont équivalents)
+- indices de couche réseau (`network_layer` du nœud et de ses net devices)
+
+Les nœuds paresseux (`LazyNode`) non décodés sont indexés depuis leur dict
+JSON brut, sans être décodés.
+
+L'index est construit au chargement puis tenu à jour nœud par nœud
+(`tracking.NodeTracker`) : une requête n'interroge que les tables, jamais le
+graphe d'objets.
+"""
+import operator
+import shlex
+from functools import lru_cache
+from dataclasses import is_dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.models import Ns3Model, Scenario
+from backend.serializer import LazyNode, pascal_to_snake
+from backend.tracking import SCALARS, SECTIONS, NodeTracker, field_names
+
+OPERATORS = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+# Points de passage et patches IRS : volumineux et peu discriminants, non indexés
+_SKIPPED_FIELDS = ("flight_plan", "patches")
+
+@lru_cache(maxsize=4096)
+def normalize_attr(name: str) -> str:
+    """CurveStep / curve_step -> curve_step"""
+    return pascal_to_snake(name) if any(c.isupper() for c in name) else name
+
+# --- Extraction des termes ---
+
+def _raw_node_terms(raw: Dict[str, Any]) -> List[Tuple[str, Any, Any]]:
+    """Termes d'un nœud encore au format JSON (clés camelCase / attributs ns-3 PascalCase)."""
+    terms = []
+    if raw.get("name") is not None:
+        terms.append(("name", raw["name"], None))
+    if raw.get("networkLayer") is not None:
+        terms.append(("layer", raw["networkLayer"], None))
+    for dev in raw.get("netDevices") or []:
+        if isinstance(dev, dict) and dev.get("networkLayer") is not None:
+            terms.append(("layer", dev["networkLayer"], None))
+
+    stack = [(raw, True)]
+    while stack:
+        obj, is_node = stack.pop()
+        if isinstance(obj, list):
+            stack.extend((v, False) for v in obj if isinstance(v, (dict, list)))
+            continue
+        name = obj.get("name")
+        if isinstance(name, str) and name.startswith("ns3::"):
+            terms.append(("type", name, None))
+        for key, value in obj.items():
+            if key == "attributes" and isinstance(value, list) and isinstance(name, str):
+                # Attributs ns-3 : [{"name": ..., "value": ...}]
+                for attr in value:
+                    if not isinstance(attr, dict) or "name" not in attr:
+                        continue
+                    attr_name = normalize_attr(attr["name"])
+                    if attr_name in _SKIPPED_FIELDS:
+                        continue
+                    attr_value = attr.get("value")
+                    if isinstance(attr_value, SCALARS):
+                        terms.append(("attr", attr_name, attr_value))
+                    elif isinstance(attr_value, (dict, list)):
+                        terms.append(("attr", attr_name, None))
+                        stack.append((attr_value, False))
+                continue
+            if key == "name" or (is_node and key == "networkLayer"):
+                continue
+            attr_name = normalize_attr(key)
+            if attr_name in _SKIPPED_FIELDS or value is None:
+                continue
+            if isinstance(value, SCALARS):
+                terms.append(("attr", attr_name, value))
+            elif isinstance(value, (dict, list)):
+                stack.append((value, False))
+    return terms
+
+def _node_terms(node) -> List[Tuple[str, Any, Any]]:
+    """Liste des termes (table, clé, valeur) d'un nœud."""
+    if isinstance(node, LazyNode):
+        raw, node = node.peek()
+        if raw is not None:
+            return _raw_node_terms(raw)
+    terms = []
+    name = getattr(node, "name", None)
+    if name is not None:
+        terms.append(("name", name, None))
+
+    layer = getattr(node, "network_layer", None)
+    if layer is not None:
+        terms.append(("layer", layer, None))
+    for dev in getattr(node, "net_devices", None) or []:
+        if getattr(dev, "network_layer", None) is not None:
+            terms.append(("layer", dev.network_layer, None))
+
+    stack = [node]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, list):
+            stack.extend(v for v in obj if is_dataclass(v) or isinstance(v, dict))
+            continue
+        if isinstance(obj, dict):
+            # mac_layer peut être un dict brut {"name", "attributes"}
+            if isinstance(obj.get("name"), str) and obj["name"].startswith("ns3::"):
+                terms.append(("type", obj["name"], None))
+            continue
+
+        is_model = isinstance(obj, Ns3Model)
+        if is_model and obj.name:
+            terms.append(("type", obj.name, None))
+        for field_name in field_names(type(obj), _SKIPPED_FIELDS):
+            if field_name == "extra_attributes":
+                for key, value in obj.extra_attributes.items():
+                    terms.append(("attr", normalize_attr(key), value if isinstance(value, SCALARS) else None))
+                continue
+            if obj is node and field_name in ("name", "network_layer"):
+                continue
+            if is_model and field_name == "name":
+                continue
+            value = getattr(obj, field_name)
+            if value is None:
+                continue
+            if isinstance(value, SCALARS):
+                terms.append(("attr", field_name, value))
+            elif is_dataclass(value) or isinstance(value, (list, dict)):
+                if is_model:
+                    # Attribut ns-3 non scalaire (positions, coefficients...) : présence seule
+                    terms.append(("attr", field_name, None))
+                stack.append(value)
+    return terms
+
+# --- Index ---
+
+class ScenarioIndex(NodeTracker):
+    def __init__(self, scenario: Scenario = None):
+        super().__init__()
+        self._order: Dict[int, int] = {}                   # id -> rang d'insertion
+        self._terms: Dict[int, List[Tuple[str, Any, Any]]] = {}
+        self._names: Dict[Any, Set[int]] = {}
+        self._types: Dict[str, Set[int]] = {}
+        self._layers: Dict[Any, Set[int]] = {}
+        # attribut -> valeur -> ids ("None" pour les valeurs non scalaires)
+        self._attrs: Dict[str, Dict[Any, Set[int]]] = {}
+        self._counter = 0
+        if scenario is not None:
+            self.build(scenario)
+
+    def build(self, scenario: Scenario):
+        self.__init__()
+        for section in SECTIONS:
+            for node in getattr(scenario, section):
+                self.add_node(section, node)
+
+    # --- Mise à jour ---
+
+    def add_node(self, section: str, node):
+        key = id(node)
+        if key in self._nodes:
+            self.remove_node(node)
+        self._track(section, node)
+        self._order[key] = self._counter
+        self._counter += 1
+        terms = _node_terms(node)
+        self._terms[key] = terms
+        for table, term, value in terms:
+            self._post(table, term, value).add(key)
+
+    def remove_node(self, node):
+        key = id(node)
+        if self._untrack(node) is None:
+            return
+        self._order.pop(key, None)
+        for table, term, value in self._terms.pop(key, ()):
+            postings = self._post(table, term, value)
+            postings.discard(key)
+            if not postings:
+                self._drop(table, term, value)
+
+    def update_node(self, section: str, node):
+        """Réindexe un nœud modifié (conserve son rang) ; l'ajoute s'il n'est pas indexé."""
+        order = self._order.get(id(node))
+        self.add_node(section, node)
+        if order is not None:
+            self._order[id(node)] = order
+
+    def _post(self, table, term, value) -> Set[int]:
+        if table == "name":
+            return self._names.setdefault(term, set())
+        if table == "type":
+            return self._types.setdefault(term, set())
+        if table == "layer":
+            return self._layers.setdefault(term, set())
+        return self._attrs.setdefault(term, {}).setdefault(value, set())
+
+    def _drop(self, table, term, value):
+        if table == "name":
+            self._names.pop(term, None)
+        elif table == "type":
+            self._types.pop(term, None)
+        elif table == "layer":
+            self._layers.pop(term, None)
+        else:
+            values = self._attrs.get(term, {})
+            values.pop(value, None)
+            if not values:
+                self._attrs.pop(term, None)
+
+    # --- Requêtes ---
+
+    def query(self, name: str = None, name_contains: str = None, type_name: str = None,
+              section: str = None, network_layer: int = None,
+              where: Iterable[Tuple[str, str, Any]] = ()) -> List[Any]:
+        """
+        Intersection des critères donnés. `where` : (attribut, opérateur, valeur),
+        opérateur parmi ==, !=, <, <=, >, >= ou "exists".
+        """
+        self.refresh()
+        result: Optional[Set[int]] = None
+
+        def narrow(ids: Set[int]):
+            nonlocal result
+            result = set(ids) if result is None else result & ids
+
+        if section is not None:
+            narrow(self._sections.get(section, set()))
+        if name is not None:
+            narrow(self._names.get(name, set()))
+        if name_contains is not None:
+            needle = name_contains.lower()
+            narrow(_union(ids for n, ids in self._names.items() if needle in str(n).lower()))
+        if type_name is not None:
+            if type_name in self._types:
+                narrow(self._types[type_name])
+            else:
+                needle = type_name.lower()
+                narrow(_union(ids for t, ids in self._types.items() if needle in t.lower()))
+        if network_layer is not None:
+            narrow(self._layers.get(network_layer, set()))
+        for attr, op, value in where:
+            narrow(self._match_attr(normalize_attr(attr), op, value))
+            if not result:
+                break
+
+        if result is None:
+            result = set(self._nodes)
+        return [self._nodes[k][1] for k in sorted(result, key=self._order.__getitem__)]
+
+    def _match_attr(self, attr: str, op: str, value: Any) -> Set[int]:
+        values = self._attrs.get(attr)
+        if not values:
+            return set()
+        if op == "exists":
+            return _union(values.values())
+        if op in ("==", "=") and value in values:
+            return set(values[value])
+        compare = OPERATORS[op]
+        matched = []
+        for candidate, ids in values.items():
+            try:
+                if candidate is not None and compare(candidate, value):
+                    matched.append(ids)
+            except TypeError:
+                continue
+        return _union(matched)
+
+    def search(self, text: str) -> List[Any]:
+        """Requête textuelle (voir `parse_query`)."""
+        return self.query(**parse_query(text))
+
+def _union(sets: Iterable[Set[int]]) -> Set[int]:
+    out: Set[int] = set()
+    for s in sets:
+        out |= s
+    return out
+
+# --- Syntaxe de requête ---
+
+def _parse_value(text: str) -> Any:
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_query(text: str) -> Dict[str, Any]:
+    """
+    Convertit une requête textuelle en arguments de `ScenarioIndex.query`.
+
+    type:ParametricSpeed curve_step<0.01 name:drone3 layer:0 section:drones TxPower? drone
+    (mot nu = nom contenant le texte, `attr?` = attribut présent)
+    """
+    kwargs: Dict[str, Any] = {"where": []}
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+    for token in tokens:
+        if ":" in token and not token.startswith("ns3::"):
+            key, _, value = token.partition(":")
+            if key == "type":
+                kwargs["type_name"] = value
+                continue
+            if key == "name":
+                kwargs["name"] = value
+                continue
+            if key == "layer":
+                kwargs["network_layer"] = _parse_value(value)
+                continue
+            if key == "section":
+                kwargs["section"] = value
+                continue
+        if token.endswith("?"):
+            kwargs["where"].append((token[:-1], "exists", None))
+            continue
+        for op in ("<=", ">=", "!=", "==", "<", ">", "="):
+            attr, sep, value = token.partition(op)
+            if sep and attr:
+                kwargs["where"].append((attr, op, _parse_value(value)))
+                break
+        else:
+            if token.startswith("ns3::"):
+                kwargs["type_name"] = token
+            else:
+                kwargs["name_contains"] = token
+    return kwargs
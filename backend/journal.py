@@ -0,0 +1,307 @@
+"""
+Journal d'édition en ajout seul (sauvegarde automatique / récupération).
+
+Chaque modification est un enregistrement JSON d'une ligne, relatif au
+dernier fichier sauvegardé :
+
+    {"p": ["drones", 3, "mobility_model"], "f": "curve_step", "v": 0.02}   affectation
+    {"p": ["drones"], "i": 5, "v": {...}}                                  insertion dans une liste
+    {"p": ["drones"], "d": 5}                                              suppression
+    {"s": {...}}                                                           scénario complet (fusion, rechargement)
+
+La première ligne est un en-tête {"source": chemin, "digest": empreinte du
+fichier de base, `reload.file_digest`}. Les écritures sont faites par un
+thread dédié ; le journal est compacté régulièrement (dernière valeur par
+(chemin, champ)) et réécrit de façon atomique. Au démarrage, `replay` rejoue
+le journal sur le fichier.
+"""
+import hashlib
+import os
+import queue
+import threading
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+
+from backend import codec
+from backend.models import Scenario
+from backend.serializer import LazyNode, dict_to_dataclass, resolve, to_plain
+
+Path = Tuple[Any, ...]
+
+RECOVERY_DIR = os.path.join(os.path.expanduser("~"), ".iodsim_editor", "recovery")
+COMPACT_EVERY = 1000   # enregistrements ajoutés entre deux compactages
+
+def journal_path(source: str, directory: str = None) -> str:
+    """Fichier journal associé à un scénario (clé : chemin absolu de la source)."""
+    key = hashlib.blake2b(os.path.abspath(source).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(directory or RECOVERY_DIR, f"{os.path.basename(source)}.{key}.journal")
+
+# --- Enregistrements ---
+
+def set_record(path: Path, field: Any, value: Any) -> Dict[str, Any]:
+    return {"p": list(path), "f": field, "v": to_plain(resolve(value))}
+
+def insert_record(path: Path, index: int, value: Any) -> Dict[str, Any]:
+    return {"p": list(path), "i": index, "v": to_plain(resolve(value))}
+
+def delete_record(path: Path, index: int) -> Dict[str, Any]:
+    return {"p": list(path), "d": index}
+
+def snapshot_record(scenario: Scenario) -> Dict[str, Any]:
+    return {"s": to_plain(scenario)}
+
+def compact(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Garde la dernière affectation par (chemin, champ) entre deux opérations de
+    structure (insertion / suppression décalent les index). Tout ce qui précède
+    le dernier scénario complet est abandonné.
+    """
+    for i in range(len(records) - 1, -1, -1):
+        if "s" in records[i]:
+            records = records[i:]
+            break
+    out: List[Dict[str, Any]] = []
+    segment: Dict[Tuple, Dict[str, Any]] = {}
+
+    def flush():
+        out.extend(segment.values())
+        segment.clear()
+
+    for record in records:
+        if "f" in record:
+            key = (tuple(record["p"]), record["f"])
+            segment.pop(key, None)   # réinsertion : l'ordre suit la dernière affectation
+            segment[key] = record
+        else:
+            flush()
+            out.append(record)
+    flush()
+    return out
+
+# --- Écriture en arrière-plan ---
+
+class Journal:
+    """
+    Journal d'un scénario. `record` ne fait que mettre l'enregistrement en file ;
+    l'encodage, l'écriture et le compactage ont lieu dans le thread d'écriture.
+    """
+
+    def __init__(self, source: str, digest: str, directory: str = None, records: List[Dict[str, Any]] = None):
+        self.source = source
+        self.digest = digest
+        self.path = journal_path(source, directory)
+        self.records: List[Dict[str, Any]] = list(records or [])   # état du fichier (accès thread d'écriture)
+        self.pending = bool(self.records)                          # modifications non sauvegardées
+        self._queue: "queue.Queue" = queue.Queue()
+        self._since_compact = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._rewrite()
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    # API (thread graphique)
+
+    def record(self, record: Dict[str, Any]):
+        self.pending = True
+        self._queue.put(("append", record))
+
+    def record_set(self, path: Path, field: Any, value: Any):
+        self.record(set_record(path, field, value))
+
+    def record_insert(self, path: Path, index: int, value: Any):
+        self.record(insert_record(path, index, value))
+
+    def record_delete(self, path: Path, index: int):
+        self.record(delete_record(path, index))
+
+    def record_snapshot(self, scenario: Scenario):
+        self.record(snapshot_record(scenario))
+
+    def reset(self, digest: str):
+        """Le scénario vient d'être sauvegardé : le journal repart de zéro."""
+        self.pending = False
+        self._queue.put(("reset", digest))
+
+    def flush(self):
+        """Attend que les enregistrements en file soient écrits."""
+        self._queue.join()
+
+    def close(self, discard: bool = None):
+        """Arrête le thread ; le fichier est supprimé s'il n'y a rien à récupérer."""
+        if discard is None:
+            discard = not self.pending
+        self._queue.put(("close", discard))
+        self._thread.join()
+
+    # Thread d'écriture
+
+    def _header(self) -> Dict[str, Any]:
+        return {"source": os.path.abspath(self.source), "digest": self.digest}
+
+    def _rewrite(self):
+        """Réécrit le journal (en-tête + enregistrements) de façon atomique."""
+        tmp = self.path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(codec.dumps(self._header(), indent=False) + b"\n")
+            for record in self.records:
+                f.write(codec.dumps(record, indent=False) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._since_compact = 0
+
+    def _run(self):
+        f = open(self.path, 'ab')
+        try:
+            while True:
+                op, arg = self._queue.get()
+                try:
+                    if op == "append":
+                        f.write(codec.dumps(arg, indent=False) + b"\n")
+                        f.flush()
+                        self.records.append(arg)
+                        self._since_compact += 1
+                        if self._since_compact >= COMPACT_EVERY and self._queue.empty():
+                            f.close()
+                            self.records = compact(self.records)
+                            self._rewrite()
+                            f = open(self.path, 'ab')
+                    elif op == "reset":
+                        f.close()
+                        self.digest, self.records = arg, []
+                        self._rewrite()
+                        f = open(self.path, 'ab')
+                    elif op == "close":
+                        f.close()
+                        if arg:
+                            os.remove(self.path)
+                        elif self._since_compact:
+                            self.records = compact(self.records)
+                            self._rewrite()
+                        return
+                finally:
+                    self._queue.task_done()
+        finally:
+            f.close()
+
+# --- Récupération ---
+
+def read_journal(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """En-tête et enregistrements ; une dernière ligne tronquée (arrêt brutal) est ignorée."""
+    header, records = {}, []
+    with open(path, 'rb') as f:
+        for n, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                item = codec.loads(line)
+            except ValueError:
+                break
+            if n == 0:
+                header = item
+            else:
+                records.append(item)
+    return header, records
+
+def pending_recoveries(directory: str = None) -> List[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]]:
+    """Journaux non vides laissés par une session précédente (du plus récent au plus ancien)."""
+    directory = directory or RECOVERY_DIR
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        if not name.endswith(".journal"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            header, records = read_journal(path)
+        except OSError:
+            continue
+        if records and header.get("source"):
+            found.append((os.path.getmtime(path), path, header, records))
+    found.sort(key=lambda t: t[0], reverse=True)
+    return [(path, header, records) for _, path, header, records in found]
+
+def _unwrap(tp):
+    if get_origin(tp) is Union:
+        members = [t for t in get_args(tp) if t is not type(None)]
+        if len(members) == 1:
+            return _unwrap(members[0])
+    return tp
+
+def _item_type(tp):
+    tp = _unwrap(tp)
+    if get_origin(tp) in (list, List) and get_args(tp):
+        return get_args(tp)[0]
+    return Any
+
+def _field_type(obj, name):
+    for f in fields(obj):
+        if f.name == name:
+            return f.type
+    return Any
+
+def _walk(scenario: Scenario, path: List[Any]) -> Tuple[Any, Any]:
+    """Objet désigné par `path` et son annotation de type."""
+    obj, tp = scenario, Scenario
+    for step in path:
+        if isinstance(step, int):
+            tp = _item_type(tp)
+            obj = resolve(obj[step])
+        elif isinstance(obj, dict):
+            tp, obj = Any, obj[step]
+        else:
+            tp = _field_type(obj, step)
+            obj = resolve(getattr(obj, step))
+    return obj, tp
+
+def _decode(tp, value):
+    return value if tp is Any else dict_to_dataclass(tp, value)
+
+def apply_record(scenario: Scenario, record: Dict[str, Any]):
+    if "s" in record:
+        restored = dict_to_dataclass(Scenario, record["s"])
+        scenario.__dict__.update(restored.__dict__)
+        return
+    target, tp = _walk(scenario, record["p"])
+    if "f" in record:
+        field, value = record["f"], record["v"]
+        if isinstance(target, (list, dict)):
+            target[field] = _decode(_item_type(tp), value) if isinstance(target, list) else value
+        else:
+            setattr(target, field, _decode(_field_type(target, field), value))
+    elif "i" in record:
+        target.insert(record["i"], _decode(_item_type(tp), record["v"]))
+    elif "d" in record:
+        del target[record["d"]]
+
+def replay(scenario: Scenario, records: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Rejoue les enregistrements sur le scénario. Retourne (appliqués, ignorés)."""
+    applied = failed = 0
+    for record in records:
+        try:
+            apply_record(scenario, record)
+            applied += 1
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            failed += 1
+    return applied, failed
+
+# --- Localisation des objets ---
+
+def locate(scenario: Scenario, target: Any) -> Optional[Path]:
+    """Chemin d'un objet ou d'une liste du scénario (racine, sections, monde, éléments de listes)."""
+    if target is scenario:
+        return ()
+    containers = [((f.name,), getattr(scenario, f.name)) for f in fields(scenario)]
+    world = scenario.world
+    if world is not None:
+        containers.append((("world", "buildings"), world.buildings))
+    for path, value in containers:
+        if value is target:
+            return path
+    for path, value in containers:
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                if item is target or (isinstance(item, LazyNode) and item.is_loaded and resolve(item) is target):
+                    return path + (i,)
+    return None
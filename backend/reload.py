@@ -0,0 +1,329 @@
+"""
+Rechargement incrémental d'un scénario modifié sur disque.
+
+Un `Snapshot` conserve l'empreinte de chaque clé de premier niveau du fichier
+et de chaque nœud des sections drones / ZSPs / remotes / nodes. À la
+modification du fichier, seules les parties dont l'empreinte a changé sont
+décodées (`plan_reload`, exécutable hors du thread graphique) puis remplacées
+dans le scénario en mémoire (`apply_reload`). Les nœuds inchangés gardent leur
+identité : arbre, index et éditeurs ouverts restent valides.
+
+Les nœuds en mémoire sont retrouvés par identité (`node_lists`, relevé à la
+lecture du fichier) ou à défaut par nom, jamais par position. Une partie
+modifiée à la fois sur disque et dans l'éditeur (`LocalEdits`) n'est pas
+écrasée : la version locale est conservée et le conflit signalé.
+"""
+import hashlib
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend import codec
+from backend.models import Scenario
+from backend.serializer import LAZY_SECTIONS, dict_to_dataclass, to_camel_case, to_plain
+from backend.symbols import SymbolTable
+
+NodeEntry = Tuple[Optional[str], bytes]  # (nom, empreinte)
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _fingerprint(value: Any) -> bytes:
+    return _digest(codec.dumps(value, indent=False))
+
+def _json_key(name: str) -> str:
+    # Même correspondance que dict_to_dataclass pour la racine
+    return name if name in ("ZSPs", "staticNs3Config") else to_camel_case(name)
+
+SCENARIO_KEYS = {_json_key(f.name): f for f in fields(Scenario)}
+
+# --- Empreintes ---
+
+@dataclass
+class Snapshot:
+    """État d'un fichier scénario au moment de sa lecture."""
+    digest: str                                              # empreinte du fichier entier (`file_digest`)
+    keys: Dict[str, bytes] = field(default_factory=dict)     # clé JSON -> empreinte (hors sections de nœuds)
+    nodes: Dict[str, List[NodeEntry]] = field(default_factory=dict)
+    data: Dict[str, Any] = field(default_factory=dict)       # JSON brut
+
+def snapshot_from_plain(data: Dict[str, Any], digest: str = "") -> Snapshot:
+    snap = Snapshot(digest=digest, data=data)
+    for key, value in data.items():
+        if key in LAZY_SECTIONS:
+            snap.nodes[key] = [
+                (raw.get("name") if isinstance(raw, dict) else None, _fingerprint(raw)) for raw in value or []
+            ]
+        else:
+            snap.keys[key] = _fingerprint(value)
+    for key in LAZY_SECTIONS:
+        snap.nodes.setdefault(key, [])
+    return snap
+
+def read_snapshot(path: str) -> Snapshot:
+    """Lit et empreinte un fichier scénario (.json ou .iodb)."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    from backend import binary
+    if path.endswith(binary.EXTENSION):
+        data = to_plain(binary.loads_binary(raw))
+    else:
+        data = codec.loads(raw)
+    return snapshot_from_plain(data, _digest(raw).hex())
+
+def file_digest(path: str) -> str:
+    """Empreinte (hexadécimale) d'un fichier : snapshots, sauvegardes, en-tête du journal."""
+    with open(path, 'rb') as f:
+        return _digest(f.read()).hex()
+
+# --- Plan de rechargement ---
+
+@dataclass
+class SectionPlan:
+    # Pour chaque nœud du nouveau fichier : index dans l'ancien (inchangé) ou objet décodé
+    entries: List[Tuple[Optional[int], Any]]
+    old_names: List[Optional[str]]
+    # Nœud décodé -> index de l'ancien nœud qu'il remplace (même nom, sinon même place)
+    replaces: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def decoded(self) -> int:
+        return sum(1 for old, _ in self.entries if old is None)
+
+    @property
+    def structural(self) -> bool:
+        """Ajout, suppression ou déplacement de nœuds dans le fichier."""
+        order = [old if old is not None else self.replaces.get(i) for i, (old, _) in enumerate(self.entries)]
+        return order != list(range(len(self.old_names)))
+
+@dataclass
+class ReloadPlan:
+    fields: Dict[str, Any] = field(default_factory=dict)          # champ du Scenario -> nouvelle valeur
+    sections: Dict[str, SectionPlan] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not self.fields and not self.sections
+
+def _default(f) -> Any:
+    if f.default is not MISSING:
+        return f.default
+    if f.default_factory is not MISSING:
+        return f.default_factory()
+    return MISSING
+
+def _plan_section(section: str, old: List[NodeEntry], new: List[NodeEntry], raws: List[Any],
+                  symbols: SymbolTable = None) -> Optional[SectionPlan]:
+    if old == new:
+        return None
+    cls = LAZY_SECTIONS[section]
+    # Alignement par (nom, empreinte) : une insertion ne décale pas les nœuds suivants
+    by_name: Dict[Tuple[Optional[str], bytes], List[int]] = {}
+    for i, entry in enumerate(old):
+        by_name.setdefault(entry, []).append(i)
+    entries = []
+    for i, entry in enumerate(new):
+        same_slot = i < len(old) and old[i] == entry
+        candidates = by_name.get(entry)
+        if same_slot and i in (candidates or ()):
+            candidates.remove(i)
+            entries.append((i, None))
+        elif candidates:
+            entries.append((candidates.pop(0), None))
+        else:
+            entries.append((None, dict_to_dataclass(cls, raws[i], symbols)))
+    # Un nœud décodé remplace l'ancien nœud de même nom, sinon celui de même place
+    used = {old_index for old_index, _ in entries if old_index is not None}
+    free_by_name: Dict[Optional[str], List[int]] = {}
+    for i, (name, _) in enumerate(old):
+        if i not in used and name is not None:
+            free_by_name.setdefault(name, []).append(i)
+    replaces = {}
+    for i, (old_index, _) in enumerate(entries):
+        if old_index is None and free_by_name.get(new[i][0]):
+            replaces[i] = free_by_name[new[i][0]].pop(0)
+    used.update(replaces.values())
+    for i, (old_index, _) in enumerate(entries):
+        if old_index is None and i not in replaces and i < len(old) and i not in used:
+            replaces[i] = i
+            used.add(i)
+    return SectionPlan(entries, [name for name, _ in old], replaces)
+
+def plan_reload(old: Snapshot, new: Snapshot) -> ReloadPlan:
+    """Décode uniquement les clés et nœuds dont l'empreinte a changé (sans toucher au scénario)."""
+    plan = ReloadPlan()
+    if old.digest and old.digest == new.digest:
+        return plan
+    symbols = SymbolTable()
+    for key in set(old.keys) | set(new.keys):
+        f = SCENARIO_KEYS.get(key)
+        if f is None or old.keys.get(key) == new.keys.get(key):
+            continue
+        if key in new.data:
+            plan.fields[f.name] = dict_to_dataclass(f.type, new.data[key], symbols)
+        else:
+            value = _default(f)
+            if value is not MISSING:
+                plan.fields[f.name] = value
+    for section in LAZY_SECTIONS:
+        section_plan = _plan_section(
+            section, old.nodes[section], new.nodes[section], new.data.get(section) or [], symbols,
+        )
+        if section_plan is not None:
+            plan.sections[section] = section_plan
+    return plan
+
+# --- Modifications locales ---
+
+def node_lists(scenario: Scenario) -> Dict[str, List[Any]]:
+    """Nœuds de chaque section, dans l'ordre du fichier qui vient d'être lu ou écrit."""
+    return {section: list(getattr(scenario, section)) for section in LAZY_SECTIONS}
+
+@dataclass
+class LocalEdits:
+    """Parties du scénario modifiées dans l'éditeur depuis la dernière lecture / sauvegarde."""
+    fields: Set[str] = field(default_factory=set)          # champs du Scenario hors sections de nœuds
+    nodes: Dict[int, Any] = field(default_factory=dict)    # id -> élément de section modifié
+    sections: Set[str] = field(default_factory=set)        # sections dont la liste a changé
+
+    def __bool__(self):
+        return bool(self.fields or self.nodes or self.sections)
+
+    def note(self, scenario: Scenario, path: Tuple[Any, ...]):
+        """Modification à `path` (chemin depuis la racine, comme dans le journal)."""
+        if not path:
+            return
+        head = path[0]
+        if head not in LAZY_SECTIONS:
+            self.fields.add(head)
+            return
+        nodes = getattr(scenario, head)
+        # (section, i, champ...) : le nœud lui-même ; (section,) ou (section, i) : la liste
+        if len(path) >= 3 and isinstance(path[1], int) and path[1] < len(nodes):
+            self.note_node(nodes[path[1]])
+        else:
+            self.sections.add(head)
+
+    def note_node(self, node: Any):
+        self.nodes[id(node)] = node
+
+    def note_all(self, scenario: Scenario):
+        """Le scénario entier diffère du fichier (fusion, récupération)."""
+        self.fields.update(f.name for f in fields(scenario) if f.name not in LAZY_SECTIONS)
+        self.sections.update(LAZY_SECTIONS)
+        for section in LAZY_SECTIONS:
+            for node in getattr(scenario, section):
+                self.note_node(node)
+
+    def clear(self):
+        self.fields.clear()
+        self.nodes.clear()
+        self.sections.clear()
+
+# --- Application ---
+
+@dataclass
+class ReloadResult:
+    fields: List[str] = field(default_factory=list)
+    replaced: Dict[str, List[Tuple[Any, Any]]] = field(default_factory=dict)  # section -> [(ancien, nouveau)]
+    restructured: List[str] = field(default_factory=list)                     # sections ajout/suppression/ordre
+    conflicts: List[str] = field(default_factory=list)                        # champs, "section/nœud", sections
+    baseline: Dict[str, List[Any]] = field(default_factory=dict)              # section -> nœuds alignés sur le fichier
+
+    @property
+    def changed_sections(self) -> List[str]:
+        return list(dict.fromkeys(list(self.replaced) + self.restructured))
+
+def _current_by_old_index(current: List[Any], old_names: List[Optional[str]],
+                          baseline: List[Any] = None) -> Dict[int, Any]:
+    """Nœuds en mémoire correspondant aux index de l'ancien fichier."""
+    present = {id(node) for node in current}
+    if baseline is not None and len(baseline) == len(old_names):
+        # Par identité : un déplacement dans l'éditeur ne change pas la correspondance
+        return {i: node for i, node in enumerate(baseline) if node is not None and id(node) in present}
+    # Par nom, dans l'ordre d'apparition pour les homonymes
+    by_name: Dict[str, List[Any]] = {}
+    for node in current:
+        by_name.setdefault(getattr(node, "name", None), []).append(node)
+    mapping = {}
+    for i, name in enumerate(old_names):
+        if name is not None and by_name.get(name):
+            mapping[i] = by_name[name].pop(0)
+    return mapping
+
+def _node_label(section: str, node: Any) -> str:
+    return f"{section}/{getattr(node, 'name', None) or '?'}"
+
+def _apply_section(scenario: Scenario, section: str, plan: SectionPlan, new: Snapshot,
+                   baseline: Optional[List[Any]], local: Optional[LocalEdits], result: ReloadResult):
+    current = getattr(scenario, section)
+    mapping = _current_by_old_index(current, plan.old_names, baseline)
+    edited = local.nodes if local is not None else {}
+
+    # Nœud en mémoire pour chaque nœud du nouveau fichier (None : à décoder)
+    aligned, replaced = [], []
+    for i, (old_index, obj) in enumerate(plan.entries):
+        if old_index is not None:
+            aligned.append(mapping.get(old_index))
+            continue
+        previous = mapping.get(plan.replaces[i]) if i in plan.replaces else None
+        if previous is not None and id(previous) in edited:
+            result.conflicts.append(_node_label(section, previous))
+            aligned.append(previous)
+        else:
+            aligned.append(obj)
+            if previous is not None:
+                replaced.append((previous, obj))
+
+    placed = {id(node) for node in aligned if node is not None}
+    keep_structure = local is not None and (
+        section in local.sections or any(id(node) in edited and id(node) not in placed for node in current)
+    )
+    if keep_structure:
+        # Liste modifiée localement : seuls les nœuds changés sur disque et non
+        # modifiés localement sont remplacés ; ajouts / suppressions du fichier ignorés
+        by_old = {id(old): obj for old, obj in replaced}
+        for k, node in enumerate(current):
+            if id(node) in by_old:
+                current[k] = by_old[id(node)]
+        if plan.structural:
+            result.conflicts.append(section)
+        if replaced:
+            result.replaced[section] = replaced
+        present = {id(node) for node in current}
+        result.baseline[section] = [node if node is not None and id(node) in present else None for node in aligned]
+        return
+
+    raws = new.data.get(section) or []
+    cls = LAZY_SECTIONS[section]
+    updated = [node if node is not None else dict_to_dataclass(cls, raws[i]) for i, node in enumerate(aligned)]
+    by_old = {id(old): obj for old, obj in replaced}
+    structural = len(updated) != len(current) or any(
+        a is not b and by_old.get(id(a)) is not b for a, b in zip(current, updated)
+    )
+    current[:] = updated
+    result.baseline[section] = list(updated)
+    if structural:
+        result.restructured.append(section)
+    elif replaced:
+        result.replaced[section] = replaced
+
+def apply_reload(scenario: Scenario, plan: ReloadPlan, new: Snapshot,
+                 baseline: Dict[str, List[Any]] = None, local: LocalEdits = None) -> ReloadResult:
+    """
+    Remplace sur place les parties modifiées. Les listes de sections gardent leur identité.
+
+    - baseline : nœuds en mémoire alignés sur l'ancien fichier (`node_lists`,
+      puis `ReloadResult.baseline`) ; sans elle, correspondance par nom
+    - local : modifications non sauvegardées, conservées en cas de conflit
+    """
+    result = ReloadResult()
+    for name, value in plan.fields.items():
+        if local is not None and name in local.fields:
+            result.conflicts.append(name)
+            continue
+        setattr(scenario, name, value)
+        result.fields.append(name)
+
+    for section, section_plan in plan.sections.items():
+        _apply_section(scenario, section, section_plan, new, (baseline or {}).get(section), local, result)
+    return result
@@ -1,8 +1,17 @@
+import copy
 import json
 import re
 from dataclasses import is_dataclass, fields
-from typing import Any, Dict, List, Type, Union, get_origin, get_args
-from backend.models import *
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_origin, get_args
+from backend import codec
+from backend.symbols import SymbolTable
+from backend.models import (
+    Ns3Model, Ns3AttributeModel, PhyLocalConfig, IrsPatch, FlightPoint, Scenario, DroneConfig, NodeConfig,
+    ConstantPositionMobilityModel, ParametricSpeedDroneMobilityModel, LiIonEnergySource,
+    DroneMechanics, RemoteStationManager, ApplicationConfig, StoragePeripheral,
+    InputPeripheral, IrsPeripheral, Peripheral, snake_to_pascal,
+)
 
 # --- Gestionnaires de Casse ---
 
@@ -15,6 +24,7 @@ def camel_to_snake(camel_str: str) -> str:
     """netDevices -> net_devices"""
     return re.sub(r'(?<!^)(?=[A-Z])', '_', camel_str).lower()
 
+@lru_cache(maxsize=4096)
 def pascal_to_snake(pascal_str: str) -> str:
     """RxGain -> rx_gain"""
     if not pascal_str: return ""
@@ -23,61 +33,85 @@ def pascal_to_snake(pascal_str: str) -> str:
 
 # --- Encoder JSON ---
 
+def _encode_dataclass(obj) -> Dict[str, Any]:
+    """Convertit une dataclass en dict au format IoD-Sim (un seul niveau)."""
+    # 1. Gestion spéciale des objets Ns3Model (Structure polymorphique)
+    if isinstance(obj, Ns3Model):
+        return {
+            "name": obj.name,
+            "attributes": obj.get_ns3_attributes()
+        }
+
+    # 2. Gestion spéciale pour PhyLocalConfig (Sortie direct PascalCase)
+    if isinstance(obj, PhyLocalConfig):
+        res = {}
+        for f in fields(obj):
+            val = getattr(obj, f.name)
+            if val is not None:
+                res[snake_to_pascal(f.name)] = val
+        return res
+
+    # 3. Gestion spéciale pour IrsPatch (Sortie spécifique PascalCase)
+    if isinstance(obj, IrsPatch):
+        return {
+            "Size": obj.size,
+            "PhaseX": obj.phase_x,
+            "PhaseY": obj.phase_y
+        }
+
+    # 4. Gestion Standard (CamelCase)
+    result = {}
+    for field in fields(obj):
+        value = getattr(obj, field.name)
+
+        if value is None or field.name == "extra_attributes":
+            continue
+
+        if field.name == "ZSPs": key = "ZSPs"
+        elif field.name == "staticNs3Config": key = "staticNs3Config"
+        elif field.name == "rest_time": key = "restTime" # Exception FlightPoint
+        elif isinstance(obj, FlightPoint): key = field.name # position, interest
+        else:
+            key = to_camel_case(field.name)
+
+        result[key] = value
+    return result
+
+def to_plain(obj: Any) -> Any:
+    """Convertit récursivement un scénario en structures Python simples (dict/list/primitifs)."""
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if isinstance(obj, LazyNode):
+        # Nœud jamais ouvert : le dict JSON d'origine est réécrit tel quel
+        raw, loaded = obj.peek()
+        return raw if raw is not None else to_plain(loaded)
+    if isinstance(obj, (list, tuple)):
+        return [to_plain(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: to_plain(value) for key, value in obj.items()}
+    if is_dataclass(obj):
+        return {key: to_plain(value) for key, value in _encode_dataclass(obj).items()}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class ScenarioEncoder(json.JSONEncoder):
+    """Encodeur `json` standard (conservé pour les scripts existants)."""
     def default(self, obj):
         if is_dataclass(obj):
-            # 1. Gestion spéciale des objets Ns3Model (Structure polymorphique)
-            if isinstance(obj, Ns3Model):
-                return {
-                    "name": obj.name,
-                    "attributes": obj.get_ns3_attributes()
-                }
-
-            # 2. Gestion spéciale pour PhyLocalConfig (Sortie direct PascalCase)
-            if isinstance(obj, PhyLocalConfig):
-                res = {}
-                for f in fields(obj):
-                    val = getattr(obj, f.name)
-                    if val is not None:
-                        res[snake_to_pascal(f.name)] = val
-                return res
-
-            # 3. Gestion spéciale pour IrsPatch (Sortie spécifique PascalCase)
-            if isinstance(obj, IrsPatch):
-                return {
-                    "Size": obj.size,
-                    "PhaseX": obj.phase_x,
-                    "PhaseY": obj.phase_y
-                }
-
-            # 4. Gestion Standard (CamelCase)
-            result = {}
-            for field in fields(obj):
-                value = getattr(obj, field.name)
-                
-                if value is None or field.name == "extra_attributes":
-                    continue
-                
-                if field.name == "ZSPs": key = "ZSPs"
-                elif field.name == "staticNs3Config": key = "staticNs3Config"
-                elif field.name == "rest_time": key = "restTime" # Exception FlightPoint
-                elif isinstance(obj, FlightPoint): key = field.name # position, interest
-                else:
-                    key = to_camel_case(field.name)
-
-                result[key] = value
-            return result
-            
+            return _encode_dataclass(obj)
         return super().default(obj)
 
 # --- Decoder JSON ---
 
-def _populate_ns3_model(instance: Ns3Model, attrs_list: List[Dict[str, Any]]):
+def _populate_ns3_model(instance: Ns3Model, attrs_list: List[Dict[str, Any]], symbols: SymbolTable = None):
     field_map = {f.name: f for f in fields(instance)}
     
     for item in attrs_list:
         attr_name = item['name'] 
         attr_value = item['value']
+        if symbols is not None:
+            # Noms d'attributs (clés d'extra_attributes) et valeurs énumérées partagés
+            attr_name = symbols.intern(attr_name)
+            attr_value = symbols.value(attr_value)
         
         python_key = pascal_to_snake(attr_name)
         
@@ -88,18 +122,20 @@ def _populate_ns3_model(instance: Ns3Model, attrs_list: List[Dict[str, Any]]):
             field_type = field_map[python_key].type
             
             if python_key == "flight_plan" and isinstance(attr_value, list):
-                val = [dict_to_dataclass(FlightPoint, fp) for fp in attr_value]
+                val = [dict_to_dataclass(FlightPoint, fp, symbols) for fp in attr_value]
                 setattr(instance, python_key, val)
             elif python_key == "patches" and isinstance(attr_value, list):
-                val = [dict_to_dataclass(IrsPatch, p) for p in attr_value]
+                val = [dict_to_dataclass(IrsPatch, p, symbols) for p in attr_value]
                 setattr(instance, python_key, val)
             else:
                 setattr(instance, python_key, attr_value)
         else:
             instance.extra_attributes[attr_name] = attr_value
 
-def _resolve_ns3_class(data: Dict[str, Any], target_type: Type) -> Any:
+def _resolve_ns3_class(data: Dict[str, Any], target_type: Type, symbols: SymbolTable = None) -> Any:
     name = data.get("name", "")
+    if symbols is not None:
+        name = symbols.intern(name)
     attrs = data.get("attributes", [])
     instance = None
     
@@ -119,10 +155,14 @@ def _resolve_ns3_class(data: Dict[str, Any], target_type: Type) -> Any:
     if instance is None:
         instance = Ns3AttributeModel(name=name)
         
-    _populate_ns3_model(instance, attrs)
+    _populate_ns3_model(instance, attrs, symbols)
     return instance
 
-def dict_to_dataclass(cls: Type, data: Any) -> Any:
+def dict_to_dataclass(cls: Type, data: Any, symbols: SymbolTable = None) -> Any:
+    """
+    Construit `cls` à partir de données JSON. Avec `symbols`, les chaînes
+    répétées (TypeId, noms d'attributs, valeurs énumérées) sont partagées.
+    """
     if data is None: return None
     
     origin = get_origin(cls)
@@ -130,7 +170,7 @@ def dict_to_dataclass(cls: Type, data: Any) -> Any:
 
     # 1. Listes
     if origin is list or origin is List:
-        return [dict_to_dataclass(args[0], item) for item in data]
+        return [dict_to_dataclass(args[0], item, symbols) for item in data]
     
     # 2. Unions (C'est ici que ça plantait pour WorldDefinition)
     if origin is Union:
@@ -139,21 +179,21 @@ def dict_to_dataclass(cls: Type, data: Any) -> Any:
         if len(non_none_types) == 1:
             target_type = non_none_types[0]
             if is_dataclass(target_type):
-                return dict_to_dataclass(target_type, data)
-            return data
+                return dict_to_dataclass(target_type, data, symbols)
+            return data if symbols is None else symbols.value(data)
 
         if isinstance(data, dict) and "name" in data and "attributes" in data:
-            return _resolve_ns3_class(data, Ns3Model)
+            return _resolve_ns3_class(data, Ns3Model, symbols)
             
-        return data
+        return data if symbols is None else symbols.value(data)
 
     # 3. Primitifs
     if not is_dataclass(cls):
-        return data
+        return data if symbols is None else symbols.value(data)
 
     # 4. Ns3Model
     if issubclass(cls, Ns3Model) and isinstance(data, dict) and "attributes" in data:
-        return _resolve_ns3_class(data, cls)
+        return _resolve_ns3_class(data, cls, symbols)
 
     # 5. Dataclass Standard
     init_args = {}
@@ -180,16 +220,140 @@ def dict_to_dataclass(cls: Type, data: Any) -> Any:
             json_key = to_camel_case(field.name)
 
         if json_key in data:
-            init_args[field.name] = dict_to_dataclass(field.type, data[json_key])
+            # Les noms de nœuds sont uniques : inutile de les passer par la table
+            field_symbols = None if field.name == "name" and not issubclass(cls, Ns3Model) else symbols
+            init_args[field.name] = dict_to_dataclass(field.type, data[json_key], field_symbols)
             
     return cls(**init_args)
 
+# --- Chargement paresseux ---
+
+class LazyNode:
+    """
+    Nœud (drone, ZSP, remote, node) non décodé : conserve le dict JSON brut et
+    construit la dataclass au premier accès. Le nom est lu sans décodage. Une
+    fois la dataclass construite, le JSON brut est libéré.
+    """
+    __slots__ = ("cls", "raw", "_obj", "symbols")
+
+    def __init__(self, cls: Type, raw: Dict[str, Any], symbols: SymbolTable = None, obj: Any = None):
+        object.__setattr__(self, "cls", cls)
+        object.__setattr__(self, "raw", None if obj is not None else raw)
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "symbols", symbols)   # table du chargement d'origine
+
+    @property
+    def name(self):
+        raw, obj = self.peek()
+        return raw.get("name") if raw is not None else obj.name
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._obj is not None
+
+    def peek(self) -> Tuple[Optional[Dict[str, Any]], Any]:
+        """
+        (JSON brut, None) tant que le nœud n'est pas décodé, sinon (None, dataclass),
+        sans décoder. Lecture cohérente depuis un thread d'arrière-plan : `materialize`
+        pose la dataclass avant de libérer le JSON brut.
+        """
+        raw = self.raw
+        if raw is not None:
+            return raw, None
+        return None, self._obj
+
+    def materialize(self):
+        obj = self._obj
+        if obj is None:
+            obj = dict_to_dataclass(self.cls, self.raw, self.symbols)
+            object.__setattr__(self, "_obj", obj)
+            object.__setattr__(self, "raw", None)
+            object.__setattr__(self, "symbols", None)
+        return obj
+
+    def __getattr__(self, attr):
+        # Appelé seulement si l'attribut est introuvable : un slot non initialisé
+        # (copy / pickle construisent l'objet sans __init__) ou un protocole spécial
+        # ne doit pas déclencher le décodage (récursion infinie sinon)
+        if attr in LazyNode.__slots__ or attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.materialize(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.materialize(), attr, value)
+
+    # Copie et pickle : le proxy est conservé, décodé ou non (le JSON brut n'est
+    # jamais modifié, il peut être partagé)
+
+    def __reduce__(self):
+        return LazyNode, (self.cls, self.raw, None, self._obj)
+
+    def __copy__(self):
+        obj = self._obj
+        return LazyNode(self.cls, self.raw, self.symbols, copy.copy(obj) if obj is not None else None)
+
+    def __deepcopy__(self, memo):
+        obj = self._obj
+        return LazyNode(self.cls, self.raw, self.symbols, copy.deepcopy(obj, memo) if obj is not None else None)
+
+    def __repr__(self):
+        state = "chargé" if self._obj is not None else "brut"
+        return f"<LazyNode {self.cls.__name__} {self.name!r} ({state})>"
+
+def resolve(obj: Any) -> Any:
+    """Retourne la dataclass derrière un LazyNode (décodée si besoin), sinon l'objet lui-même."""
+    return obj.materialize() if isinstance(obj, LazyNode) else obj
+
+LAZY_SECTIONS = {"drones": DroneConfig, "ZSPs": NodeConfig, "remotes": NodeConfig, "nodes": NodeConfig}
+
+def _lazy_scenario(data: Dict[str, Any], symbols: SymbolTable = None) -> Scenario:
+    raw_sections = {key: data.pop(key, None) or [] for key in LAZY_SECTIONS}
+    scenario = dict_to_dataclass(Scenario, data, symbols)
+    for key, cls in LAZY_SECTIONS.items():
+        setattr(scenario, key, [LazyNode(cls, raw, symbols) for raw in raw_sections[key]])
+    return scenario
+
+def _decode_scenario(data: Dict[str, Any], symbols: SymbolTable = None) -> Scenario:
+    """Décodage complet ; chaque nœud brut est libéré dès sa conversion (pic mémoire réduit)."""
+    raw_sections = {key: data.pop(key, None) or [] for key in LAZY_SECTIONS}
+    scenario = dict_to_dataclass(Scenario, data, symbols)
+    for key, cls in LAZY_SECTIONS.items():
+        raws = raw_sections.pop(key)
+        nodes = []
+        for i in range(len(raws)):
+            nodes.append(dict_to_dataclass(cls, raws[i], symbols))
+            raws[i] = None
+        setattr(scenario, key, nodes)
+    return scenario
+
+def materialize_all(scenario: Scenario):
+    """Décode tous les nœuds paresseux (sur place, les proxies sont conservés)."""
+    for key in LAZY_SECTIONS:
+        for node in getattr(scenario, key):
+            resolve(node)
+
 # --- API ---
 
-def load_scenario(file_path: str) -> Scenario:
-    with open(file_path, 'r') as f:
-        return dict_to_dataclass(Scenario, json.load(f))
+def load_scenario(file_path: str, lazy: bool = False, intern: bool = True) -> Scenario:
+    """
+    Charge un scénario. Avec `lazy=True` (JSON uniquement), les listes de nœuds
+    contiennent des `LazyNode` décodés à la demande (voir `resolve`).
+    `intern` partage les chaînes répétées via une `SymbolTable` propre au chargement.
+    """
+    from backend import binary   # importé ici : binary dépend de ce module
+    if file_path.endswith(binary.EXTENSION):
+        return binary.load_scenario_binary(file_path)
+    with open(file_path, 'rb') as f:
+        data = codec.loads(f.read())
+    symbols = SymbolTable() if intern else None
+    if lazy:
+        return _lazy_scenario(data, symbols)
+    return _decode_scenario(data, symbols)
 
-def save_scenario(scenario: Scenario, file_path: str):
-    with open(file_path, 'w') as f:
-        json.dump(scenario, f, cls=ScenarioEncoder, indent=4)
\ No newline at end of file
+def save_scenario(scenario: Scenario, file_path: str, indent: bool = True):
+    from backend import binary
+    if file_path.endswith(binary.EXTENSION):
+        return binary.save_scenario_binary(scenario, file_path)
+    data = codec.dumps(to_plain(scenario), indent=indent)
+    with open(file_path, 'wb') as f:
+        f.write(data)
@@ -0,0 +1,459 @@
+"""
+Profil statistique d'un scénario (avant soumission au cluster).
+
+- nombre de nœuds par section et par modèle de mobilité ;
+- nombre total de points de passage et boîte englobante des positions ;
+- charge applicative : somme de taille de paquet / intervalle (octets/s) ;
+- puissance des périphériques (somme du plus fort état de `PowerConsumption`) ;
+- densité de bâtiments par région d'intérêt.
+
+Chaque nœud occupe une ligne d'un tableau par colonne (`array.array`,
+stdlib). Un parcours extrait ses contributions, puis l'agrégation lit les
+colonnes d'un bloc : vues NumPy sans copie si NumPy est installé, fonctions
+intégrées sinon. Une modification ne réécrit que la ligne du nœud
+(`tracking.NodeTracker`) et corrige les totaux de l'écart entre l'ancienne et
+la nouvelle ligne ; seule la boîte englobante est recalculée sur les colonnes,
+et seulement si un nœud qui la touchait s'est déplacé vers l'intérieur ou a
+été retiré. Les nœuds paresseux non décodés sont lus depuis leur JSON brut.
+"""
+import copy
+import gc
+import math
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.models import Scenario
+from backend.serializer import LazyNode
+from backend.tracking import SECTIONS, NodeTracker
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MOBILITY_KINDS = ("ConstantPosition", "ParametricSpeed", "autre", "aucune")
+_NAN = float("nan")
+_TIME_UNITS = (("ms", 1e-3), ("us", 1e-6), ("ns", 1e-9), ("s", 1.0))
+
+# --- Contributions d'un nœud ---
+
+@dataclass
+class NodeStats:
+    mobility: int = 3                      # index dans MOBILITY_KINDS
+    waypoints: int = 0
+    bbox: Tuple[float, ...] = (_NAN,) * 6  # xmin, ymin, zmin, xmax, ymax, zmax
+    applications: int = 0
+    traffic: float = 0.0                   # octets/s
+    peripherals: int = 0
+    power: float = 0.0                     # W
+
+def _seconds(value: Any) -> Optional[float]:
+    """Durée ns-3 : nombre (secondes) ou chaîne avec unité ("500ms", "0.5s")."""
+    if type(value) is float:
+        return value
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        for suffix, scale in _TIME_UNITS:
+            if text.endswith(suffix):
+                text, factor = text[:-len(suffix)], scale
+                break
+        else:
+            factor = 1.0
+        try:
+            return float(text) * factor
+        except ValueError:
+            return None
+    return None
+
+def _rate(size: Any, interval: Any) -> float:
+    seconds = _seconds(interval)
+    try:
+        size = float(size)
+    except (TypeError, ValueError):
+        return 0.0
+    return size / seconds if seconds and seconds > 0 else 0.0
+
+def _peak(consumption: Any) -> float:
+    if not consumption:
+        return 0.0
+    try:
+        return float(max(consumption))   # cas courant : liste de nombres
+    except (TypeError, ValueError):
+        values = [v for v in consumption if isinstance(v, (int, float))]
+        return float(max(values)) if values else 0.0
+
+@lru_cache(maxsize=256)
+def _mobility_kind(name: Optional[str]) -> int:
+    if not name:
+        return 3
+    if "ConstantPosition" in name:
+        return 0
+    if "ParametricSpeed" in name:
+        return 1
+    return 2
+
+def _bbox(positions: List[Any]) -> Tuple[float, ...]:
+    try:
+        xs, ys, zs = zip(*positions)   # cas courant : positions [x, y, z] valides
+    except (TypeError, ValueError):
+        points = [p[:3] for p in positions if isinstance(p, (list, tuple)) and len(p) >= 3]
+        if not points:
+            return (_NAN,) * 6
+        xs, ys, zs = zip(*points)
+    return (min(xs), min(ys), min(zs), max(xs), max(ys), max(zs))
+
+def _attrs(raw: Any) -> Dict[str, Any]:
+    if not isinstance(raw, dict):
+        return {}
+    return {item.get("name"): item.get("value") for item in raw.get("attributes") or [] if isinstance(item, dict)}
+
+def _raw_stats(raw: Dict[str, Any]) -> NodeStats:
+    stats = NodeStats()
+    mobility = raw.get("mobilityModel")
+    if isinstance(mobility, dict):
+        stats.mobility = _mobility_kind(mobility.get("name"))
+        attrs = _attrs(mobility)
+        plan = [p.get("position") for p in attrs.get("FlightPlan") or [] if isinstance(p, dict)]
+        stats.waypoints = len(plan)
+        stats.bbox = _bbox(plan or [attrs.get("Position")])
+    for app in raw.get("applications") or []:
+        attrs = _attrs(app)
+        stats.applications += 1
+        stats.traffic += _rate(attrs.get("PacketSize") or attrs.get("PayloadSize"),
+                               attrs.get("Interval") or attrs.get("TransmissionInterval"))
+    for peripheral in raw.get("peripherals") or []:
+        stats.peripherals += 1
+        stats.power += _peak(_attrs(peripheral).get("PowerConsumption"))
+    return stats
+
+def node_stats(node) -> NodeStats:
+    """Contributions d'un nœud (dataclass, ou JSON brut pour un LazyNode non décodé)."""
+    if isinstance(node, LazyNode):
+        raw, node = node.peek()
+        if raw is not None:
+            return _raw_stats(raw)
+    # Appelée pour chaque nœud du scénario : pas d'objet intermédiaire avant NodeStats
+    mobility = getattr(node, "mobility_model", None)
+    if mobility is not None:
+        kind = _mobility_kind(getattr(mobility, "name", None))
+        plan = getattr(mobility, "flight_plan", None)
+        waypoints = len(plan) if plan else 0
+        bbox = _bbox([p.position for p in plan] if plan else [getattr(mobility, "position", None)])
+    else:
+        kind, waypoints, bbox = 3, 0, (_NAN,) * 6
+    applications = getattr(node, "applications", None) or ()
+    traffic = 0.0
+    for app in applications:
+        traffic += _rate(app.packet_size or app.payload_size, app.interval or app.transmission_interval)
+    peripherals = getattr(node, "peripherals", None) or ()
+    power = 0.0
+    for peripheral in peripherals:
+        power += _peak(peripheral.power_consumption)
+    return NodeStats(kind, waypoints, bbox, len(applications), traffic, len(peripherals), power)
+
+# --- Bâtiments ---
+
+@dataclass
+class RegionDensity:
+    label: str
+    area_km2: float
+    buildings: int           # bâtiments dont l'emprise touche la région
+    density_km2: float       # bâtiments / km²
+    coverage: float          # part de la surface couverte par les emprises (0-1)
+
+def _footprints(boxes: List[Any]) -> List[Tuple[float, float, float, float]]:
+    """Emprises au sol (xmin, xmax, ymin, ymax) des boîtes [xmin, xmax, ymin, ymax, ...]."""
+    out = []
+    for box in boxes:
+        if isinstance(box, (list, tuple)) and len(box) >= 4:
+            x0, x1, y0, y1 = (float(v) for v in box[:4])
+            out.append((min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)))
+    return out
+
+def _overlaps(regions, buildings) -> Tuple[List[int], List[float]]:
+    """Par région : nombre de bâtiments qui la touchent et surface d'intersection totale."""
+    if not buildings:
+        return [0] * len(regions), [0.0] * len(regions)
+    if np is not None:
+        r = np.asarray(regions, dtype=float)[:, None, :]
+        b = np.asarray(buildings, dtype=float)[None, :, :]
+        dx = np.minimum(r[..., 1], b[..., 1]) - np.maximum(r[..., 0], b[..., 0])
+        dy = np.minimum(r[..., 3], b[..., 3]) - np.maximum(r[..., 2], b[..., 2])
+        inside = (dx > 0) & (dy > 0)
+        area = np.where(inside, dx * dy, 0.0)
+        return inside.sum(axis=1).tolist(), area.sum(axis=1).tolist()
+    counts, areas = [], []
+    for rx0, rx1, ry0, ry1 in regions:
+        n, total = 0, 0.0
+        for bx0, bx1, by0, by1 in buildings:
+            dx = min(rx1, bx1) - max(rx0, bx0)
+            dy = min(ry1, by1) - max(ry0, by0)
+            if dx > 0 and dy > 0:
+                n += 1
+                total += dx * dy
+        counts.append(n)
+        areas.append(total)
+    return counts, areas
+
+def building_density(scenario: Scenario) -> List[RegionDensity]:
+    """Densité par région d'intérêt, plus le monde entier si sa taille est connue."""
+    world = scenario.world
+    if world is None:
+        return []
+    labels, regions = [], []
+    size = world.size or {}
+    try:
+        regions.append((0.0, float(size["X"]), 0.0, float(size["Y"])))
+        labels.append("monde")
+    except (KeyError, TypeError, ValueError):
+        pass
+    for i, region in enumerate(_footprints(world.regionsOfInterest or [])):
+        regions.append(region)
+        labels.append(f"région {i}")
+    if not regions:
+        return []
+    counts, areas = _overlaps(regions, _footprints([b.boundaries for b in world.buildings or []]))
+    out = []
+    for label, (x0, x1, y0, y1), n, covered in zip(labels, regions, counts, areas):
+        surface = (x1 - x0) * (y1 - y0)
+        km2 = surface / 1e6
+        out.append(RegionDensity(label, km2, n, n / km2 if km2 > 0 else 0.0,
+                                 min(covered / surface, 1.0) if surface > 0 else 0.0))
+    return out
+
+# --- Profil ---
+
+@dataclass
+class ScenarioProfile:
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)   # section -> modèle de mobilité -> nœuds
+    nodes: int = 0
+    waypoints: int = 0
+    bbox: Optional[Tuple[float, ...]] = None                          # xmin, ymin, zmin, xmax, ymax, zmax
+    applications: int = 0
+    traffic: float = 0.0                                              # octets/s
+    peripherals: int = 0
+    power: float = 0.0                                                # W
+    regions: List[RegionDensity] = field(default_factory=list)
+
+def format_profile(profile: ScenarioProfile) -> str:
+    lines = [f"Nœuds : {profile.nodes}"]
+    for section, kinds in profile.counts.items():
+        detail = ", ".join(f"{kind} {n}" for kind, n in kinds.items() if n)
+        lines.append(f"  {section} : {sum(kinds.values())}" + (f" ({detail})" if detail else ""))
+    lines.append(f"Points de passage : {profile.waypoints}")
+    if profile.bbox is not None:
+        x0, y0, z0, x1, y1, z1 = profile.bbox
+        lines.append(f"Boîte englobante : x [{x0:g}, {x1:g}]  y [{y0:g}, {y1:g}]  z [{z0:g}, {z1:g}]")
+    lines.append(f"Applications : {profile.applications} — charge {profile.traffic * 8 / 1e6:.3f} Mbit/s")
+    lines.append(f"Périphériques : {profile.peripherals} — puissance {profile.power:g} W")
+    for region in profile.regions:
+        lines.append(f"Bâtiments ({region.label}, {region.area_km2:g} km²) : {region.buildings} — "
+                     f"{region.density_km2:.1f}/km², emprise {region.coverage:.1%}")
+    return "\n".join(lines)
+
+_TOTALS = ("waypoints", "applications", "peripherals", "traffic", "power")
+_MINS, _MAXS = ("xmin", "ymin", "zmin"), ("xmax", "ymax", "zmax")
+
+class ScenarioStats(NodeTracker):
+    """
+    Contributions par nœud rangées en colonnes, une ligne par nœud. Les lignes
+    libérées sont réutilisées. Le profil agrégé est tenu à jour ligne par ligne
+    après le premier calcul complet.
+    """
+
+    _COLUMNS = (("section", "b"), ("mobility", "b"), ("waypoints", "q"), ("applications", "q"),
+                ("traffic", "d"), ("peripherals", "q"), ("power", "d"),
+                ("xmin", "d"), ("ymin", "d"), ("zmin", "d"), ("xmax", "d"), ("ymax", "d"), ("zmax", "d"))
+
+    def __init__(self):
+        super().__init__()
+        self.columns: Dict[str, array] = {name: array(code) for name, code in self._COLUMNS}
+        self._ordered = [self.columns[name] for name, _ in self._COLUMNS]
+        self.regions: List[RegionDensity] = []
+        self._rows: Dict[int, int] = {}                 # id(nœud) -> ligne
+        self._free: List[int] = []
+        self._totals: Optional[ScenarioProfile] = None  # agrégat courant (None : calcul complet à faire)
+        self._bbox_stale = False
+        self._profile: Optional[ScenarioProfile] = None # copie remise à l'appelant
+
+    def build(self, scenario: Scenario):
+        self.__init__()
+        # Chaque nœud alloue quelques tuples temporaires : le GC cyclique se
+        # déclencherait des centaines de fois en reparcourant tout le scénario chargé
+        # (≈ 5 s au lieu de ≈ 1 s pour 50 000 drones)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            rows = []
+            for s, section in enumerate(SECTIONS):
+                for node in getattr(scenario, section, None) or []:
+                    values = self._values(s, node_stats(node))
+                    if self._track(section, node):
+                        self._rows[id(node)] = len(rows)
+                        rows.append(values)
+                    else:   # même objet dans deux listes : comme update_node, sa ligne est réécrite
+                        rows[self._rows[id(node)]] = values
+            # Une colonne entière à la fois plutôt qu'un ajout par colonne et par nœud
+            for column, values in zip(self._ordered, zip(*rows)):
+                column.extend(values)
+        finally:
+            if enabled:
+                gc.enable()
+        self.update_world(scenario)
+
+    # Mises à jour
+
+    @staticmethod
+    def _values(section: int, stats: NodeStats) -> Tuple[Any, ...]:
+        """Ligne d'un nœud, dans l'ordre de `_COLUMNS`."""
+        return (section, stats.mobility, stats.waypoints, stats.applications,
+                stats.traffic, stats.peripherals, stats.power) + tuple(stats.bbox)
+
+    def _write(self, row: int, section: str, stats: NodeStats):
+        values = self._values(SECTIONS.index(section), stats)
+        if row == len(self._ordered[0]):
+            for column, value in zip(self._ordered, values):
+                column.append(value)
+        else:
+            for column, value in zip(self._ordered, values):
+                column[row] = value
+
+    def _count_row(self, row: int, sign: int):
+        """Ajoute (sign = 1) ou retire (sign = -1) la contribution d'une ligne à l'agrégat."""
+        totals, columns = self._totals, self.columns
+        section = columns["section"][row]
+        if totals is None or section < 0:
+            return
+        totals.counts[SECTIONS[section]][MOBILITY_KINDS[columns["mobility"][row]]] += sign
+        totals.nodes += sign
+        for name in _TOTALS:
+            setattr(totals, name, getattr(totals, name) + sign * columns[name][row])
+        if math.isnan(columns["xmin"][row]) or self._bbox_stale:
+            return
+        box = [columns[name][row] for name in _MINS + _MAXS]
+        if sign > 0:
+            if totals.bbox is None:
+                totals.bbox = tuple(box)
+            else:
+                totals.bbox = tuple(min(a, b) for a, b in zip(totals.bbox[:3], box[:3])) + \
+                              tuple(max(a, b) for a, b in zip(totals.bbox[3:], box[3:]))
+        elif any(a == b for a, b in zip(totals.bbox, box)):
+            # La ligne retirée touchait la boîte : recalcul sur les colonnes au prochain profil
+            self._bbox_stale = True
+
+    def update_node(self, section: str, node):
+        key = id(node)
+        self._track(section, node)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._free.pop() if self._free else len(self.columns["section"])
+            self._rows[key] = row
+        else:
+            self._count_row(row, -1)
+        self._write(row, section, node_stats(node))
+        self._count_row(row, 1)
+        self._profile = None
+
+    def remove_node(self, node):
+        if self._untrack(node) is None:
+            return
+        row = self._rows.pop(id(node))
+        self._count_row(row, -1)
+        self.columns["section"][row] = -1   # ligne libre, ignorée par l'agrégation
+        self._free.append(row)
+        self._profile = None
+
+    def mark_dirty(self, node):
+        """Le nœud a pu être modifié : ses contributions seront recalculées par `refresh`."""
+        super().mark_dirty(node)
+        if id(node) in self._nodes:
+            self._profile = None
+
+    def update_world(self, scenario: Scenario):
+        self.regions = building_density(scenario)
+        self._profile = None
+
+    # Agrégation
+
+    def profile(self) -> ScenarioProfile:
+        """
+        Profil courant. Le premier appel agrège toutes les colonnes ; ensuite les
+        totaux suivent les modifications et seule la boîte englobante peut
+        demander un nouveau passage sur les colonnes.
+        """
+        self.refresh()
+        if self._totals is None:
+            self._totals = (_aggregate_numpy if np is not None else _aggregate_python)(self.columns)
+            self._bbox_stale = False
+        elif self._bbox_stale:
+            self._totals.bbox = (_bbox_numpy if np is not None else _bbox_python)(self.columns)
+            self._bbox_stale = False
+        if self._profile is None:
+            # Copie : l'agrégat continue d'évoluer (tâche de fond) après la remise du profil
+            self._profile = copy.copy(self._totals)
+            self._profile.counts = {section: dict(kinds) for section, kinds in self._totals.counts.items()}
+            self._profile.regions = list(self.regions)
+        return self._profile
+
+def _empty_counts() -> Dict[str, Dict[str, int]]:
+    return {section: {kind: 0 for kind in MOBILITY_KINDS} for section in SECTIONS}
+
+def _aggregate_numpy(columns: Dict[str, array]) -> ScenarioProfile:
+    # Vues sur les tampons des array.array : aucune copie avant le masque
+    view = {name: np.frombuffer(column, dtype=column.typecode) for name, column in columns.items() if len(column)}
+    profile = ScenarioProfile(counts=_empty_counts())
+    if not view:
+        return profile
+    live = view["section"] >= 0
+    section = view["section"][live].astype(np.int64)
+    mobility = view["mobility"][live].astype(np.int64)
+    kinds = len(MOBILITY_KINDS)
+    counts = np.bincount(section * kinds + mobility, minlength=len(SECTIONS) * kinds)
+    for s, name in enumerate(SECTIONS):
+        profile.counts[name] = dict(zip(MOBILITY_KINDS, counts[s * kinds:(s + 1) * kinds].tolist()))
+    profile.nodes = int(live.sum())
+    for name in ("waypoints", "applications", "peripherals"):
+        setattr(profile, name, int(view[name][live].sum()))
+    profile.traffic = float(view["traffic"][live].sum())
+    profile.power = float(view["power"][live].sum())
+    profile.bbox = _bbox_numpy(columns, view, live)
+    return profile
+
+def _bbox_numpy(columns: Dict[str, array], view=None, live=None) -> Optional[Tuple[float, ...]]:
+    if not len(columns["section"]):
+        return None
+    if view is None:
+        view = {name: np.frombuffer(columns[name], dtype="d") for name in _MINS + _MAXS}
+        live = np.frombuffer(columns["section"], dtype="b") >= 0
+    placed = live & ~np.isnan(view["xmin"])
+    if not placed.any():
+        return None
+    return tuple(float(view[n][placed].min()) for n in _MINS) + tuple(float(view[n][placed].max()) for n in _MAXS)
+
+def _aggregate_python(columns: Dict[str, array]) -> ScenarioProfile:
+    profile = ScenarioProfile(counts=_empty_counts())
+    live = [row for row, s in enumerate(columns["section"]) if s >= 0]
+    kinds = columns["mobility"]
+    for row in live:
+        profile.counts[SECTIONS[columns["section"][row]]][MOBILITY_KINDS[kinds[row]]] += 1
+    profile.nodes = len(live)
+    for name in _TOTALS:
+        column = columns[name]
+        setattr(profile, name, sum(column[row] for row in live))
+    profile.bbox = _bbox_python(columns, live)
+    return profile
+
+def _bbox_python(columns: Dict[str, array], live: List[int] = None) -> Optional[Tuple[float, ...]]:
+    if live is None:
+        live = [row for row, s in enumerate(columns["section"]) if s >= 0]
+    placed = [row for row in live if not math.isnan(columns["xmin"][row])]
+    if not placed:
+        return None
+    return tuple(min(columns[n][row] for row in placed) for n in _MINS) + \
+           tuple(max(columns[n][row] for row in placed) for n in _MAXS)
@@ -0,0 +1,213 @@
+"""
+Génération de variantes de scénario par balayage de paramètres.
+
+Une grille associe un chemin de paramètre à une liste de valeurs ; chaque
+combinaison (produit cartésien, dans l'ordre de la grille) donne une variante.
+
+Chemins : noms de champs Python séparés par des points, `[i]` pour un index,
+`[*]` pour tous les éléments d'une liste, plus le paramètre spécial
+`drone_count` :
+
+    {
+        "duration": [60, 120],
+        "drone_count": [10, 50],
+        "drones[*].net_devices[*].phy.tx_power": [10.0, 20.0],
+        "drones[*].battery.li_ion_energy_source_initial_energy_j": [100.0, 200.0],
+        "drones[*].applications[*].interval": [0.5, 1.0]
+    }
+
+Les variantes partagent avec la base tous les sous-arbres non modifiés
+(copie sur écriture) : seuls les objets situés sur le chemin d'un paramètre
+sont copiés. L'encodage et l'écriture sont répartis sur plusieurs processus ;
+le fichier de la variante i est toujours `<prefix>_<i:04d>.json`.
+
+    python -m backend.sweep base.json grid.json -o variants/ -j 8
+"""
+import argparse
+import copy
+import itertools
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Iterator, List, Tuple, Union, get_args, get_origin
+
+from backend import codec, serializer
+from backend.serializer import resolve
+from backend.clone import clone_node
+from backend.models import Scenario
+
+DRONE_COUNT = "drone_count"
+
+_TOKEN = re.compile(r"([^.\[\]]+)|\[(\*|\d+)\]")
+
+# --- Chemins ---
+
+def parse_path(path: str) -> List[Union[str, int]]:
+    """"drones[*].battery.mass" -> ["drones", "*", "battery", "mass"]"""
+    parts = []
+    for name, index in _TOKEN.findall(path):
+        if name:
+            parts.append(name)
+        elif index == "*":
+            parts.append("*")
+        else:
+            parts.append(int(index))
+    if not parts:
+        raise ValueError(f"Chemin de paramètre vide: {path!r}")
+    return parts
+
+def _default_for_field(obj, name: str):
+    """Instance par défaut d'un champ dataclass optionnel encore à None."""
+    for f in fields(obj):
+        if f.name != name:
+            continue
+        candidates = [t for t in get_args(f.type) if t is not type(None)] if get_origin(f.type) is Union else [f.type]
+        for t in candidates:
+            if is_dataclass(t):
+                return t()
+    raise ValueError(f"{type(obj).__name__}.{name} est vide et ne peut pas être créé")
+
+def _cow_set(obj: Any, parts: List[Union[str, int]], value: Any) -> Any:
+    """Retourne une copie de `obj` où seul le chemin `parts` est recopié et modifié."""
+    head, rest = parts[0], parts[1:]
+    # Un nœud paresseux est décodé avant copie : son proxy ne doit pas être partagé
+    obj = resolve(obj)
+
+    if head == "*":
+        return [_cow_set(item, rest, value) if rest else value for item in obj]
+
+    if isinstance(head, int):
+        new = list(obj)
+        new[head] = _cow_set(obj[head], rest, value) if rest else value
+        return new
+
+    if not hasattr(obj, head):
+        raise AttributeError(f"{type(obj).__name__} n'a pas de champ {head!r}")
+    new = copy.copy(obj)
+    if rest:
+        child = getattr(obj, head)
+        if child is None:
+            child = _default_for_field(obj, head)
+        value = _cow_set(child, rest, value)
+    setattr(new, head, value)
+    return new
+
+def _with_drone_count(scenario: Scenario, count: int) -> Scenario:
+    if not scenario.drones and count:
+        raise ValueError("drone_count nécessite au moins un drone dans le scénario de base")
+    new = copy.copy(scenario)
+    drones = scenario.drones[:count]
+    if count > len(drones):
+        drones.extend(clone_node(scenario.drones[-1], count - len(drones), start=len(drones)))
+    new.drones = drones
+    return new
+
+# --- Variantes ---
+
+def apply_overrides(base: Scenario, params: Dict[str, Any]) -> Scenario:
+    """Construit une variante de `base` ; `base` n'est jamais modifiée."""
+    variant = base
+    # Le nombre de drones d'abord : les chemins drones[*] s'appliquent ensuite à tous
+    if DRONE_COUNT in params:
+        variant = _with_drone_count(variant, int(params[DRONE_COUNT]))
+    for path, value in params.items():
+        if path != DRONE_COUNT:
+            variant = _cow_set(variant, parse_path(path), value)
+    if variant is base:
+        variant = copy.copy(base)
+    return variant
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Produit cartésien de la grille, dans l'ordre des clés puis des valeurs."""
+    keys = list(grid)
+    for key in keys:
+        if key != DRONE_COUNT:
+            parse_path(key)
+        if not isinstance(grid[key], list) or not grid[key]:
+            raise ValueError(f"La grille doit associer une liste non vide à {key!r}")
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+def variant_name(prefix: str, index: int) -> str:
+    return f"{prefix}_{index:04d}"
+
+def iter_variants(base: Scenario, grid: Dict[str, List[Any]], prefix: str = None) -> Iterator[Tuple[Dict[str, Any], Scenario]]:
+    """Variantes en mémoire (partage structurel avec `base`)."""
+    prefix = prefix or base.name
+    for i, params in enumerate(expand_grid(grid)):
+        variant = apply_overrides(base, params)
+        variant.name = variant_name(prefix, i)
+        yield params, variant
+
+# --- Écriture parallèle ---
+
+_WORKER_BASE = None
+
+def _init_worker(base: Scenario):
+    global _WORKER_BASE
+    _WORKER_BASE = base
+
+def _write_variant(job: Tuple[int, Dict[str, Any], str, str, bool]) -> str:
+    index, params, out_dir, prefix, indent = job
+    variant = apply_overrides(_WORKER_BASE, params)
+    variant.name = variant_name(prefix, index)
+    path = os.path.join(out_dir, variant.name + ".json")
+    with open(path, 'wb') as f:
+        f.write(codec.dumps(serializer.to_plain(variant), indent=indent))
+    return path
+
+def run_sweep(base: Scenario, grid: Dict[str, List[Any]], out_dir: str, prefix: str = None,
+              jobs: int = None, indent: bool = True) -> List[str]:
+    """
+    Écrit toutes les variantes dans `out_dir` plus un manifeste
+    (`<prefix>_manifest.json` : fichier -> paramètres). Retourne les chemins écrits.
+    """
+    prefix = prefix or base.name
+    combos = expand_grid(grid)
+    os.makedirs(out_dir, exist_ok=True)
+    jobs_list = [(i, params, out_dir, prefix, indent) for i, params in enumerate(combos)]
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(jobs_list) == 1:
+        _init_worker(base)
+        try:
+            paths = [_write_variant(job) for job in jobs_list]
+        finally:
+            _init_worker(None)
+    else:
+        # La base est transmise une seule fois par processus (initializer)
+        chunksize = max(1, len(jobs_list) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(base,)) as pool:
+            paths = list(pool.map(_write_variant, jobs_list, chunksize=chunksize))
+
+    manifest = [{"file": os.path.basename(p), "params": params} for p, params in zip(paths, combos)]
+    with open(os.path.join(out_dir, f"{prefix}_manifest.json"), 'wb') as f:
+        f.write(codec.dumps(manifest))
+    return paths
+
+# --- CLI ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.sweep",
+        description="Génère des variantes d'un scénario IoD-Sim à partir d'une grille de paramètres.",
+    )
+    parser.add_argument("base", help="Scénario de base (.json ou .iodb)")
+    parser.add_argument("grid", help="Grille JSON {chemin: [valeurs, ...]}")
+    parser.add_argument("-o", "--output", required=True, help="Dossier de sortie")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Nombre de processus (défaut : nb de cœurs)")
+    parser.add_argument("--prefix", default=None, help="Préfixe des fichiers (défaut : nom du scénario)")
+    parser.add_argument("--compact", action="store_true", help="JSON compact (sans indentation)")
+    args = parser.parse_args(argv)
+
+    base = serializer.load_scenario(args.base)
+    with open(args.grid, 'rb') as f:
+        grid = codec.loads(f.read())
+
+    paths = run_sweep(base, grid, args.output, prefix=args.prefix, jobs=args.jobs, indent=not args.compact)
+    print(f"{len(paths)} variante(s) écrite(s) dans {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Table de symboles d'un chargement.
+
+Un gros scénario répète les mêmes chaînes des milliers de fois : TypeId ns-3
+(`ns3::...`), noms d'attributs (clés d'`extra_attributes`), types de bearer
+LTE, clés de `staticNs3Config`, modes de données... Après décodage JSON,
+chaque occurrence est un objet distinct. Le décodeur (`dict_to_dataclass`)
+les fait passer par une `SymbolTable` : une seule instance par valeur, donc
+moins de mémoire et des comparaisons d'égalité réduites à une comparaison
+d'identité (diff, recherche).
+"""
+import sys
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict
+
+MAX_SYMBOL_LENGTH = 64   # au-delà, une chaîne est rarement répétée (chemins, descriptions...)
+
+class SymbolTable:
+    """Chaînes partagées d'un chargement (une table par appel à `load_scenario`)."""
+
+    __slots__ = ("_strings", "hits")
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self.hits = 0   # occurrences remplacées par une instance existante
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, s: str) -> str:
+        shared = self._strings.get(s)
+        if shared is None:
+            self._strings[s] = s
+            return s
+        self.hits += 1
+        return shared
+
+    def value(self, v: Any) -> Any:
+        """Partage les chaînes courtes (et celles d'une liste de chaînes) ; le reste est inchangé."""
+        if type(v) is str:
+            return self.intern(v) if len(v) <= MAX_SYMBOL_LENGTH else v
+        if type(v) is list and v and type(v[0]) is str:
+            return [self.value(item) for item in v]
+        return v
+
+# --- Rapport mémoire ---
+
+def _walk_strings(obj: Any, seen_containers: set, out: list):
+    t = type(obj)
+    if t is str:
+        out.append(obj)
+        return
+    if t in (int, float, bool) or obj is None:
+        return
+    if id(obj) in seen_containers:
+        return
+    seen_containers.add(id(obj))
+    if t in (list, tuple):
+        for item in obj:
+            _walk_strings(item, seen_containers, out)
+    elif t is dict:
+        for key, value in obj.items():
+            _walk_strings(key, seen_containers, out)
+            _walk_strings(value, seen_containers, out)
+    elif is_dataclass(obj):
+        for f in fields(obj):
+            _walk_strings(getattr(obj, f.name), seen_containers, out)
+    elif hasattr(obj, "materialize"):   # LazyNode
+        raw, loaded = obj.peek()
+        _walk_strings(raw if raw is not None else loaded, seen_containers, out)
+
+def memory_report(scenario: Any) -> Dict[str, Any]:
+    """
+    Chaînes référencées par le scénario : nombre d'occurrences, d'objets
+    distincts et de valeurs distinctes, et octets correspondants.
+    `wasted_bytes` : mémoire occupée par des copies d'une même valeur.
+    """
+    strings = []
+    _walk_strings(scenario, set(), strings)
+    objects = {id(s): s for s in strings}
+    values = {}
+    for s in objects.values():
+        values.setdefault(s, s)
+    object_bytes = sum(sys.getsizeof(s) for s in objects.values())
+    value_bytes = sum(sys.getsizeof(s) for s in values)
+    return {
+        "occurrences": len(strings),
+        "objects": len(objects),
+        "distinct_values": len(values),
+        "object_bytes": object_bytes,
+        "wasted_bytes": object_bytes - value_bytes,
+    }
+
+def format_report(report: Dict[str, Any]) -> str:
+    return (
+        f"chaînes : {report['occurrences']} occurrences, {report['objects']} objets, "
+        f"{report['distinct_values']} valeurs distinctes ; "
+        f"{report['object_bytes'] / 1e6:.2f} Mo dont {report['wasted_bytes'] / 1e6:.2f} Mo de doublons"
+    )
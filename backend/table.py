@@ -0,0 +1,199 @@
+"""
+Vue tabulaire d'une liste homogène de nœuds (édition en masse).
+
+Colonnes : champs primitifs du nœud (name, network_layer...) puis attributs
+aplatis des modèles ns-3 rattachés (mobility_model.curve_step,
+battery.li_ion_energy_source_initial_energy_j, mobility_model.SomeExtra...).
+Les modifications sont regroupées par ligne et appliquées en une seule passe.
+"""
+import csv
+import io
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union, get_args, get_origin
+
+from backend.models import Ns3Model
+from backend.serializer import resolve
+from backend.tracking import SCALARS, field_names
+
+Assignment = Tuple[int, int, Any]  # (ligne, colonne, valeur)
+
+def _scalar_type(tp) -> Optional[type]:
+    """Type scalaire d'une annotation (Optional[float] -> float), None sinon."""
+    if get_origin(tp) is Literal:
+        return str
+    if get_origin(tp) is Union:
+        members = [t for t in get_args(tp) if t is not type(None)]
+        return _scalar_type(members[0]) if len(members) == 1 else None
+    return tp if tp in SCALARS else None
+
+# --- Colonnes ---
+
+@dataclass
+class Column:
+    label: str
+    path: Tuple[str, ...]          # ("mobility_model", "curve_step") ; extra : (..., "extra_attributes", clé)
+    type: Optional[type] = None    # type scalaire attendu (None = texte libre)
+    owner: Optional[type] = None   # classe portant l'attribut (None = le nœud lui-même)
+
+    @property
+    def is_extra(self) -> bool:
+        return len(self.path) >= 2 and self.path[-2] == "extra_attributes"
+
+    def _target(self, node):
+        obj = resolve(node)
+        for part in self.path[:-1]:
+            if part == "extra_attributes":
+                break
+            obj = getattr(obj, part, None)
+            if obj is None:
+                return None
+        if self.owner is not None and not isinstance(obj, self.owner):
+            return None
+        # Seuls les champs déclarés sont écrits : un attribut posé hors de
+        # `fields()` serait affiché comme modifié puis perdu à la sauvegarde.
+        if self.is_extra:
+            return obj if isinstance(obj, Ns3Model) else None
+        return obj if self.path[-1] in field_names(type(obj)) else None
+
+    def applies(self, node) -> bool:
+        return self._target(node) is not None
+
+    def get(self, node) -> Any:
+        target = self._target(node)
+        if target is None:
+            return None
+        if self.is_extra:
+            return target.extra_attributes.get(self.path[-1])
+        return getattr(target, self.path[-1], None)
+
+    def set(self, node, value) -> bool:
+        target = self._target(node)
+        if target is None:
+            return False
+        if self.is_extra:
+            target.extra_attributes[self.path[-1]] = value
+        else:
+            setattr(target, self.path[-1], value)
+        return True
+
+    def coerce(self, value: Any) -> Any:
+        """Convertit une saisie (texte, CSV) vers le type de la colonne."""
+        if not isinstance(value, str) or self.type in (None, str):
+            return value
+        text = value.strip()
+        if text == "":
+            return None
+        if self.type is bool:
+            return text.lower() in ("1", "true", "vrai", "yes", "oui", "x")
+        if self.type is int:
+            try:
+                return int(text)
+            except ValueError:
+                number = float(text)
+            if not number.is_integer():
+                raise ValueError(f"Entier attendu pour {self.label} : {text!r}")
+            return int(number)
+        return self.type(text)
+
+def derive_columns(node_cls: type, nodes: Sequence[Any], sample: int = 200) -> List[Column]:
+    """
+    Colonnes d'une liste de nœuds. Les types de modèles ns-3 et les clés
+    d'`extra_attributes` sont relevés sur les `sample` premiers nœuds.
+    """
+    columns = []
+    model_fields = []
+    for f in fields(node_cls):
+        scalar = _scalar_type(f.type)
+        if scalar is not None:
+            columns.append(Column(f.name, (f.name,), scalar))
+        elif not _is_list(f.type):
+            model_fields.append(f.name)
+
+    # Modèles rencontrés par champ, dans l'ordre d'apparition
+    seen: Dict[str, Dict[type, Dict[str, type]]] = {name: {} for name in model_fields}
+    for node in nodes[:sample]:
+        node = resolve(node)
+        for name in model_fields:
+            model = getattr(node, name, None)
+            if not is_dataclass(model):
+                continue
+            extras = seen[name].setdefault(type(model), {})
+            if isinstance(model, Ns3Model):
+                for key, value in model.extra_attributes.items():
+                    if isinstance(value, SCALARS):
+                        extras.setdefault(key, type(value))
+
+    for name in model_fields:
+        for model_cls, extras in seen[name].items():
+            multiple = len(seen[name]) > 1
+            for f in fields(model_cls):
+                scalar = _scalar_type(f.type)
+                if scalar is None or f.name == "name":
+                    continue
+                label = f"{name}.{f.name}"
+                if multiple:
+                    label = f"{name}[{model_cls.__name__}].{f.name}"
+                columns.append(Column(label, (name, f.name), scalar, owner=model_cls))
+            for key, value_type in extras.items():
+                columns.append(Column(f"{name}.{key}", (name, "extra_attributes", key), value_type, owner=model_cls))
+    return columns
+
+def _is_list(tp) -> bool:
+    if get_origin(tp) is Union:
+        return any(_is_list(t) for t in get_args(tp))
+    return get_origin(tp) in (list, List)
+
+# --- Édition en masse ---
+
+def bulk_assign(nodes: Sequence[Any], columns: Sequence[Column], assignments: Iterable[Assignment]) -> List[int]:
+    """
+    Applique toutes les affectations en une passe (regroupées par ligne).
+    Retourne les lignes effectivement modifiées.
+    """
+    by_row: Dict[int, List[Tuple[Column, Any]]] = {}
+    for row, col, value in assignments:
+        by_row.setdefault(row, []).append((columns[col], value))
+
+    changed = []
+    for row in sorted(by_row):
+        node = nodes[row]
+        modified = False
+        for column, value in by_row[row]:
+            modified |= column.set(node, value)
+        if modified:
+            changed.append(row)
+    return changed
+
+def fill_down(nodes: Sequence[Any], columns: Sequence[Column], cells: Iterable[Tuple[int, int]]) -> List[Assignment]:
+    """Affectations recopiant, colonne par colonne, la valeur de la cellule sélectionnée la plus haute."""
+    rows_by_col: Dict[int, List[int]] = {}
+    for row, col in cells:
+        rows_by_col.setdefault(col, []).append(row)
+    assignments = []
+    for col, rows in rows_by_col.items():
+        rows.sort()
+        value = columns[col].get(nodes[rows[0]])
+        assignments.extend((row, col, value) for row in rows[1:])
+    return assignments
+
+def parse_csv_block(text: str, columns: Sequence[Column], start_row: int, start_col: int,
+                    row_count: int) -> List[Assignment]:
+    """
+    Affectations pour un bloc CSV (virgule, point-virgule ou tabulation) collé
+    à partir de (start_row, start_col). Les cellules hors tableau sont ignorées.
+    """
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel_tab if "\t" in text else csv.excel
+    assignments = []
+    for r, values in enumerate(csv.reader(io.StringIO(text), dialect)):
+        row = start_row + r
+        if row >= row_count:
+            break
+        for c, raw in enumerate(values):
+            col = start_col + c
+            if col >= len(columns):
+                break
+            assignments.append((row, col, columns[col].coerce(raw)))
+    return assignments
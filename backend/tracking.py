@@ -0,0 +1,104 @@
+"""
+Suivi incrémental des nœuds des sections (drones, ZSPs, remotes, nodes).
+
+Base commune de l'index de recherche, de l'analyse de cohérence et du profil
+statistique : chaque nœud est identifié par `id()` et rattaché à sa section ;
+une modification ne retraite que le nœud concerné (`update_node`,
+`mark_dirty` + `refresh`, `sync_section`).
+
+Regroupe aussi l'introspection des dataclasses partagée par ces modules,
+le diff et la vue tabulaire (`SCALARS`, `field_names`).
+"""
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+SECTIONS = ("drones", "ZSPs", "remotes", "nodes")
+SCALARS = (str, int, float, bool)
+
+Changes = Dict[int, Any]   # id(nœud) -> résultat propre au suivi (anomalies...)
+
+@lru_cache(maxsize=None)
+def field_names(cls: type, skip: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+    """Noms des champs d'une dataclass hors `skip` (tuple vide pour un autre type)."""
+    if not is_dataclass(cls):
+        return ()
+    return tuple(f.name for f in fields(cls) if f.name not in skip)
+
+class NodeTracker:
+    """
+    Nœuds suivis {id: (section, nœud)}. Les sous-classes implémentent
+    `update_node(section, nœud)` et `remove_node(nœud)` en s'appuyant sur
+    `_track` / `_untrack` ; elles peuvent retourner des `Changes`, fusionnés
+    par `refresh` et `sync_section`.
+    Non thread-safe : un seul thread doit utiliser une instance à la fois.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[int, Tuple[str, Any]] = {}
+        self._sections: Dict[str, Set[int]] = {s: set() for s in SECTIONS}
+        self._dirty: Set[int] = set()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def section_of(self, node) -> Optional[str]:
+        entry = self._nodes.get(id(node))
+        return entry[0] if entry else None
+
+    # Comptabilité (appelée par les sous-classes)
+
+    def _track(self, section: str, node) -> bool:
+        """Enregistre le nœud dans `section`. Retourne True s'il n'était pas suivi."""
+        key = id(node)
+        previous = self._nodes.get(key)
+        if previous is not None:
+            self._sections[previous[0]].discard(key)
+        self._nodes[key] = (section, node)
+        self._sections[section].add(key)
+        self._dirty.discard(key)
+        return previous is None
+
+    def _untrack(self, node) -> Optional[str]:
+        """Oublie le nœud. Retourne sa section (None s'il n'était pas suivi)."""
+        key = id(node)
+        entry = self._nodes.pop(key, None)
+        if entry is None:
+            return None
+        self._sections[entry[0]].discard(key)
+        self._dirty.discard(key)
+        return entry[0]
+
+    # API
+
+    def update_node(self, section: str, node) -> Optional[Changes]:
+        raise NotImplementedError
+
+    def remove_node(self, node) -> Optional[Changes]:
+        raise NotImplementedError
+
+    def mark_dirty(self, node):
+        """Le nœud a pu être modifié : il sera retraité par `refresh`."""
+        if id(node) in self._nodes:
+            self._dirty.add(id(node))
+
+    def refresh(self) -> Changes:
+        changed: Changes = {}
+        for key in list(self._dirty):
+            entry = self._nodes.get(key)
+            if entry is not None:
+                changed.update(self.update_node(*entry) or {})
+        self._dirty.clear()
+        return changed
+
+    def sync_section(self, section: str, nodes: Iterable) -> Changes:
+        """Aligne le suivi sur le contenu d'une liste après ajout/suppression."""
+        current = {id(n): n for n in nodes}
+        changed: Changes = {}
+        for key in list(self._sections[section]):
+            if key not in current:
+                changed.update(self.remove_node(self._nodes[key][1]) or {})
+        for key, node in current.items():
+            if key not in self._nodes:
+                changed.update(self.update_node(section, node) or {})
+        return changed
@@ -0,0 +1,59 @@
+"""
+Compare le chargement JSON et le format binaire .iodb (backend/binary.py).
+
+Vérifie aussi que la conversion JSON -> binaire -> JSON est sans perte.
+
+    python benchmarks/bench_binary.py --drones 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import binary, codec, serializer  # noqa: E402
+from backend.models import Scenario  # noqa: E402
+from benchmarks.fixtures import make_scenario  # noqa: E402
+
+
+def _time(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drones", type=int, default=5000)
+    parser.add_argument("--waypoints", type=int, default=20)
+    args = parser.parse_args()
+
+    raw = make_scenario(args.drones, args.waypoints)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "scenario.json")
+        bin_path = os.path.join(tmp, "scenario" + binary.EXTENSION)
+        back_path = os.path.join(tmp, "roundtrip.json")
+
+        with open(json_path, "wb") as f:
+            f.write(codec.dumps(raw))
+
+        _, t_conv = _time(lambda: binary.json_to_binary(json_path, bin_path))
+        from_json, t_json = _time(lambda: serializer.load_scenario(json_path))
+        from_bin, t_bin = _time(lambda: binary.load_scenario_binary(bin_path))
+        binary.binary_to_json(bin_path, back_path)
+
+        with open(back_path, "rb") as f:
+            lossless = codec.loads(f.read()) == serializer.to_plain(serializer.dict_to_dataclass(Scenario, raw))
+
+        print(f"taille JSON         : {os.path.getsize(json_path) / 1e6:8.2f} Mo")
+        print(f"taille binaire      : {os.path.getsize(bin_path) / 1e6:8.2f} Mo")
+        print(f"conversion          : {t_conv * 1000:8.1f} ms")
+        print(f"chargement JSON     : {t_json * 1000:8.1f} ms")
+        print(f"chargement binaire  : {t_bin * 1000:8.1f} ms (x{t_json / t_bin:.1f})")
+        print(f"aller-retour        : {'sans perte' if lossless and from_json == from_bin else 'DIFFÉRENT'}")
+
+
+if __name__ == "__main__":
+    main()
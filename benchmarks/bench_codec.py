@@ -0,0 +1,56 @@
+"""
+Benchmark encode/décode JSON par backend (voir backend/codec.py).
+
+Vérifie aussi que chaque backend produit un JSON sémantiquement identique.
+
+    python benchmarks/bench_codec.py --drones 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import codec, serializer  # noqa: E402
+from backend.models import Scenario  # noqa: E402
+from benchmarks.fixtures import make_scenario  # noqa: E402
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drones", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scenario = serializer.dict_to_dataclass(Scenario, make_scenario(args.drones))
+    t_plain = _best(lambda: serializer.to_plain(scenario), args.repeat)
+    plain = serializer.to_plain(scenario)
+    print(f"to_plain            : {t_plain * 1000:8.1f} ms")
+
+    reference = None
+    for name in codec.BACKENDS:
+        for indent in (True, False):
+            data = codec.dumps(plain, indent=indent, backend=name)
+            t_enc = _best(lambda: codec.dumps(plain, indent=indent, backend=name), args.repeat)
+            t_dec = _best(lambda: codec.loads(data, backend=name), args.repeat)
+            decoded = codec.loads(data, backend=name)
+            if reference is None:
+                reference = decoded
+            status = "ok" if decoded == reference else "DIFFÉRENT"
+            mode = "indent " if indent else "compact"
+            print(f"{name:8s} {mode} : encode {t_enc * 1000:8.1f} ms | decode {t_dec * 1000:8.1f} ms "
+                  f"| {len(data) / 1e6:6.2f} Mo | {status}")
+
+
+if __name__ == "__main__":
+    main()
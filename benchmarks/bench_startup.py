@@ -0,0 +1,79 @@
+"""
+Mesure du démarrage à froid de l'éditeur.
+
+- Temps d'import du backend seul (sans Qt) et vérification qu'aucun module
+  PySide6 n'est chargé par `import backend.serializer`.
+- Temps d'import de l'UI et temps jusqu'à la première fenêtre, via
+  `main.py --startup-time` (plateforme Qt "offscreen").
+
+Chaque mesure est faite dans un processus neuf. Le script retourne un code
+non nul si la médiane dépasse la cible (--target, en secondes).
+
+    python benchmarks/bench_startup.py --runs 5 --target 1.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKEND_PROBE = (
+    "import sys, time; t0 = time.perf_counter(); import backend.serializer; "
+    "print(f'backend.import_s={time.perf_counter() - t0:.4f}'); "
+    "print('backend.qt_loaded=' + str(any(m.startswith('PySide6') for m in sys.modules)))"
+)
+
+
+def _run(args, env=None):
+    out = subprocess.run(
+        [sys.executable] + args, cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    metrics = {}
+    for line in out.splitlines():
+        if "=" in line:
+            key, value = line.split("=", 1)
+            metrics[key.strip()] = value.strip()
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=1.5, help="Cible (s) pour la première fenêtre")
+    parser.add_argument("--no-gui", action="store_true", help="Ne mesure que le backend")
+    args = parser.parse_args()
+
+    backend_times = []
+    for _ in range(args.runs):
+        m = _run(["-c", BACKEND_PROBE])
+        if m.get("backend.qt_loaded") != "False":
+            print("ÉCHEC : l'import du backend charge PySide6")
+            return 1
+        backend_times.append(float(m["backend.import_s"]))
+    print(f"backend import      : {statistics.median(backend_times) * 1000:8.1f} ms (médiane)")
+
+    if args.no_gui:
+        return 0
+
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    import_times, window_times = [], []
+    for _ in range(args.runs):
+        m = _run(["main.py", "--startup-time"], env=env)
+        import_times.append(float(m["startup.import_s"]))
+        window_times.append(float(m["startup.first_window_s"]))
+
+    first_window = statistics.median(window_times)
+    print(f"ui import           : {statistics.median(import_times) * 1000:8.1f} ms (médiane)")
+    print(f"première fenêtre    : {first_window * 1000:8.1f} ms (médiane, cible {args.target * 1000:.0f} ms)")
+
+    if first_window > args.target:
+        print("ÉCHEC : cible de démarrage dépassée")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Profil statistique d'un gros scénario (backend/stats.py) : parcours complet,
+agrégation, puis recalcul après modification d'un seul nœud.
+
+    python benchmarks/bench_stats.py --drones 50000
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend import codec, serializer, stats  # noqa: E402
+from backend.stats import ScenarioStats, format_profile  # noqa: E402
+from benchmarks.fixtures import make_scenario  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drones", type=int, default=50000)
+    parser.add_argument("--waypoints", type=int, default=20)
+    parser.add_argument("--lazy", action="store_true", help="nœuds non décodés (lecture du JSON brut)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scenario.json")
+        with open(path, "wb") as f:
+            f.write(codec.dumps(make_scenario(args.drones, args.waypoints), indent=False))
+        scenario = serializer.load_scenario(path, lazy=args.lazy)
+    # Le chargement laisse au GC une collecte complète en attente : payée ici, hors mesure
+    gc.collect()
+
+    table = ScenarioStats()
+    t0 = time.perf_counter()
+    table.build(scenario)
+    t1 = time.perf_counter()
+    profile = table.profile()
+    t2 = time.perf_counter()
+
+    drone = serializer.resolve(scenario.drones[0])
+    drone.applications[0].packet_size = 1024
+    table.mark_dirty(scenario.drones[0])
+    t3 = time.perf_counter()
+    table.profile()
+    t4 = time.perf_counter()
+
+    # Pire cas incrémental : le nœud qui porte le minimum en x rentre dans la boîte
+    xmin = table.columns["xmin"]
+    row = min(range(len(xmin)), key=xmin.__getitem__)
+    extreme = next(d for d in scenario.drones if table._rows[id(d)] == row)
+    for point in serializer.resolve(extreme).mobility_model.flight_plan:
+        point.position = [500.0, 500.0, 50.0]
+    table.mark_dirty(extreme)
+    t5 = time.perf_counter()
+    table.profile()
+    t6 = time.perf_counter()
+
+    print(format_profile(profile))
+    print(f"agrégation : {'NumPy' if stats.np is not None else 'Python'}")
+    print(f"parcours {(t1 - t0) * 1000:8.1f} ms | agrégation {(t2 - t1) * 1000:6.1f} ms | "
+          f"après modification d'un nœud {(t4 - t3) * 1000:6.2f} ms "
+          f"(bord de la boîte englobante {(t6 - t5) * 1000:6.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
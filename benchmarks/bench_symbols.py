@@ -0,0 +1,87 @@
+"""
+Mémoire et comparaisons avec / sans table de symboles (backend/symbols.py).
+
+Chaque mode est chargé dans un sous-processus pour mesurer un pic RSS propre
+(Linux : /proc/self/status).
+
+    python benchmarks/bench_symbols.py --drones 5000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend import codec, serializer  # noqa: E402
+from backend.models import Scenario  # noqa: E402
+from backend.symbols import SymbolTable, format_report, memory_report  # noqa: E402
+from benchmarks.fixtures import make_scenario  # noqa: E402
+
+_CHILD = """
+import gc, sys
+sys.path.insert(0, {root!r})
+from backend import serializer
+scenario = serializer.load_scenario({path!r}, intern={intern})
+gc.collect()
+status = dict(line.split(":", 1) for line in open("/proc/self/status"))
+print(int(status["VmHWM"].split()[0]), int(status["VmRSS"].split()[0]))
+"""
+
+
+def _rss_mb(path, intern):
+    """(pic, mémoire conservée après chargement) en Mo. VmHWM, contrairement à
+    ru_maxrss, n'hérite pas du pic du processus parent."""
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(root=ROOT, path=path, intern=intern)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    peak, current = out.split()
+    return int(peak) / 1024, int(current) / 1024
+
+
+def _compare_strings(a, b):
+    """Compare toutes les chaînes des extra_attributes et TypeId (comme diff / recherche)."""
+    t0 = time.perf_counter()
+    equal = 0
+    for da, db in zip(a.drones, b.drones):
+        for ma, mb in ((da.mobility_model, db.mobility_model), (da.mechanics, db.mechanics)):
+            equal += ma.name == mb.name
+            for (ka, va), (kb, vb) in zip(ma.extra_attributes.items(), mb.extra_attributes.items()):
+                equal += ka == kb and va == vb
+        for aa, ab in zip(da.applications, db.applications):
+            equal += aa.name == ab.name
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drones", type=int, default=5000)
+    parser.add_argument("--waypoints", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scenario.json")
+        with open(path, "wb") as f:
+            f.write(codec.dumps(make_scenario(args.drones, args.waypoints), indent=False))
+
+        for intern in (False, True):
+            label = "avec table " if intern else "sans table "
+            # Deux chargements (ex. comparaison de fichiers) ; avec une table commune,
+            # les chaînes égales sont le même objet et se comparent par identité
+            with open(path, "rb") as f:
+                raw = f.read()
+            symbols = SymbolTable() if intern else None
+            a = serializer.dict_to_dataclass(Scenario, codec.loads(raw), symbols)
+            b = serializer.dict_to_dataclass(Scenario, codec.loads(raw), symbols)
+            peak, current = _rss_mb(path, intern)
+            print(f"{label}: pic RSS {peak:8.1f} Mo | RSS après chargement {current:8.1f} Mo | "
+                  f"comparaisons {_compare_strings(a, b) * 1000:6.1f} ms")
+            print(f"             {format_report(memory_report(a))}")
+
+
+if __name__ == "__main__":
+    main()
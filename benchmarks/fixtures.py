@@ -0,0 +1,97 @@
+"""Génération de scénarios IoD-Sim synthétiques pour les benchmarks."""
+import random
+
+
+def _attr(name, value):
+    return {"name": name, "value": value}
+
+
+def make_drone(i, rng, waypoints=20):
+    flight_plan = [
+        {"position": [rng.uniform(0, 1000), rng.uniform(0, 1000), rng.uniform(10, 100)],
+         "interest": rng.randint(0, 5), "restTime": 1.0}
+        for _ in range(waypoints)
+    ]
+    return {
+        "name": f"drone{i}",
+        "netDevices": [{
+            "type": "wifi",
+            "networkLayer": 0,
+            "macLayer": {"name": "ns3::AdhocWifiMac", "attributes": [_attr("Ssid", "wifi-default")]},
+            "phy": {"TxPower": 20.0},
+        }],
+        "mobilityModel": {
+            "name": "ns3::ParametricSpeedDroneMobilityModel",
+            "attributes": [
+                _attr("SpeedCoefficients", [1.0, 0.0]),
+                _attr("FlightPlan", flight_plan),
+                _attr("CurveStep", 0.001),
+            ],
+        },
+        "applications": [{
+            "name": "ns3::DroneClientApplication",
+            "attributes": [
+                _attr("StartTime", 1.0), _attr("StopTime", 60.0),
+                _attr("DestinationIpv4Address", "10.1.0.1"),
+                _attr("TransmissionInterval", 0.5), _attr("PacketSize", 512),
+            ],
+        }],
+        "mechanics": {
+            "name": "ns3::Drone",
+            "attributes": [_attr("Mass", 0.75), _attr("RotorDiskArea", 0.18), _attr("DragCoefficient", 0.08)],
+        },
+        "battery": {
+            "name": "ns3::LiIonEnergySource",
+            "attributes": [
+                _attr("LiIonEnergySourceInitialEnergyJ", 200.0),
+                _attr("LiIonEnergyLowBatteryThreshold", 0.2),
+            ],
+        },
+        "peripherals": [{
+            "name": "ns3::InputPeripheral",
+            "attributes": [_attr("PowerConsumption", [0, 1.0, 2.5]), _attr("DataRate", 1e6)],
+        }],
+    }
+
+
+def make_scenario(n_drones=1000, waypoints=20, seed=0):
+    """Retourne un scénario au format JSON IoD-Sim (structures Python simples)."""
+    rng = random.Random(seed)
+    return {
+        "name": "bench",
+        "resultsPath": "../results/",
+        "duration": 60.0,
+        "logOnFile": True,
+        "dryRun": False,
+        "staticNs3Config": [{"name": "ns3::WifiRemoteStationManager::FragmentationThreshold", "value": "2200"}],
+        "phyLayer": [{"type": "wifi", "standard": "802.11n-2.4GHz", "attributes": [], "channel": {
+            "propagationDelayModel": {"name": "ns3::ConstantSpeedPropagationDelayModel", "attributes": []},
+            "propagationLossModel": {"name": "ns3::FriisPropagationLossModel", "attributes": []},
+        }}],
+        "macLayer": [{"type": "wifi", "ssid": "wifi-default", "remoteStationManager": {
+            "name": "ns3::ConstantRateWifiManager",
+            "attributes": [_attr("DataMode", "HtMcs7"), _attr("ControlMode", "HtMcs0")],
+        }}],
+        "networkLayer": [{"type": "ipv4", "address": "10.1.0.0", "mask": "255.255.255.0", "gateway": "10.1.0.1"}],
+        "world": {
+            "size": {"X": "1000", "Y": "1000", "Z": "100"},
+            "buildings": [
+                {"type": "commercial", "walls": "concreteWithWindows",
+                 "boundaries": [i * 10.0, i * 10.0 + 5, 0.0, 5.0, 0.0, 20.0], "floors": 2, "rooms": [1, 1]}
+                for i in range(50)
+            ],
+            "regionsOfInterest": [[0.0, 500.0, 0.0, 500.0, 0.0, 100.0]],
+        },
+        "drones": [make_drone(i, rng, waypoints) for i in range(n_drones)],
+        "ZSPs": [{
+            "name": "zsp0",
+            "netDevices": [{"type": "wifi", "networkLayer": 0}],
+            "mobilityModel": {"name": "ns3::ConstantPositionMobilityModel",
+                              "attributes": [_attr("Position", [500.0, 500.0, 0.0])]},
+            "applications": [],
+        }],
+        "remotes": [],
+        "nodes": [],
+        "logComponents": ["Scenario"],
+        "analytics": [],
+    }
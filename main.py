@@ -1,13 +1,42 @@
 import sys
+import time
+
+_T0 = time.perf_counter()
+
 from PySide6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+
+
+def report_startup(window):
+    """Affiche le temps d'import et le temps jusqu'à la première fenêtre (--startup-time)."""
+    from PySide6.QtCore import QTimer
+
+    def _report():
+        elapsed = time.perf_counter() - _T0
+        print(f"startup.import_s={window.startup_import_s:.4f}")
+        print(f"startup.first_window_s={elapsed:.4f}")
+        QApplication.instance().quit()
+
+    # Le timer se déclenche une fois la boucle d'événements démarrée (fenêtre affichée)
+    QTimer.singleShot(0, _report)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    
+
     app.setStyle("Fusion")
-    
+
+    from ui.main_window import MainWindow
+    import_s = time.perf_counter() - _T0
+
     window = MainWindow()
+    window.startup_import_s = import_s
     window.show()
-    
-    sys.exit(app.exec())
\ No newline at end of file
+
+    if "--startup-time" in sys.argv:
+        report_startup(window)
+    else:
+        # Journal laissé par une session interrompue : proposé une fois la fenêtre affichée
+        from PySide6.QtCore import QTimer
+        QTimer.singleShot(0, window.offer_recovery)
+
+    sys.exit(app.exec())
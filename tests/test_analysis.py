@@ -0,0 +1,107 @@
+import copy
+
+import pytest
+
+from backend import codec, serializer
+from backend.analysis import ConsistencyAnalyzer
+from backend.index import SECTIONS
+from backend.stats import ScenarioStats
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def scenario():
+    return serializer._decode_scenario(make_scenario(5, 3))
+
+def _codes(analyzer, scenario):
+    """{nom du nœud: codes des anomalies}, indépendant de l'identité des nœuds."""
+    out = {}
+    for section in SECTIONS:
+        for node in getattr(scenario, section):
+            issues = analyzer.issues_for(node)
+            if issues:
+                out[node.name] = sorted(i.code for i in issues)
+    return out
+
+def _full(scenario):
+    analyzer = ConsistencyAnalyzer()
+    analyzer.build(scenario)
+    return analyzer
+
+def test_clean_scenario(scenario):
+    analyzer = _full(scenario)
+    assert analyzer.layer_issues == [] and analyzer.flagged() == {}
+
+def test_lazy_nodes_analysed_from_raw(tmp_path, scenario):
+    scenario.drones[2].net_devices[0].network_layer = 4
+    path = str(tmp_path / "scenario.json")
+    serializer.save_scenario(scenario, path)
+    lazy = serializer.load_scenario(path, lazy=True)
+    assert _codes(_full(lazy), lazy) == {"drone2": ["layer-dangling"]}
+    assert not lazy.drones[2].is_loaded
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_malformed_layer_is_reported(tmp_path, lazy):
+    data = make_scenario(3, 2)
+    data["drones"][0]["netDevices"][0]["networkLayer"] = "0"
+    data["drones"][1]["networkLayer"] = [0]
+    path = tmp_path / "scenario.json"
+    path.write_bytes(codec.dumps(data))
+    scenario = serializer.load_scenario(str(path), lazy=lazy)
+    analyzer = _full(scenario)
+    assert _codes(analyzer, scenario) == {"drone0": ["layer-invalid"], "drone1": ["layer-invalid"]}
+    assert [i.path for i in analyzer.issues_for(scenario.drones[0])] == [("net_devices", 0, "network_layer")]
+    assert [i.path for i in analyzer.issues_for(scenario.drones[1])] == [("network_layer",)]
+
+def test_incremental_matches_full(scenario):
+    analyzer = _full(scenario)
+
+    drone = scenario.drones[1]
+    drone.net_devices[0].network_layer = 3
+    changed = analyzer.update_node("drones", drone)
+    assert [i.code for i in changed[id(drone)]] == ["layer-dangling"]
+
+    # Nouveau sous-réseau : les applications visant 10.1.0.1 en sortent
+    scenario.networkLayer[0].address = "10.2.0.0"
+    scenario.networkLayer[0].gateway = None
+    changed = analyzer.update_layers(scenario)
+    assert len(changed) == 5
+
+    added = copy.deepcopy(scenario.ZSPs[0])
+    added.name = "zsp1"
+    added.net_devices[0].network_layer = 9
+    scenario.ZSPs.append(added)
+    del scenario.drones[0]
+    changed = analyzer.sync_section("ZSPs", scenario.ZSPs)
+    changed.update(analyzer.sync_section("drones", scenario.drones))
+    assert [i.code for i in changed[id(added)]] == ["layer-dangling"]
+
+    assert _codes(analyzer, scenario) == _codes(_full(scenario), scenario)
+    assert analyzer.flagged().keys() == _full(scenario).flagged().keys()
+
+    drone.net_devices[0].network_layer = 0
+    analyzer.update_node("drones", drone)
+    assert _codes(analyzer, scenario)["drone1"] == ["address-subnet"]
+
+def test_stats_incremental_matches_full(scenario):
+    stats = ScenarioStats()
+    stats.build(scenario)
+    before = stats.profile()
+    assert before.nodes == 6 and before.waypoints == 15
+
+    drone = scenario.drones[0]
+    drone.mobility_model.flight_plan.pop()
+    stats.update_node("drones", drone)
+    del scenario.drones[4]
+    stats.sync_section("drones", scenario.drones)
+    scenario.world.buildings = scenario.world.buildings[:10]
+    stats.update_world(scenario)
+
+    incremental, full = stats.profile(), ScenarioStats()
+    full.build(scenario)
+    full = full.profile()
+    assert (incremental.nodes, incremental.waypoints, incremental.counts) == (full.nodes, full.waypoints, full.counts)
+    assert incremental.bbox == pytest.approx(full.bbox)
+    assert incremental.traffic == pytest.approx(full.traffic)
+    assert incremental.power == pytest.approx(full.power)
+    assert incremental.regions == full.regions and incremental.regions != before.regions
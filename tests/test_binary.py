@@ -0,0 +1,54 @@
+import dataclasses
+import struct
+
+import pytest
+
+from backend import binary, codec, models, serializer
+from backend.models import Scenario
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def scenario():
+    return serializer.dict_to_dataclass(Scenario, make_scenario(5, 4))
+
+def test_round_trip_is_lossless(scenario):
+    restored = binary.loads_binary(binary.dumps_binary(scenario))
+    assert serializer.to_plain(restored) == serializer.to_plain(scenario)
+
+def test_load_and_save_dispatch_on_extension(tmp_path, scenario):
+    path = str(tmp_path / f"s{binary.EXTENSION}")
+    serializer.save_scenario(scenario, path)
+    with open(path, "rb") as f:
+        assert f.read(8) == binary.MAGIC
+    assert serializer.to_plain(serializer.load_scenario(path)) == serializer.to_plain(scenario)
+
+def test_lazy_nodes_are_saved_as_dataclasses(tmp_path):
+    path = tmp_path / "s.json"
+    path.write_bytes(codec.dumps(make_scenario(3, 2)))
+    lazy = serializer.load_scenario(str(path), lazy=True)
+    restored = binary.loads_binary(binary.dumps_binary(lazy))
+    assert serializer.to_plain(restored) == serializer.to_plain(serializer.load_scenario(str(path)))
+
+def test_other_version_is_rejected(scenario):
+    data = bytearray(binary.dumps_binary(scenario))
+    struct.pack_into("<Q", data, 8, 1)
+    with pytest.raises(ValueError, match="Version de format"):
+        binary.loads_binary(bytes(data))
+
+def test_other_model_schema_is_rejected(scenario, monkeypatch):
+    data = binary.dumps_binary(scenario)
+    monkeypatch.setattr(binary, "SCHEMA", b"\0" * 16)
+    with pytest.raises(ValueError, match="autre version du modèle"):
+        binary.loads_binary(data)
+
+def test_schema_digest_tracks_field_names(monkeypatch):
+    before = binary.schema_digest()
+    renamed = dataclasses.make_dataclass("Building", [("kind", str)])
+    renamed.__module__ = models.__name__
+    monkeypatch.setattr(models, "Building", renamed)
+    assert binary.schema_digest() != before
+
+def test_not_a_binary_file():
+    with pytest.raises(ValueError, match="pas un scénario binaire"):
+        binary.loads_binary(b"{" * 100)
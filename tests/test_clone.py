@@ -0,0 +1,63 @@
+import copy
+
+import pytest
+
+from backend import serializer
+from backend.clone import clone_node, fast_copy
+from backend.models import ApplicationConfig, NodeConfig
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def drone():
+    return serializer._decode_scenario(make_scenario(1, 3)).drones[0]
+
+def test_fast_copy_is_deep(drone):
+    clone = fast_copy(drone)
+    assert clone == drone
+    assert clone.mobility_model is not drone.mobility_model
+    assert clone.mobility_model.flight_plan[0] is not drone.mobility_model.flight_plan[0]
+    assert clone.mobility_model.flight_plan[0].position is not drone.mobility_model.flight_plan[0].position
+    assert clone.peripherals[0] is not drone.peripherals[0]
+    assert type(clone.peripherals[0]) is type(drone.peripherals[0])
+
+def test_clone_naming(drone):
+    assert [c.name for c in clone_node(drone, 3)] == ["drone0_1", "drone0_2", "drone0_3"]
+    assert [c.name for c in clone_node(drone, 2, name_pattern="uav-{i:03d}", start=7)] == ["uav-007", "uav-008"]
+    assert [c.name for c in clone_node(drone, 2, name_pattern="{name}#{k}")] == ["drone0#0", "drone0#1"]
+    # Modèle sans nom : nom du type
+    assert clone_node(NodeConfig(), 1)[0].name == "NodeConfig_1"
+
+def test_clones_are_independent(drone):
+    before = copy.deepcopy(drone)
+    a, b = clone_node(drone, 2)
+    a.battery.li_ion_energy_source_initial_energy_j = 1.0
+    a.net_devices[0].phy.tx_power = 1.0
+    assert b.battery.li_ion_energy_source_initial_energy_j == 200.0
+    assert drone == before
+
+def test_position_offset(drone):
+    origin = drone.mobility_model.flight_plan[0].position
+    clones = clone_node(drone, 2, position_offset=(10.0, 0.0, -1.0))
+    for k, clone in enumerate(clones, 1):
+        assert clone.mobility_model.flight_plan[0].position == [origin[0] + 10.0 * k, origin[1], origin[2] - k]
+    assert drone.mobility_model.flight_plan[0].position == origin
+
+def test_ip_step_increments_application_addresses(drone):
+    drone.applications.append(ApplicationConfig(name="ns3::UdpEchoClientApplication", remote_address="10.1.0.250"))
+    clones = clone_node(drone, 3, ip_step=4)
+    assert [c.applications[0].destination_ipv4_address for c in clones] == ["10.1.0.5", "10.1.0.9", "10.1.0.13"]
+    assert [c.applications[1].remote_address for c in clones] == ["10.1.0.254", "10.1.1.2", "10.1.1.6"]
+    assert drone.applications[0].destination_ipv4_address == "10.1.0.1"
+
+def test_ip_step_leaves_node_addressing_alone(drone):
+    drone.applications[0].remote_address = "not-an-ip"
+    clone = clone_node(drone, 1, ip_step=1)[0]
+    # Pas d'adresse propre au nœud : seul le réseau attribué (couche réseau) la détermine
+    assert [d.network_layer for d in clone.net_devices] == [d.network_layer for d in drone.net_devices]
+    assert clone.network_layer == drone.network_layer
+    assert clone.applications[0].remote_address == "not-an-ip"
+    assert clone.applications[0].destination_ipv4_address == "10.1.0.2"
+
+def test_ip_step_zero_keeps_addresses(drone):
+    assert clone_node(drone, 1)[0].applications == drone.applications
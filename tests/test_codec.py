@@ -0,0 +1,64 @@
+import math
+import random
+
+import pytest
+
+from backend import codec
+from benchmarks.fixtures import make_scenario
+
+BACKENDS = list(codec.BACKENDS)
+needs_orjson = pytest.mark.skipif("orjson" not in codec.BACKENDS, reason="orjson non installé")
+
+SAMPLE = {
+    "name": "scénario",
+    "empty": [], "nested": {"a": [1, 2.5, {"b": None}], "c": {}},
+    "flags": [True, False], "text": "ligne\nsuivante",
+}
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("indent", [True, False])
+def test_round_trip(name, indent):
+    data = make_scenario(5, 3)
+    assert codec.loads(codec.dumps(data, indent=indent, backend=name), backend=name) == data
+
+def test_stdlib_indents_by_four():
+    assert codec.dumps({"a": [1]}, backend="json") == b'{\n    "a": [\n        1\n    ]\n}'
+
+@needs_orjson
+@pytest.mark.parametrize("indent", [True, False])
+def test_backends_write_identical_bytes(indent):
+    for data in (SAMPLE, make_scenario(5, 3)):
+        assert codec.dumps(data, indent=indent, backend="orjson") == codec.dumps(data, indent=indent, backend="json")
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("value", [math.nan, math.inf, -math.inf])
+def test_non_finite_rejected_on_write(name, value):
+    with pytest.raises(ValueError, match="drones/0/x"):
+        codec.dumps({"drones": [{"x": value}], "other": None}, backend=name)
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_non_finite_rejected_on_read(name):
+    with pytest.raises(ValueError):
+        codec.loads(b'{"x": NaN}', backend=name)
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_null_is_kept(name):
+    assert codec.loads(codec.dumps({"x": None}, backend=name), backend=name) == {"x": None}
+
+FLOATS = [1e-7, -2.5e-05, 1e-05, 0.0001, 9.247494342746089e-05, 1e16, 1.5e300, 5e-324, -0.0, 0.1, 123456.789]
+
+@needs_orjson
+@pytest.mark.parametrize("indent", [True, False])
+def test_float_formatting_parity(indent):
+    rng = random.Random(0)
+    values = FLOATS + [10 ** rng.uniform(-30, 30) * rng.choice((-1, 1)) for _ in range(2000)]
+    # Une chaîne qui ressemble à un nombre n'est pas réécrite
+    data = {"values": values, "labels": ["1e-7", "x 0.00001 y", 'a"1e5'], "1e-7": 1e-7}
+    out = codec.dumps(data, indent=indent, backend="orjson")
+    assert out == codec.dumps(data, indent=indent, backend="json")
+    assert codec.loads(out) == data
+
+@needs_orjson
+@pytest.mark.parametrize("data", [{"big": 2 ** 70}, {1: "int key"}, {"nested": [{2.5: -(2 ** 64)}]}])
+def test_orjson_falls_back_to_stdlib(data):
+    assert codec.dumps(data, backend="orjson") == codec.dumps(data, backend="json")
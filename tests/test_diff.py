@@ -0,0 +1,166 @@
+import copy
+
+import pytest
+
+from backend import diff as diff_mod
+from backend.diff import SubtreeHasher, diff, merge3
+from backend.models import Scenario
+from backend.serializer import dict_to_dataclass, to_plain
+from benchmarks.fixtures import make_scenario
+
+
+def load(data):
+    return dict_to_dataclass(Scenario, data)
+
+@pytest.fixture
+def base():
+    return load(make_scenario(4, 3))
+
+def fork(scenario):
+    return copy.deepcopy(scenario)
+
+# --- Empreintes ---
+
+def test_equal_content_gives_equal_digest(base):
+    hasher = SubtreeHasher()
+    assert hasher.digest(base) == hasher.digest(fork(base))
+
+def test_dict_digest_ignores_key_order():
+    hasher = SubtreeHasher()
+    assert hasher.digest({"a": 1, "b": [2]}) == hasher.digest({"b": [2], "a": 1})
+    assert hasher.digest({"a": 1}) != hasher.digest({"a": "1"})
+
+def test_digest_changes_with_nested_value(base):
+    other = fork(base)
+    other.drones[2].mobility_model.flight_plan[1].position[2] += 1.0
+    hasher = SubtreeHasher()
+    assert hasher.digest(base) != hasher.digest(other)
+    assert hasher.digest(base.drones[0]) == hasher.digest(other.drones[0])
+
+def test_each_subtree_hashed_once(base, monkeypatch):
+    other = fork(base)
+    other.drones[1].mobility_model.curve_step = 0.5
+    calls = []
+    original = diff_mod.hashlib.blake2b
+    monkeypatch.setattr(diff_mod.hashlib, "blake2b", lambda *a, **k: calls.append(1) or original(*a, **k))
+    hasher = SubtreeHasher()
+    diff(base, other, hasher)
+    digested = len(calls)
+    calls.clear()
+    diff(base, other, hasher)   # tout est en cache : aucun nouveau hachage de conteneur
+    assert len(calls) < digested / 10
+
+# --- Diff ---
+
+def test_no_changes(base):
+    assert diff(base, fork(base)) == []
+
+def test_modified_field(base):
+    other = fork(base)
+    other.drones[1].mobility_model.curve_step = 0.5
+    changes = diff(base, other)
+    assert [(c.path, c.kind, c.new) for c in changes] == [
+        (("drones", 1, "mobility_model", "curve_step"), "modified", 0.5),
+    ]
+
+def test_named_lists_aligned_and_path_convention(base):
+    other = fork(base)
+    removed = other.drones.pop(0)
+    other.drones[0].mobility_model.curve_step = 0.5     # drone1 : index 1 avant, 0 après
+    added = fork(removed)
+    added.name = "new"
+    other.drones.append(added)
+    changes = {(c.kind, c.path[:2]) for c in diff(base, other)}
+    # "removed" : index dans l'ancien ; "modified" / "added" : index dans le nouveau
+    assert changes == {("removed", ("drones", 0)), ("modified", ("drones", 0)), ("added", ("drones", 3))}
+
+def test_dict_keys(base):
+    other = fork(base)
+    attrs = other.drones[0].mobility_model.extra_attributes
+    attrs["Extra"] = 1
+    kinds = {(c.kind, c.path[-1]) for c in diff(base, other)}
+    assert kinds == {("added", "Extra")}
+
+# --- Fusion à trois ---
+
+def test_disjoint_edits_are_both_kept(base):
+    ours, theirs = fork(base), fork(base)
+    ours.duration = 120.0
+    theirs.drones[2].mobility_model.curve_step = 0.5
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == []
+    assert merged.duration == 120.0
+    assert merged.drones[2].mobility_model.curve_step == 0.5
+
+def test_same_edit_on_both_sides_is_not_a_conflict(base):
+    ours, theirs = fork(base), fork(base)
+    ours.duration = theirs.duration = 99.0
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == [] and merged.duration == 99.0
+
+def test_concurrent_edit_is_a_conflict_keeping_ours(base):
+    ours, theirs = fork(base), fork(base)
+    ours.drones[0].mobility_model.curve_step = 0.1
+    theirs.drones[0].mobility_model.curve_step = 0.2
+    merged, conflicts = merge3(base, ours, theirs)
+    assert [(c.path, c.base, c.ours, c.theirs) for c in conflicts] == [
+        (("drones", 0, "mobility_model", "curve_step"), 0.001, 0.1, 0.2),
+    ]
+    assert merged.drones[0].mobility_model.curve_step == 0.1
+
+def test_node_added_on_one_side_and_edited_on_other(base):
+    ours, theirs = fork(base), fork(base)
+    ours.drones[0].mobility_model.curve_step = 0.1
+    extra = fork(base.drones[0])
+    extra.name = "extra"
+    theirs.drones.append(extra)
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == []
+    assert [d.name for d in merged.drones] == ["drone0", "drone1", "drone2", "drone3", "extra"]
+    assert merged.drones[0].mobility_model.curve_step == 0.1
+
+def test_delete_untouched_node(base):
+    ours, theirs = fork(base), fork(base)
+    del theirs.drones[1]
+    ours.duration = 10.0
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == []
+    assert [d.name for d in merged.drones] == ["drone0", "drone2", "drone3"]
+    assert merged.duration == 10.0
+
+def test_delete_versus_edit_is_a_conflict(base):
+    ours, theirs = fork(base), fork(base)
+    ours.drones[1].mobility_model.curve_step = 0.1
+    del theirs.drones[1]
+    merged, conflicts = merge3(base, ours, theirs)
+    assert len(conflicts) == 1 and conflicts[0].theirs is None
+    assert "drone1" in [d.name for d in merged.drones]
+
+def test_both_sides_add_different_nodes(base):
+    ours, theirs = fork(base), fork(base)
+    a, b = fork(base.drones[0]), fork(base.drones[0])
+    a.name, b.name = "a", "b"
+    ours.drones.append(a)
+    theirs.drones.append(b)
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == []
+    assert [d.name for d in merged.drones][-2:] == ["a", "b"]
+
+def test_dict_entries_merged_by_key(base):
+    ours, theirs = fork(base), fork(base)
+    ours.drones[0].mobility_model.extra_attributes["A"] = 1
+    theirs.drones[0].mobility_model.extra_attributes["B"] = 2
+    merged, conflicts = merge3(base, ours, theirs)
+    assert conflicts == []
+    attrs = merged.drones[0].mobility_model.extra_attributes
+    assert attrs["A"] == 1 and attrs["B"] == 2
+
+def test_merge_does_not_modify_inputs_and_shares_unchanged(base):
+    ours, theirs = fork(base), fork(base)
+    ours.drones[0].mobility_model.curve_step = 0.1
+    theirs.drones[3].mobility_model.curve_step = 0.2
+    snapshot = [to_plain(s) for s in (base, ours, theirs)]
+    merged, _ = merge3(base, ours, theirs)
+    assert [to_plain(s) for s in (base, ours, theirs)] == snapshot
+    assert merged.drones[1] is ours.drones[1]
+    assert to_plain(merged) != to_plain(ours)
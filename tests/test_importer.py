@@ -0,0 +1,38 @@
+import pytest
+
+from backend import importer, serializer
+from benchmarks.fixtures import make_scenario
+
+
+def _scenario():
+    scenario = serializer._decode_scenario(make_scenario(0, 0))
+    assert scenario.drones == []
+    return scenario
+
+def _write(tmp_path, lines):
+    p = tmp_path / "routes.csv"
+    p.write_text("drone,x,y,z\n" + "\n".join(lines) + "\n")
+    return str(p)
+
+def test_import_sorted(tmp_path):
+    path = _write(tmp_path, ["d1,0,0,10", "d1,5,0,10", "d2,1,1,1"])
+    scenario = _scenario()
+    assert importer.import_into(scenario, path) == 2
+    d1, d2 = scenario.drones
+    assert [p.position for p in d1.mobility_model.flight_plan] == [[0.0, 0.0, 10.0], [5.0, 0.0, 10.0]]
+    assert d2.mobility_model.position == [1.0, 1.0, 1.0]
+
+def test_parse_error_leaves_scenario_unchanged(tmp_path):
+    path = _write(tmp_path, ["d1,0,0,10", "d1,5,0,10", "d2,1,1,1", "d3,oops,0,0"])
+    scenario = _scenario()
+    with pytest.raises(ValueError):
+        importer.import_into(scenario, path)
+    assert scenario.drones == []
+
+def test_unsorted_input(tmp_path):
+    path = _write(tmp_path, ["d1,0,0,0", "d2,1,1,1", "d1,5,0,0"])
+    with pytest.raises(importer.UnsortedInputError):
+        importer.read_drones(path)
+    drones = importer.read_drones(path, sorted_input=None)
+    assert [d.name for d in drones] == ["d1", "d2"]
+    assert len(drones[0].mobility_model.flight_plan) == 2
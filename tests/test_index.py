@@ -0,0 +1,60 @@
+import pytest
+
+from backend import serializer
+from backend.index import ScenarioIndex, parse_query
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def scenario():
+    return serializer._decode_scenario(make_scenario(4, 2))
+
+@pytest.fixture
+def index(scenario):
+    return ScenarioIndex(scenario)
+
+def _names(nodes):
+    return [n.name for n in nodes]
+
+def test_queries(index):
+    assert len(index) == 5
+    assert _names(index.search("drone2")) == ["drone2"]
+    assert _names(index.search("section:ZSPs")) == ["zsp0"]
+    assert len(index.search("type:ParametricSpeed curve_step<0.01")) == 4
+    assert _names(index.search("CurveStep? layer:0 drone3")) == ["drone3"]
+
+def test_parse_query():
+    assert parse_query("type:Foo x>=2 y? bar") == {
+        "type_name": "Foo", "where": [("x", ">=", 2), ("y", "exists", None)], "name_contains": "bar",
+    }
+
+def test_edit_is_stale_until_marked_dirty(index, scenario):
+    drone = scenario.drones[1]
+    drone.mobility_model.curve_step = 0.5
+    drone.name = "renamed"
+    # L'index n'interroge pas le graphe d'objets : la modification n'est pas vue
+    assert _names(index.search("curve_step>0.1")) == []
+    assert index.search("name:renamed") == []
+
+    index.mark_dirty(drone)
+    assert _names(index.search("curve_step>0.1")) == ["renamed"]
+    assert _names(index.search("name:drone1")) == []
+    # Le rang d'insertion est conservé
+    assert _names(index.search("section:drones")) == ["drone0", "renamed", "drone2", "drone3"]
+
+def test_remove_and_sync(index, scenario):
+    removed = scenario.drones.pop(0)
+    assert _names(index.search("drone0")) == ["drone0"]   # pas encore synchronisé
+    index.remove_node(removed)
+    assert index.search("drone0") == [] and index.section_of(removed) is None
+    index.mark_dirty(removed)   # nœud retiré : ignoré
+    assert len(index.search("section:drones")) == 3
+
+    added = serializer._decode_scenario(make_scenario(1, 1)).drones[0]
+    added.name = "added"
+    scenario.drones.append(added)
+    index.sync_section("drones", scenario.drones)
+    assert index.section_of(added) == "drones"
+    assert _names(index.search("section:drones"))[-1] == "added"
+    # Chaque terme du nœud retiré a disparu des tables
+    assert all(id(removed) not in ids for ids in index._names.values())
@@ -0,0 +1,110 @@
+import copy
+
+import pytest
+
+from backend import journal, serializer
+from backend.clone import clone_node
+from backend.serializer import to_plain
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def base():
+    return make_scenario(4, 2)
+
+def _load(plain):
+    return serializer._decode_scenario(copy.deepcopy(plain))
+
+def _edit(scenario, log):
+    """Modifie `scenario` et enregistre chaque opération dans `log(record)`."""
+    drones = scenario.drones
+    for step in (0.1, 0.2, 0.3):
+        drones[1].mobility_model.curve_step = step
+        log(journal.set_record(("drones", 1, "mobility_model"), "curve_step", step))
+    scenario.duration = 120.0
+    log(journal.set_record((), "duration", 120.0))
+
+    new = clone_node(drones[0], 1)[0]
+    drones.insert(0, new)
+    log(journal.insert_record(("drones",), 0, new))
+    # Même (chemin, champ) qu'avant l'insertion, mais un autre drone : à conserver
+    drones[1].mobility_model.curve_step = 0.5
+    log(journal.set_record(("drones", 1, "mobility_model"), "curve_step", 0.5))
+
+    del drones[3]
+    log(journal.delete_record(("drones",), 3))
+    drones[0].mobility_model.speed_coefficients[1] = 2.0
+    log(journal.set_record(("drones", 0, "mobility_model", "speed_coefficients"), 1, 2.0))
+    scenario.world.buildings[0].floors = 7
+    log(journal.set_record(("world", "buildings", 0), "floors", 7))
+
+def test_replay_round_trip(base):
+    edited, records = _load(base), []
+    _edit(edited, records.append)
+
+    restored = _load(base)
+    assert journal.replay(restored, records) == (len(records), 0)
+    assert to_plain(restored) == to_plain(edited)
+
+def test_compact_keeps_last_write_per_segment(base):
+    records = []
+    _edit(_load(base), records.append)
+    compacted = journal.compact(list(records))
+
+    curve_steps = [r["v"] for r in compacted if r.get("f") == "curve_step"]
+    assert curve_steps == [0.3, 0.5]
+    assert len(compacted) == len(records) - 2
+
+    a, b = _load(base), _load(base)
+    journal.replay(a, records)
+    journal.replay(b, compacted)
+    assert to_plain(a) == to_plain(b)
+
+def test_compact_drops_records_before_snapshot(base):
+    scenario = _load(base)
+    records = [journal.set_record((), "duration", 1.0), journal.snapshot_record(scenario),
+               journal.set_record((), "duration", 2.0)]
+    compacted = journal.compact(records)
+    assert compacted == records[1:]
+
+    restored = _load(base)
+    restored.drones.clear()
+    journal.replay(restored, compacted)
+    assert restored.duration == 2.0 and len(restored.drones) == 4
+
+def test_replay_counts_failures(base):
+    scenario = _load(base)
+    records = [journal.delete_record(("drones",), 99), journal.set_record((), "duration", 5.0)]
+    assert journal.replay(scenario, records) == (1, 1)
+    assert scenario.duration == 5.0
+
+def test_journal_file_recovery(base, tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_EVERY", 4)
+    source = tmp_path / "scenario.json"
+    source.write_text("{}")
+    log = journal.Journal(str(source), "digest", directory=str(tmp_path))
+    edited = _load(base)
+    _edit(edited, log.record)
+    log.flush()
+    # Arrêt brutal : dernière ligne tronquée
+    with open(log.path, 'ab') as f:
+        f.write(b'{"p": ["drones"], "d"')
+
+    [(path, header, records)] = journal.pending_recoveries(str(tmp_path))
+    assert path == log.path and header == {"source": str(source), "digest": "digest"}
+    restored = _load(base)
+    assert journal.replay(restored, records)[1] == 0
+    assert to_plain(restored) == to_plain(edited)
+
+    log.close(discard=True)
+    assert journal.pending_recoveries(str(tmp_path)) == []
+
+def test_reset_and_close(tmp_path):
+    source = str(tmp_path / "scenario.json")
+    log = journal.Journal(source, "v1", directory=str(tmp_path))
+    log.record_set((), "duration", 3.0)
+    log.reset("v2")
+    log.flush()
+    assert journal.read_journal(log.path) == ({"source": source, "digest": "v2"}, [])
+    log.close()
+    assert journal.pending_recoveries(str(tmp_path)) == []
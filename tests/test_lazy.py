@@ -0,0 +1,73 @@
+import copy
+import functools
+import json
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from backend import codec, serializer, sweep
+from backend.serializer import LazyNode, resolve, to_plain
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def path(tmp_path):
+    p = tmp_path / "scenario.json"
+    p.write_bytes(codec.dumps(make_scenario(3, 2)))
+    return str(p)
+
+@pytest.fixture
+def lazy(path):
+    return serializer.load_scenario(path, lazy=True)
+
+def test_name_without_decoding(lazy):
+    node = lazy.drones[1]
+    assert isinstance(node, LazyNode)
+    assert node.name == "drone1" and not node.is_loaded
+
+def test_materialize_releases_raw(lazy):
+    node = lazy.drones[0]
+    assert node.mobility_model.curve_step == 0.001
+    assert node.is_loaded and node.raw is None and node.peek() == (None, node._obj)
+    assert node.name == "drone0"
+
+def test_untouched_nodes_written_verbatim(lazy, path):
+    with open(path, "rb") as f:
+        original = json.loads(f.read())
+    assert to_plain(lazy)["drones"] == original["drones"]
+
+@pytest.mark.parametrize("loaded", [False, True])
+def test_pickle_round_trip(lazy, loaded):
+    node = lazy.drones[0]
+    if loaded:
+        resolve(node).mobility_model.curve_step = 0.5
+    restored = pickle.loads(pickle.dumps(node))
+    assert isinstance(restored, LazyNode) and restored.is_loaded == loaded
+    assert to_plain(restored) == to_plain(node)
+
+@pytest.mark.parametrize("loaded", [False, True])
+def test_copy_and_deepcopy(lazy, loaded):
+    node = lazy.drones[0]
+    if loaded:
+        resolve(node)
+    shallow, deep = copy.copy(node), copy.deepcopy(node)
+    assert to_plain(shallow) == to_plain(deep) == to_plain(node)
+    deep.mobility_model.curve_step = 0.5
+    assert node.mobility_model.curve_step == 0.001
+
+def test_pickle_whole_lazy_scenario(lazy):
+    restored = pickle.loads(pickle.dumps(lazy))
+    assert to_plain(restored) == to_plain(lazy)
+
+def test_sweep_with_spawn_on_lazy_base(lazy, tmp_path, monkeypatch):
+    # Démarrage par défaut sous Windows / macOS : la base est picklée vers chaque processus
+    spawn = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+    monkeypatch.setattr(sweep, "ProcessPoolExecutor", spawn)
+    paths = sweep.run_sweep(lazy, {"duration": [10.0, 20.0]}, str(tmp_path / "out"), jobs=2)
+    durations = []
+    for p in paths:
+        with open(p, "rb") as f:
+            durations.append(json.loads(f.read())["duration"])
+    assert durations == [10.0, 20.0]
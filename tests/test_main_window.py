@@ -0,0 +1,152 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import QThreadPool
+
+from backend import codec, journal, reload
+from backend.serializer import resolve
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def window(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "RECOVERY_DIR", str(tmp_path / "recovery"))
+    from ui.main_window import MainWindow
+    w = MainWindow()
+    yield w
+    w.close()
+    wait(app, lambda: True)
+
+def wait(app, condition, timeout=5.0):
+    """Traite les événements Qt jusqu'à `condition()` (tâches de fond comprises)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        QThreadPool.globalInstance().waitForDone(20)
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+@pytest.fixture
+def scenario_file(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_bytes(codec.dumps(make_scenario(6, 2)))
+    return str(path)
+
+def _external_write(path, rename):
+    data = codec.loads(open(path, 'rb').read())
+    data["duration"] = 90.0
+    data["drones"][5]["name"] = "renamed"
+    target = path + ".tmp" if rename else path
+    with open(target, 'wb') as f:
+        f.write(codec.dumps(data))
+    if rename:
+        os.replace(target, path)
+
+@pytest.mark.parametrize("rename", [False, True])
+def test_live_reload(app, window, scenario_file, rename):
+    window.open_file(path=scenario_file, recover=False)
+    assert wait(app, lambda: window.snapshot is not None)
+    drones = window.current_scenario.drones
+    untouched = drones[0]
+
+    _external_write(scenario_file, rename)
+    window.on_file_changed(scenario_file)
+    assert wait(app, lambda: window.current_scenario.duration == 90.0)
+    assert resolve(drones[5]).name == "renamed"
+    assert window.current_scenario.drones is drones and drones[0] is untouched
+
+def test_live_reload_keeps_local_edits(app, window, scenario_file):
+    window.open_file(path=scenario_file, recover=False)
+    assert wait(app, lambda: window.snapshot is not None)
+    edited = window.current_scenario.drones[1]
+    resolve(edited).mobility_model.curve_step = 0.25
+    window.journal_set(("drones", 1, "mobility_model"), "curve_step", 0.25)
+
+    data = codec.loads(open(scenario_file, 'rb').read())
+    data["duration"] = 90.0
+    for raw in data["drones"][:3]:
+        raw["mobilityModel"]["attributes"][2]["value"] = 0.5
+    with open(scenario_file, 'wb') as f:
+        f.write(codec.dumps(data))
+    window.on_file_changed(scenario_file)
+    assert wait(app, lambda: window.current_scenario.duration == 90.0)
+
+    drones = window.current_scenario.drones
+    assert drones[1] is edited and resolve(edited).mobility_model.curve_step == 0.25
+    assert resolve(drones[0]).mobility_model.curve_step == 0.5
+    # L'état enregistré dans le journal contient la modification locale
+    window.journal.flush()
+    snapshot = window.journal.records[-1]["s"]
+    assert snapshot["drones"][1]["mobilityModel"]["attributes"][2]["value"] == 0.25
+    assert snapshot["drones"][0]["mobilityModel"]["attributes"][2]["value"] == 0.5
+
+def test_offer_recovery_lists_every_journal(app, window, tmp_path, monkeypatch):
+    sources = []
+    for name, duration in (("a.json", 10.0), ("b.json", 20.0)):
+        path = tmp_path / name
+        path.write_bytes(codec.dumps(make_scenario(2, 2)))
+        log = journal.Journal(str(path), reload.file_digest(str(path)))
+        log.record_set((), "duration", duration)
+        log.close(discard=False)
+        sources.append(str(path))
+
+    offered = []
+    def choose(parent, title, label, items, current, editable):
+        offered.extend(items)
+        return next(i for i in items if "b.json" in i), True
+    monkeypatch.setattr(QtWidgets.QInputDialog, "getItem", staticmethod(choose))
+
+    window.offer_recovery()
+    assert len(offered) == 2
+    assert window.current_path == sources[1] and window.current_scenario.duration == 20.0
+
+def test_analysis_view_copies_containers(scenario_file):
+    from backend import serializer
+    from ui.main_window import analysis_view
+    scenario = serializer.load_scenario(scenario_file)
+    view = analysis_view(scenario)
+    assert view.drones == scenario.drones and view.drones is not scenario.drones
+    assert view.drones[0] is scenario.drones[0]
+    assert view.networkLayer is not scenario.networkLayer
+    assert view.world.buildings is not scenario.world.buildings
+    scenario.drones.clear()
+    scenario.world.buildings.clear()
+    assert len(view.drones) == 6 and len(view.world.buildings) == 50
+
+def test_background_analysis(app, window, scenario_file):
+    window.open_file(path=scenario_file, recover=False)
+    assert wait(app, lambda: window.profile is not None)
+    assert window.profile.nodes == 7 and window.analyzer.flagged() == {}
+
+    drone = window.current_scenario.drones[2]
+    resolve(drone).net_devices[0].network_layer = 5
+    window.note_edit(("drones", 2, "net_devices", 0, "network_layer"))
+    assert wait(app, lambda: window.analyzer.flagged())
+    assert [i.code for i in window.analyzer.issues_for(drone)] == ["layer-dangling"]
+
+    window.current_scenario.networkLayer[0].address = "10.9.0.0"
+    window.note_edit(("networkLayer", 0, "address"))
+    assert wait(app, lambda: len(window.analyzer.flagged()) == 6)
+
+def test_stale_analysis_result_is_ignored(app, window, scenario_file, tmp_path):
+    window.open_file(path=scenario_file, recover=False)
+    assert wait(app, lambda: window.profile is not None)
+    profile = window.profile
+    stale = window.current_scenario
+
+    other = tmp_path / "other.json"
+    other.write_bytes(codec.dumps(make_scenario(2, 2)))
+    window.open_file(path=str(other), recover=False)
+    window.finish_analysis((stale, True, {}, [], {}, profile))
+    assert window.profile is not profile
+    assert wait(app, lambda: window.profile is not None and window.profile.nodes == 3)
@@ -0,0 +1,108 @@
+import copy
+
+import pytest
+
+from backend import serializer
+from backend.reload import LocalEdits, apply_reload, node_lists, plan_reload, snapshot_from_plain
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def data():
+    return make_scenario(4, 2)
+
+@pytest.fixture
+def scenario(data):
+    return serializer._decode_scenario(copy.deepcopy(data))
+
+def reload_with(scenario, old_data, new_data, baseline=None, local=None):
+    old, new = snapshot_from_plain(old_data, "old"), snapshot_from_plain(new_data, "new")
+    return apply_reload(scenario, plan_reload(old, new), new, baseline, local)
+
+def _curve_step(node):
+    return node.mobility_model.curve_step
+
+def _set_curve_step(raw, value):
+    raw["mobilityModel"]["attributes"][2]["value"] = value
+
+def test_changed_node_is_replaced(scenario, data):
+    drones = scenario.drones
+    before = list(drones)
+    changed = copy.deepcopy(data)
+    _set_curve_step(changed["drones"][2], 0.5)
+    result = reload_with(scenario, data, changed, node_lists(scenario))
+    assert scenario.drones is drones
+    assert [d is b for d, b in zip(drones, before)] == [True, True, False, True]
+    assert _curve_step(drones[2]) == 0.5
+    assert result.replaced["drones"] == [(before[2], drones[2])]
+    assert result.baseline["drones"] == drones
+
+@pytest.mark.parametrize("with_baseline", [True, False])
+def test_reorder_in_editor_keeps_disk_changes_on_the_right_node(scenario, data, with_baseline):
+    baseline = node_lists(scenario) if with_baseline else None
+    drones = scenario.drones
+    drones.reverse()   # même longueur, autre ordre
+    changed = copy.deepcopy(data)
+    _set_curve_step(changed["drones"][0], 0.5)
+    reload_with(scenario, data, changed, baseline)
+    by_name = {d.name: d for d in drones}
+    assert _curve_step(by_name["drone0"]) == 0.5
+    assert _curve_step(by_name["drone3"]) == 0.001
+
+def test_local_edit_is_not_overwritten(scenario, data):
+    local = LocalEdits()
+    edited = scenario.drones[1]
+    edited.mobility_model.curve_step = 0.25
+    local.note(scenario, ("drones", 1, "mobility_model", "curve_step"))
+    scenario.duration = 30.0
+    local.note(scenario, ("duration",))
+
+    changed = copy.deepcopy(data)
+    _set_curve_step(changed["drones"][1], 0.5)
+    _set_curve_step(changed["drones"][2], 0.5)
+    changed["duration"] = 90.0
+    changed["logOnFile"] = False
+    result = reload_with(scenario, data, changed, node_lists(scenario), local)
+
+    assert scenario.drones[1] is edited and _curve_step(edited) == 0.25
+    assert _curve_step(scenario.drones[2]) == 0.5
+    assert scenario.duration == 30.0 and scenario.logOnFile is False
+    assert sorted(result.conflicts) == ["drones/drone1", "duration"]
+    assert result.fields == ["logOnFile"]
+
+def test_local_list_change_keeps_structure(scenario, data):
+    local = LocalEdits()
+    baseline = node_lists(scenario)
+    removed = scenario.drones.pop(0)
+    local.note(scenario, ("drones",))
+
+    changed = copy.deepcopy(data)
+    _set_curve_step(changed["drones"][3], 0.5)
+    changed["drones"].append(copy.deepcopy(changed["drones"][0]) | {"name": "drone4"})
+    result = reload_with(scenario, data, changed, baseline, local)
+
+    # Suppression locale conservée, ajout du fichier ignoré, nœud modifié sur disque remplacé
+    assert [d.name for d in scenario.drones] == ["drone1", "drone2", "drone3"]
+    assert removed not in scenario.drones
+    assert _curve_step(scenario.drones[2]) == 0.5
+    assert result.conflicts == ["drones"]
+    assert result.baseline["drones"] == [None] + scenario.drones + [None]
+
+def test_deleting_a_locally_edited_node_is_a_conflict(scenario, data):
+    local = LocalEdits()
+    local.note(scenario, ("drones", 3, "name"))
+    changed = copy.deepcopy(data)
+    del changed["drones"][3]
+    result = reload_with(scenario, data, changed, node_lists(scenario), local)
+    assert [d.name for d in scenario.drones] == ["drone0", "drone1", "drone2", "drone3"]
+    assert result.conflicts == ["drones"]
+
+def test_without_local_edits_file_structure_wins(scenario, data):
+    changed = copy.deepcopy(data)
+    changed["drones"].insert(1, copy.deepcopy(changed["drones"][0]) | {"name": "inserted"})
+    del changed["drones"][3]
+    untouched = scenario.drones[0]
+    result = reload_with(scenario, data, changed, node_lists(scenario), LocalEdits())
+    assert [d.name for d in scenario.drones] == ["drone0", "inserted", "drone1", "drone3"]
+    assert scenario.drones[0] is untouched
+    assert result.restructured == ["drones"] and not result.conflicts
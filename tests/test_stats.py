@@ -0,0 +1,117 @@
+import copy
+import gc
+import random
+
+import pytest
+
+from backend import serializer, stats
+from backend.stats import ScenarioStats, _aggregate_python
+from benchmarks.fixtures import make_scenario
+
+needs_numpy = pytest.mark.skipif(stats.np is None, reason="NumPy non installé")
+
+
+@pytest.fixture
+def scenario():
+    return serializer._decode_scenario(make_scenario(40, 3))
+
+def _full(scenario):
+    table = ScenarioStats()
+    table.build(scenario)
+    return table.profile()
+
+def assert_same(a, b):
+    assert (a.nodes, a.counts, a.waypoints, a.applications, a.peripherals) == \
+           (b.nodes, b.counts, b.waypoints, b.applications, b.peripherals)
+    assert a.traffic == pytest.approx(b.traffic)
+    assert a.power == pytest.approx(b.power)
+    assert a.bbox == pytest.approx(b.bbox)
+
+def _move(drone, position):
+    for point in drone.mobility_model.flight_plan:
+        point.position = list(position)
+
+def test_edits_update_totals_without_full_pass(scenario, monkeypatch):
+    table = ScenarioStats()
+    table.build(scenario)
+    table.profile()
+    # Après le premier calcul, aucune agrégation complète
+    monkeypatch.setattr(stats, "_aggregate_python", None)
+    monkeypatch.setattr(stats, "_aggregate_numpy", None)
+
+    rng = random.Random(1)
+    for step in range(60):
+        drone = rng.choice(scenario.drones)
+        action = rng.random()
+        if action < 0.4:
+            drone.applications[0].packet_size = rng.randint(1, 4096)
+            table.mark_dirty(drone)
+        elif action < 0.7:
+            _move(drone, [rng.uniform(-50, 1050), rng.uniform(-50, 1050), rng.uniform(0, 120)])
+            table.update_node("drones", drone)
+        elif action < 0.85 and len(scenario.drones) > 5:
+            scenario.drones.remove(drone)
+            table.sync_section("drones", scenario.drones)
+        else:
+            added = copy.deepcopy(drone)
+            added.name = f"added{step}"
+            scenario.drones.append(added)
+            table.sync_section("drones", scenario.drones)
+        assert_same(table.profile(), _full_python(scenario))
+
+def _full_python(scenario):
+    table = ScenarioStats()
+    table.build(scenario)
+    return _aggregate_python(table.columns)
+
+def test_bbox_shrinks_when_extreme_node_moves_in(scenario):
+    table = ScenarioStats()
+    table.build(scenario)
+    _move(scenario.drones[0], [-500.0, -500.0, 0.0])
+    table.update_node("drones", scenario.drones[0])
+    assert table.profile().bbox[:2] == (-500.0, -500.0)
+
+    _move(scenario.drones[0], [500.0, 500.0, 50.0])
+    table.update_node("drones", scenario.drones[0])
+    assert table.profile().bbox == _full(scenario).bbox
+    assert table.profile().bbox[0] > -500.0
+
+    table.remove_node(scenario.drones[1])
+    del scenario.drones[1]
+    assert table.profile().bbox == _full(scenario).bbox
+
+def test_profile_is_a_snapshot(scenario):
+    table = ScenarioStats()
+    table.build(scenario)
+    before = table.profile()
+    nodes, counts = before.nodes, copy.deepcopy(before.counts)
+    table.remove_node(scenario.drones[0])
+    after = table.profile()
+    assert after is not before
+    assert (before.nodes, before.counts) == (nodes, counts)
+    assert after.nodes == nodes - 1
+
+def test_build_restores_gc_state(scenario):
+    gc.disable()
+    try:
+        ScenarioStats().build(scenario)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+    ScenarioStats().build(scenario)
+    assert gc.isenabled()
+
+@needs_numpy
+def test_numpy_aggregation_matches_python(scenario):
+    table = ScenarioStats()
+    table.build(scenario)
+    table.remove_node(scenario.drones[3])     # ligne libre ignorée
+    scenario.drones[5].mobility_model = None  # nœud sans position
+    table.update_node("drones", scenario.drones[5])
+    assert_same(stats._aggregate_numpy(table.columns), _aggregate_python(table.columns))
+    assert stats._bbox_numpy(table.columns) == stats._bbox_python(table.columns)
+
+def test_empty_table():
+    table = ScenarioStats()
+    assert table.profile().nodes == 0 and table.profile().bbox is None
+    assert stats._bbox_python(table.columns) is None
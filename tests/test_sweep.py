@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from backend import codec, serializer
+from backend.sweep import apply_overrides, expand_grid, iter_variants, parse_path, run_sweep
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def base():
+    return serializer._decode_scenario(make_scenario(3, 2))
+
+GRID = {
+    "duration": [60.0, 120.0],
+    "drone_count": [2, 5],
+    "drones[*].net_devices[*].phy.tx_power": [10.0, 20.0, 30.0],
+}
+
+def test_parse_path():
+    assert parse_path("drones[*].applications[0].interval") == ["drones", "*", "applications", 0, "interval"]
+    with pytest.raises(ValueError):
+        parse_path("")
+
+def test_expand_grid_order():
+    combos = expand_grid(GRID)
+    assert len(combos) == 12
+    assert combos[0] == {"duration": 60.0, "drone_count": 2, "drones[*].net_devices[*].phy.tx_power": 10.0}
+    assert combos[1]["drones[*].net_devices[*].phy.tx_power"] == 20.0
+    assert combos[-1] == {"duration": 120.0, "drone_count": 5, "drones[*].net_devices[*].phy.tx_power": 30.0}
+    with pytest.raises(ValueError):
+        expand_grid({"duration": []})
+
+def test_variants_follow_grid(base):
+    variants = list(iter_variants(base, GRID, prefix="v"))
+    assert len(variants) == 12
+    for i, (params, variant) in enumerate(variants):
+        assert variant.name == f"v_{i:04d}"
+        assert variant.duration == params["duration"]
+        assert len(variant.drones) == params["drone_count"]
+        assert {d.net_devices[0].phy.tx_power for d in variant.drones} == {params["drones[*].net_devices[*].phy.tx_power"]}
+
+def test_variant_shares_untouched_subtrees(base):
+    variant = apply_overrides(base, {"drones[*].net_devices[*].phy.tx_power": 5.0, "duration": 1.0})
+    # La base n'est pas modifiée
+    assert base.duration == 60.0
+    assert all(d.net_devices[0].phy.tx_power == 20.0 for d in base.drones)
+    # Seul le chemin modifié est recopié
+    for old, new in zip(base.drones, variant.drones):
+        assert new is not old and new.net_devices[0].phy is not old.net_devices[0].phy
+        assert new.mobility_model is old.mobility_model
+        assert new.applications is old.applications
+        assert new.battery is old.battery
+    assert variant.world is base.world
+    assert variant.ZSPs is base.ZSPs
+    assert variant.networkLayer is base.networkLayer
+
+def test_drone_count_clones_last_drone(base):
+    variant = apply_overrides(base, {"drone_count": 5})
+    assert len(base.drones) == 3
+    assert variant.drones[:3] == base.drones[:3]
+    assert variant.drones[0] is base.drones[0]
+    assert [d.name for d in variant.drones[3:]] == ["drone2_3", "drone2_4"]
+    assert variant.drones[3].battery is not base.drones[2].battery
+
+def test_unknown_field_rejected(base):
+    with pytest.raises(AttributeError):
+        apply_overrides(base, {"drones[*].nope": 1})
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_sweep_writes_variants_and_manifest(base, tmp_path, jobs):
+    grid = {"duration": [10.0, 20.0], "drone_count": [1, 4]}
+    paths = run_sweep(base, grid, str(tmp_path), prefix="s", jobs=jobs)
+    assert [os.path.basename(p) for p in paths] == [f"s_{i:04d}.json" for i in range(4)]
+
+    with open(tmp_path / "s_manifest.json", "rb") as f:
+        manifest = codec.loads(f.read())
+    assert manifest == [{"file": f"s_{i:04d}.json", "params": params} for i, params in enumerate(expand_grid(grid))]
+
+    for entry in manifest:
+        variant = serializer.load_scenario(str(tmp_path / entry["file"]))
+        assert variant.name == entry["file"][:-len(".json")]
+        assert variant.duration == entry["params"]["duration"]
+        assert len(variant.drones) == entry["params"]["drone_count"]
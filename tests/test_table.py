@@ -0,0 +1,48 @@
+import pytest
+
+from backend import serializer
+from backend.models import ConstantPositionMobilityModel, DroneConfig, ParametricSpeedDroneMobilityModel
+from backend.serializer import to_plain
+from backend.table import bulk_assign, derive_columns, parse_csv_block
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture
+def drones():
+    scenario = serializer._decode_scenario(make_scenario(3, 2))
+    # Échantillon homogène (ParametricSpeed), puis un drone d'une autre classe au-delà
+    scenario.drones[2].mobility_model = ConstantPositionMobilityModel(
+        name="ns3::ConstantPositionMobilityModel", position=[1.0, 2.0, 3.0],
+    )
+    return scenario.drones
+
+def _column(columns, label):
+    return next(i for i, c in enumerate(columns) if c.label == label)
+
+def test_column_ignores_other_model_class(drones):
+    columns = derive_columns(DroneConfig, drones, sample=2)
+    col = _column(columns, "mobility_model.curve_step")
+    assert columns[col].owner is ParametricSpeedDroneMobilityModel
+    assert not columns[col].applies(drones[2])
+
+    changed = bulk_assign(drones, columns, [(row, col, 0.5) for row in range(3)])
+    assert changed == [0, 1]
+    assert not hasattr(drones[2].mobility_model, "curve_step")
+    assert drones[0].mobility_model.curve_step == drones[1].mobility_model.curve_step == 0.5
+    assert to_plain(drones[2])["mobilityModel"]["attributes"] == [{"name": "Position", "value": [1.0, 2.0, 3.0]}]
+
+def test_mixed_sample_qualifies_labels(drones):
+    columns = derive_columns(DroneConfig, drones)
+    labels = {c.label for c in columns}
+    assert "mobility_model[ParametricSpeedDroneMobilityModel].curve_step" in labels
+    assert "mobility_model[ConstantPositionMobilityModel].name" not in labels
+
+def test_int_coerce_rejects_fraction(drones):
+    columns = derive_columns(DroneConfig, drones)
+    int_col = next(c for c in columns if c.type is int)
+    assert int_col.coerce("3") == 3
+    assert int_col.coerce(" 4.0 ") == 4
+    with pytest.raises(ValueError):
+        int_col.coerce("2.7")
+    with pytest.raises(ValueError):
+        parse_csv_block("2.7", columns, 0, columns.index(int_col), len(drones))
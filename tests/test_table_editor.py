@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from backend import serializer
+from backend.models import DroneConfig
+from benchmarks.fixtures import make_scenario
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def editor(app):
+    from ui.widgets.table_editor import TableEditor
+    drones = serializer._decode_scenario(make_scenario(2, 2)).drones
+    drones[0].mobility_model.curve_step = 0.0005
+    widget = TableEditor(drones, DroneConfig)
+    yield widget
+    widget.close()
+
+def _index(model, label, row=0):
+    col = next(i for i, c in enumerate(model.columns) if c.label == label)
+    return model.index(row, col)
+
+def _edit(view, index, text=None):
+    """Ouvre l'éditeur du délégué de la vue sur `index` et valide, avec ou sans saisie."""
+    delegate = view.itemDelegateForIndex(index)
+    widget = delegate.createEditor(view.viewport(), QtWidgets.QStyleOptionViewItem(), index)
+    delegate.setEditorData(widget, index)
+    if text is not None:
+        widget.setText(text)
+    delegate.setModelData(widget, view.model(), index)
+    widget.deleteLater()
+
+def test_commit_without_typing_keeps_small_float(editor):
+    model = editor.model
+    index = _index(model, "mobility_model.curve_step")
+    _edit(editor.view, index)
+    assert model.nodes[0].mobility_model.curve_step == 0.0005
+    assert model.data(index) == "0.0005"
+
+def test_typed_value_is_coerced(editor):
+    model = editor.model
+    index = _index(model, "mobility_model.curve_step", row=1)
+    _edit(editor.view, index, "2.5e-05")
+    assert model.nodes[1].mobility_model.curve_step == 2.5e-05
+    _edit(editor.view, index, "abc")
+    assert model.nodes[1].mobility_model.curve_step == 2.5e-05
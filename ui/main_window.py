@@ -1,13 +1,52 @@
 # ui/main_window.py
+import copy
 import os
 from dataclasses import is_dataclass
-from PySide6.QtWidgets import *
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QTreeWidget, QTreeWidgetItem, QMenu, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
+    QSplitter, QScrollArea, QLabel, QFileDialog, QMessageBox, QLineEdit,
+    QInputDialog,
+)
+from PySide6.QtGui import QAction, QBrush, QColor
+from PySide6.QtCore import Qt, QFileSystemWatcher, QTimer
 
-from backend import serializer
-from backend.models import *
-from ui.widgets.list_editor import ListEditor
-from ui.widgets.auto_form import AutoForm
+from backend import journal, reload, serializer
+from backend.analysis import ConsistencyAnalyzer
+from backend.stats import ScenarioStats
+from backend.index import ScenarioIndex, SECTIONS
+from backend.serializer import LazyNode, resolve
+from backend.models import Ns3StaticConfig, Building, DroneConfig, NodeConfig
+from ui.utils import create_default_instance
+from ui.workers import run_in_background
+
+# Les éditeurs (AutoForm / ListEditor) sont importés à la première sélection
+# dans l'arbre : ils ne sont pas nécessaires pour afficher la fenêtre.
+
+SCENARIO_FILTER = "JSON Files (*.json);;Binaire IoD-Sim (*.iodb)"
+LAYER_FIELDS = ("phyLayer", "macLayer", "networkLayer")
+ISSUE_COLORS = {"error": "#c62828", "warning": "#ef6c00"}
+
+def format_issues(issues):
+    return "\n".join(f"{'Erreur' if i.severity == 'error' else 'Attention'} : {i.message}" for i in issues)
+
+def analysis_view(scenario, sections=SECTIONS, layers=True, world=True):
+    """
+    Copie superficielle du scénario pour la tâche d'analyse : les listes lues
+    par le thread de fond (couches, sections, monde) sont copiées, les nœuds
+    sont partagés. Le thread graphique peut modifier les originaux entre-temps.
+    """
+    view = copy.copy(scenario)
+    if layers:
+        for name in LAYER_FIELDS:
+            setattr(view, name, list(getattr(scenario, name) or []))
+    for section in sections:
+        setattr(view, section, list(getattr(scenario, section) or []))
+    if world and scenario.world is not None:
+        view.world = copy.copy(scenario.world)
+        view.world.size = dict(scenario.world.size or {})
+        view.world.buildings = list(scenario.world.buildings or [])
+        view.world.regionsOfInterest = [list(r) for r in scenario.world.regionsOfInterest or []]
+    return view
 
 class ScenarioTree(QTreeWidget):
     def __init__(self, main_window_ref):
@@ -18,25 +57,31 @@ class ScenarioTree(QTreeWidget):
         self.customContextMenuRequested.connect(self.open_menu)
         self.main_window = main_window_ref
         self.current_scenario = None
+        self.node_items = {}      # id(nœud) -> QTreeWidgetItem
+        self.category_items = {}  # id(liste) -> QTreeWidgetItem de la catégorie
+        self.visible_ids = None   # filtre actif (None = tout afficher)
+        self.issues = {}          # id(nœud) -> anomalies (analyse de cohérence)
+        self.layer_issues = []
+        self.root_item = None
 
     def populate(self, scenario):
         self.current_scenario = scenario
         self.clear()
+        self.node_items = {}
+        self.category_items = {}
         if not scenario: return
 
         root = QTreeWidgetItem(self, [scenario.name])
         root.setData(0, Qt.UserRole, scenario)
+        self.root_item = root
+        self.set_layer_issues(self.layer_issues)
         
         # --- Helper Générique ---
         def add_category(parent, title, data_list, item_type):
             node = QTreeWidgetItem(parent, [title])
             node.setData(0, Qt.UserRole, {"list": data_list, "type": item_type})
-            
-            for i, item in enumerate(data_list):
-                if is_dataclass(item):
-                    name = getattr(item, 'name', None) or f"Item {i+1}"
-                    child = QTreeWidgetItem(node, [str(name)])
-                    child.setData(0, Qt.UserRole, item)
+            self.category_items[id(data_list)] = node
+            self.add_children(node, data_list)
         
         # 1. Configuration Statique & Logs (Les "Administratifs")
         add_category(root, "Static NS3 Config", scenario.staticNs3Config, Ns3StaticConfig)
@@ -61,6 +106,119 @@ class ScenarioTree(QTreeWidget):
         root.setExpanded(True)
         root.setExpanded(True)
 
+        if self.visible_ids is not None:
+            self.apply_filter(self.visible_ids)
+
+    def add_children(self, category, data_list):
+        for i, item in enumerate(data_list):
+            # Les nœuds paresseux affichent leur nom sans être décodés
+            if is_dataclass(item) or isinstance(item, LazyNode):
+                name = getattr(item, 'name', None) or f"Item {i+1}"
+                child = QTreeWidgetItem(category, [str(name)])
+                child.setData(0, Qt.UserRole, item)
+                self.node_items[id(item)] = child
+                if id(item) in self.issues:
+                    self.style_item(child, self.issues[id(item)])
+
+    # --- Mise à jour partielle (rechargement incrémental) ---
+
+    def replace_node(self, old, new):
+        """Rattache l'élément d'arbre de `old` au nœud `new` (sélection conservée)."""
+        item = self.node_items.pop(id(old), None)
+        if item is None:
+            return
+        item.setText(0, str(getattr(new, 'name', None) or item.text(0)))
+        item.setData(0, Qt.UserRole, new)
+        self.node_items[id(new)] = item
+        self.style_item(item, self.issues.get(id(new), ()))
+        if self.visible_ids is not None:
+            item.setHidden(id(new) not in self.visible_ids)
+
+    def refresh_category(self, data_list):
+        """Reconstruit les enfants d'une catégorie ; les nœuds conservés restent sélectionnés."""
+        category = self.category_items.get(id(data_list))
+        if category is None:
+            return False
+        current = self.currentItem()
+        selected = current.data(0, Qt.UserRole) if current is not None and current.parent() is category else None
+        for i in range(category.childCount()):
+            self.node_items.pop(id(category.child(i).data(0, Qt.UserRole)), None)
+        category.takeChildren()
+        self.add_children(category, data_list)
+        if selected is not None and id(selected) in self.node_items:
+            self.setCurrentItem(self.node_items[id(selected)])
+        if self.visible_ids is not None:
+            self.apply_filter(self.visible_ids)
+        return True
+
+    # --- Anomalies (analyse de cohérence) ---
+
+    def style_item(self, item, issues):
+        if issues:
+            worst = "error" if any(i.severity == "error" for i in issues) else "warning"
+            item.setForeground(0, QBrush(QColor(ISSUE_COLORS[worst])))
+            item.setToolTip(0, format_issues(issues))
+        else:
+            item.setData(0, Qt.ForegroundRole, None)
+            item.setToolTip(0, "")
+
+    def set_issues(self, changed, replace=False):
+        """Met à jour les nœuds signalés ; seuls les éléments concernés sont restylés."""
+        if replace:
+            stale = set(self.issues) - set(changed)
+            self.issues = {}
+            changed = {**{key: () for key in stale}, **changed}
+        for key, issues in changed.items():
+            if issues:
+                self.issues[key] = issues
+            else:
+                self.issues.pop(key, None)
+            item = self.node_items.get(key)
+            if item is not None:
+                self.style_item(item, issues)
+
+    def set_layer_issues(self, issues):
+        self.layer_issues = list(issues)
+        if self.root_item is not None:
+            self.style_item(self.root_item, self.layer_issues)
+
+    def item_path(self, item):
+        path = []
+        while item is not None:
+            path.append(item.text(0))
+            item = item.parent()
+        return tuple(reversed(path))
+
+    def save_state(self):
+        """Chemins (libellés) des éléments dépliés et de l'élément sélectionné."""
+        expanded = set()
+        stack = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            if item.isExpanded():
+                expanded.add(self.item_path(item))
+                stack.extend(item.child(i) for i in range(item.childCount()))
+        current = self.currentItem()
+        return expanded, self.item_path(current) if current is not None else None
+
+    def restore_state(self, state):
+        expanded, selected = state
+        stack = [self.topLevelItem(i) for i in range(self.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            path = self.item_path(item)
+            if path in expanded:
+                item.setExpanded(True)
+                stack.extend(item.child(i) for i in range(item.childCount()))
+            if path == selected:
+                self.setCurrentItem(item)
+
+    def apply_filter(self, visible_ids):
+        """Masque les nœuds absents de `visible_ids` (None = tout afficher)."""
+        self.visible_ids = visible_ids
+        for key, item in self.node_items.items():
+            item.setHidden(visible_ids is not None and key not in visible_ids)
+
     def open_menu(self, position):
         item = self.itemAt(position)
         if not item: return
@@ -73,6 +231,22 @@ class ScenarioTree(QTreeWidget):
             action = QAction(f"Ajouter {type_name}", self)
             action.triggered.connect(lambda: self.add_item_to_list(data["list"], data["type"], item))
             menu.addAction(action)
+            if self.main_window.node_section(data["list"]):
+                table_action = QAction("Éditer en tableau", self)
+                table_action.triggered.connect(
+                    lambda: self.main_window.show_table(data["list"], data["type"], item.text(0))
+                )
+                menu.addAction(table_action)
+            menu.exec(self.viewport().mapToGlobal(position))
+            return
+
+        parent_data = item.parent().data(0, Qt.UserRole) if item.parent() else None
+        is_object = is_dataclass(data) or isinstance(data, LazyNode)
+        if is_object and isinstance(parent_data, dict) and "list" in parent_data:
+            menu = QMenu()
+            action = QAction("Dupliquer N fois...", self)
+            action.triggered.connect(lambda: self.duplicate_item(parent_data["list"], data))
+            menu.addAction(action)
             menu.exec(self.viewport().mapToGlobal(position))
 
     def add_item_to_list(self, target_list, item_type, tree_item):
@@ -82,11 +256,33 @@ class ScenarioTree(QTreeWidget):
                 new_obj.name = f"{item_type.__name__}_{len(target_list)+1}"
                 
             target_list.append(new_obj)
+            self.main_window.record_inserts(target_list, len(target_list) - 1, [new_obj])
+            self.main_window.on_list_changed(target_list)
             
             self.populate(self.current_scenario)
             
             tree_item.setExpanded(True)
 
+    def duplicate_item(self, target_list, template):
+        """Insère en une fois N copies de `template` juste après lui."""
+        from backend.clone import clone_node
+        from ui.widgets.clone_dialog import CloneDialog
+
+        dialog = CloneDialog(getattr(template, "name", None) or type(template).__name__, self)
+        if not dialog.exec():
+            return
+        try:
+            clones = clone_node(template, **dialog.options())
+        except (KeyError, IndexError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Duplication impossible:\n{e}")
+            return
+
+        position = next(i for i, item in enumerate(target_list) if item is template) + 1
+        target_list[position:position] = clones
+        self.main_window.record_inserts(target_list, position, clones)
+        self.main_window.on_list_changed(target_list)
+        self.populate(self.current_scenario)
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -95,6 +291,37 @@ class MainWindow(QMainWindow):
         
         self.current_scenario = None
         self.current_path = None
+        self.index = ScenarioIndex()
+
+        # Surveillance du fichier ouvert (rechargement incrémental)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)   # un générateur écrit souvent en plusieurs fois
+        self.reload_timer.timeout.connect(self.start_reload)
+        self.snapshot = None       # empreintes du fichier tel que chargé / rechargé
+        self.own_digest = None     # empreinte de notre dernière sauvegarde (ignorée)
+        self.snapshot_worker = None
+        self.reload_worker = None
+        self.reload_pending = False
+        self.baseline = None       # nœuds alignés sur le fichier surveillé (correspondance par identité)
+        self.local_edits = reload.LocalEdits()   # modifications non sauvegardées, préservées au rechargement
+
+        self.journal = None        # journal de récupération du fichier ouvert
+        self.import_worker = None  # import de points de passage en cours
+
+        # Analyse de cohérence en arrière-plan (une tâche à la fois, regroupées par délai)
+        self.analyzer = ConsistencyAnalyzer()
+        self.stats = ScenarioStats()   # profil statistique, tenu à jour par la même tâche
+        self.profile = None
+        self.stats_panel = None
+        self.analysis_worker = None
+        self.analysis_job = self.new_analysis_job()
+        self.analysis_timer = QTimer(self)
+        self.analysis_timer.setSingleShot(True)
+        self.analysis_timer.setInterval(400)
+        self.analysis_timer.timeout.connect(self.start_analysis)
         
         self.setup_ui()
         self.setup_menu()
@@ -106,9 +333,20 @@ class MainWindow(QMainWindow):
         layout = QHBoxLayout(main_widget)
         splitter = QSplitter(Qt.Horizontal)
         
+        left = QWidget()
+        left_ly = QVBoxLayout(left)
+        left_ly.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_box = QLineEdit()
+        self.filter_box.setPlaceholderText("Filtrer : drone3, type:ParametricSpeed, curve_step<0.01, layer:0...")
+        self.filter_box.setClearButtonEnabled(True)
+        self.filter_box.textChanged.connect(self.apply_filter)
+        left_ly.addWidget(self.filter_box)
+
         self.tree = ScenarioTree(self)
         self.tree.itemClicked.connect(self.on_tree_select)
-        splitter.addWidget(self.tree)
+        left_ly.addWidget(self.tree)
+        splitter.addWidget(left)
         
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -125,21 +363,91 @@ class MainWindow(QMainWindow):
         file_menu = bar.addMenu("Fichier")
         
         file_menu.addAction("Ouvrir...", self.open_file, "Ctrl+O")
+        file_menu.addAction("Ouvrir (chargement paresseux)...", lambda: self.open_file(lazy=True))
+        file_menu.addAction("Importer des waypoints...", self.import_waypoints)
         file_menu.addAction("Enregistrer", self.save_file, "Ctrl+S")
         file_menu.addAction("Enregistrer sous...", self.save_file_as, "Ctrl+Shift+S")
 
-    def open_file(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Ouvrir JSON", "", "JSON Files (*.json)")
+        tools_menu = bar.addMenu("Outils")
+        tools_menu.addAction("Comparer avec un fichier...", self.compare_with_file)
+        tools_menu.addAction("Fusion à trois...", self.merge_three_way)
+        tools_menu.addAction("Statistiques du scénario", self.show_stats)
+
+    def open_file(self, lazy=False, path=None, recover=None):
+        """
+        Ouvre un scénario ; `lazy` ne décode les nœuds qu'à leur sélection.
+        `recover` : rejouer le journal de récupération (None = demander).
+        """
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Ouvrir JSON", "", SCENARIO_FILTER)
         if path:
             try:
-                self.current_scenario = serializer.load_scenario(path)
+                self.current_scenario = serializer.load_scenario(path, lazy=lazy)
                 self.current_path = path
+                self.baseline = reload.node_lists(self.current_scenario)
+                self.local_edits.clear()
+                self.start_journal(path, recover)
+                self.index.build(self.current_scenario)
+                self.schedule_analysis(build=True)
                 self.tree.populate(self.current_scenario)
                 self.setWindowTitle(f"IoD-Sim Editor - {os.path.basename(path)}")
                 self.scroll.setWidget(QLabel("Scénario chargé. Sélectionnez un élément."))
+                self.watch(path)
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Impossible de charger:\n{e}")
 
+    def import_waypoints(self):
+        """Ajoute des drones à partir d'un journal de points de passage (CSV / JSONL)."""
+        if not self.current_scenario: return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Importer des waypoints", "", "Waypoints (*.csv *.jsonl *.ndjson);;Tous (*)",
+        )
+        if not path: return
+        min_distance, ok = QInputDialog.getDouble(
+            self, "Sous-échantillonnage", "Distance minimale entre points (0 = tout garder):", 0.0, 0.0, 1e6, 2,
+        )
+        if not ok: return
+        # Le drone sélectionné sert de modèle (applications, pile réseau, batterie...)
+        selected = self.tree.currentItem()
+        template = selected.data(0, Qt.UserRole) if selected else None
+        template = resolve(template) if isinstance(template, (DroneConfig, LazyNode)) else None
+        if not isinstance(template, DroneConfig):
+            template = None
+
+        if self.import_worker is not None:
+            self.statusBar().showMessage("Un import est déjà en cours.", 5000)
+            return
+        from backend import importer
+        from backend.clone import clone_node
+        if template is not None:
+            # Copie prise ici : le thread d'import ne lit pas un nœud en cours d'édition
+            template = clone_node(template, 1)[0]
+        scenario = self.current_scenario
+        self.statusBar().showMessage(f"Import de {os.path.basename(path)}...")
+        self.import_worker = run_in_background(
+            importer.read_drones, path, min_distance=min_distance, template=template, sorted_input=None,
+            on_finished=lambda drones: self.finish_import(scenario, path, drones),
+            on_failed=self.import_failed,
+        )
+
+    def import_failed(self, message):
+        self.import_worker = None
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Erreur", f"Import impossible:\n{message}")
+
+    def finish_import(self, scenario, path, imported):
+        self.import_worker = None
+        self.statusBar().clearMessage()
+        if scenario is not self.current_scenario:
+            return
+        drones = self.current_scenario.drones
+        start = len(drones)
+        drones.extend(imported)
+        self.record_inserts(drones, start, imported)
+        self.on_list_changed(drones)
+        self.tree.populate(self.current_scenario)
+        self.scroll.setWidget(QLabel(f"{len(imported)} drone(s) importé(s) depuis {os.path.basename(path)}."))
+
     def save_file(self):
         if self.current_path:
             self._do_save(self.current_path)
@@ -148,34 +456,479 @@ class MainWindow(QMainWindow):
 
     def save_file_as(self):
         if not self.current_scenario: return
-        path, _ = QFileDialog.getSaveFileName(self, "Sauvegarder JSON", "", "JSON Files (*.json)")
+        path, _ = QFileDialog.getSaveFileName(self, "Sauvegarder JSON", "", SCENARIO_FILTER)
         if path:
             self._do_save(path)
 
     def _do_save(self, path):
         try:
             serializer.save_scenario(self.current_scenario, path)
-            self.current_path = path
+            self.own_digest = reload.file_digest(path)
+            self.baseline = reload.node_lists(self.current_scenario)
+            self.local_edits.clear()
+            if path != self.current_path or self.journal is None:
+                self.current_path = path
+                self.start_journal(path, recover=False)
+                self.watch(path)
+            else:
+                self.journal.reset(self.own_digest)
             self.setWindowTitle(f"IoD-Sim Editor - {os.path.basename(path)}")
             QMessageBox.information(self, "Succès", "Fichier sauvegardé !")
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Echec sauvegarde:\n{e}")
 
+    # --- Journal de récupération ---
+
+    def start_journal(self, path, recover=None):
+        """Ouvre le journal de `path`, après avoir proposé de rejouer celui d'une session interrompue."""
+        self.close_journal()
+        recovered = []
+        existing = journal.journal_path(path)
+        if os.path.exists(existing):
+            header, records = journal.read_journal(existing)
+            digest = reload.file_digest(path)
+            if records and recover is None:
+                message = f"{len(records)} modification(s) non enregistrée(s) de {os.path.basename(path)} ont été trouvées."
+                if header.get("digest") != digest:
+                    message += "\nLe fichier a changé depuis : la restauration peut être partielle."
+                answer = QMessageBox.question(self, "Récupération", message + "\nLes restaurer ?")
+                recover = answer == QMessageBox.Yes
+            if records and recover:
+                applied, failed = journal.replay(self.current_scenario, records)
+                recovered = records
+                for record in records:
+                    if "s" in record:
+                        self.local_edits.note_all(self.current_scenario)
+                    else:
+                        field = (record["f"],) if "f" in record else ()
+                        self.local_edits.note(self.current_scenario, tuple(record["p"]) + field)
+                self.statusBar().showMessage(
+                    f"{applied} modification(s) restaurée(s)" + (f", {failed} ignorée(s)" if failed else ""), 5000,
+                )
+        try:
+            self.journal = journal.Journal(path, reload.file_digest(path), records=recovered)
+        except OSError as e:
+            self.journal = None
+            self.statusBar().showMessage(f"Sauvegarde automatique indisponible : {e}", 5000)
+
+    def close_journal(self, discard=None):
+        if self.journal is not None:
+            self.journal.close(discard)
+            self.journal = None
+
+    def offer_recovery(self):
+        """
+        Au démarrage : propose de rouvrir le scénario d'une session interrompue.
+        S'il y en a plusieurs, la liste est affichée ; les journaux non choisis
+        sont conservés et reproposés à l'ouverture de leur fichier.
+        """
+        pending = [p for p in journal.pending_recoveries() if os.path.exists(p[1]["source"])]
+        if not pending:
+            return
+        if len(pending) == 1:
+            _, header, records = pending[0]
+            answer = QMessageBox.question(
+                self, "Récupération",
+                f"La session précédente s'est interrompue avec {len(records)} modification(s) non enregistrée(s) "
+                f"de {os.path.basename(header['source'])}.\nRouvrir le fichier et les restaurer ?",
+            )
+            if answer == QMessageBox.Yes:
+                self.open_file(path=header["source"], recover=True)
+            return
+        labels = [
+            f"{os.path.basename(header['source'])} — {len(records)} modification(s) ({header['source']})"
+            for _, header, records in pending
+        ]
+        label, ok = QInputDialog.getItem(
+            self, "Récupération",
+            f"{len(pending)} scénarios ont des modifications non enregistrées (sessions interrompues).\n"
+            "Fichier à rouvrir et restaurer (les autres seront proposés à leur ouverture) :",
+            labels, 0, False,
+        )
+        if ok and label in labels:
+            self.open_file(path=pending[labels.index(label)][1]["source"], recover=True)
+
+    def connect_journal(self, editor):
+        editor.field_edited.connect(self.journal_set)
+        editor.item_added.connect(self.journal_insert)
+        editor.item_removed.connect(self.journal_delete)
+        return editor
+
+    def journal_set(self, path, field, value):
+        self.note_edit(path + (field,))
+        if self.journal is not None:
+            self.journal.record_set(path, field, value)
+
+    def journal_insert(self, path, index, value):
+        self.note_edit(path)
+        if self.journal is not None:
+            self.journal.record_insert(path, index, value)
+
+    def journal_delete(self, path, index):
+        self.note_edit(path)
+        if self.journal is not None:
+            self.journal.record_delete(path, index)
+
+    def record_inserts(self, target_list, start, items):
+        """Journalise l'insertion de `items` dans `target_list` à partir de `start`."""
+        if self.journal is None:
+            return
+        path = journal.locate(self.current_scenario, target_list)
+        if path is not None:
+            for k, item in enumerate(items):
+                self.journal.record_insert(path, start + k, item)
+
+    def closeEvent(self, event):
+        # Sans modification en attente, le journal est supprimé
+        self.close_journal()
+        super().closeEvent(event)
+
+    # --- Rechargement incrémental ---
+
+    def watch(self, path):
+        """Surveille `path` ; les empreintes de référence sont calculées en arrière-plan."""
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        self.watcher.addPath(path)
+        self.snapshot = None
+        self.snapshot_worker = run_in_background(
+            reload.read_snapshot, path,
+            on_finished=lambda snap: self.set_snapshot(path, snap), on_failed=self.snapshot_failed,
+        )
+
+    def set_snapshot(self, path, snapshot):
+        if path != self.current_path:
+            return
+        self.snapshot_worker = None
+        self.snapshot = snapshot
+        if self.reload_pending:
+            self.reload_pending = False
+            self.start_reload()
+
+    def snapshot_failed(self, message):
+        self.snapshot_worker = None
+        self.reload_pending = False
+        self.statusBar().showMessage(f"Surveillance du fichier impossible : {message}", 5000)
+
+    def on_file_changed(self, path):
+        # Écriture par renommage : le fichier remplacé n'est plus surveillé
+        if os.path.exists(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)
+        self.reload_timer.start()
+
+    def start_reload(self):
+        if not self.current_path:
+            return
+        if self.reload_worker is not None or (self.snapshot is None and self.snapshot_worker is not None):
+            self.reload_pending = True
+            return
+        if self.snapshot is None:
+            return
+        path, old, own = self.current_path, self.snapshot, self.own_digest
+
+        def compute():
+            new = reload.read_snapshot(path)
+            plan = None if new.digest == own else reload.plan_reload(old, new)
+            return path, new, plan
+
+        self.reload_worker = run_in_background(compute, on_finished=self.finish_reload, on_failed=self.reload_failed)
+
+    def reload_failed(self, message):
+        self.reload_worker = None
+        self.statusBar().showMessage(f"Rechargement impossible : {message}", 5000)
+
+    def finish_reload(self, outcome):
+        self.reload_worker = None
+        path, new, plan = outcome
+        if path == self.current_path and self.current_scenario is not None:
+            if plan is not None and not plan.empty:
+                self.apply_file_changes(plan, new)
+            self.snapshot = new
+        if self.reload_pending:
+            self.reload_pending = False
+            self.start_reload()
+
+    def apply_file_changes(self, plan, new):
+        """Intègre au scénario, à l'index et à l'arbre les seules parties modifiées."""
+        current = self.tree.currentItem()
+        current_data = current.data(0, Qt.UserRole) if current is not None else None
+        result = reload.apply_reload(self.current_scenario, plan, new, self.baseline, self.local_edits)
+        if self.baseline is not None:
+            self.baseline.update(result.baseline)
+        if self.journal is not None:
+            # Le journal est relatif au fichier : nouvelle base, ou état complet s'il reste des modifications
+            if self.journal.pending:
+                self.journal.record_snapshot(self.current_scenario)
+            else:
+                self.journal.reset(new.digest)
+
+        for section in result.changed_sections:
+            self.index.sync_section(section, getattr(self.current_scenario, section))
+            self.schedule_analysis(section=section)
+        if result.fields:
+            self.schedule_analysis(layers=True, world="world" in result.fields)
+
+        if result.fields:
+            # Champs hors sections de nœuds (world, couches...) : arbre reconstruit, état conservé
+            state = self.tree.save_state()
+            self.tree.populate(self.current_scenario)
+            self.tree.restore_state(state)
+        else:
+            for section in result.restructured:
+                self.tree.refresh_category(getattr(self.current_scenario, section))
+            for pairs in result.replaced.values():
+                for old, node in pairs:
+                    self.tree.replace_node(old, node)
+
+        # Rafraîchit l'éditeur si l'élément affiché a été remplacé ou sa liste modifiée
+        current = self.tree.currentItem()
+        if current is not None:
+            data = current.data(0, Qt.UserRole)
+            changed_lists = [getattr(self.current_scenario, s) for s in result.changed_sections]
+            if result.fields or data is not current_data or (
+                isinstance(data, dict) and any(data.get("list") is l for l in changed_lists)
+            ):
+                self.on_tree_select(current, 0)
+
+        replaced = sum(len(p) for p in result.replaced.values())
+        message = (
+            f"Fichier modifié sur disque : {replaced} nœud(s) remplacé(s), "
+            f"{len(result.restructured)} section(s) restructurée(s), {len(result.fields)} champ(s) rechargé(s)"
+        )
+        if result.conflicts:
+            shown = ", ".join(result.conflicts[:5]) + (", ..." if len(result.conflicts) > 5 else "")
+            message += f" ; modifications locales conservées ({len(result.conflicts)} conflit(s) : {shown})"
+        self.statusBar().showMessage(message, 10000 if result.conflicts else 5000)
+
+    def compare_with_file(self):
+        if not self.current_scenario: return
+        path, _ = QFileDialog.getOpenFileName(self, "Comparer avec", "", SCENARIO_FILTER)
+        if not path: return
+        from backend import diff
+        from ui.widgets.diff_view import DiffView
+        try:
+            other = serializer.load_scenario(path)
+            changes = diff.diff(self.current_scenario, other)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Comparaison impossible:\n{e}")
+            return
+        self.set_scroll_content(DiffView(changes=changes), f"Différences avec {os.path.basename(path)}")
+
+    def merge_three_way(self):
+        """Fusionne le scénario courant (local) avec un autre fichier, par rapport à une base commune."""
+        if not self.current_scenario: return
+        base_path, _ = QFileDialog.getOpenFileName(self, "Scénario de base (ancêtre commun)", "", SCENARIO_FILTER)
+        if not base_path: return
+        other_path, _ = QFileDialog.getOpenFileName(self, "Scénario à fusionner", "", SCENARIO_FILTER)
+        if not other_path: return
+        from backend import diff
+        from ui.widgets.diff_view import DiffView
+        try:
+            base = serializer.load_scenario(base_path)
+            theirs = serializer.load_scenario(other_path)
+            merged, conflicts = diff.merge3(base, self.current_scenario, theirs)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Fusion impossible:\n{e}")
+            return
+        self.current_scenario = merged
+        # Rien ne correspond plus au fichier : tout changement sur disque sera un conflit
+        self.baseline = None
+        self.local_edits.note_all(merged)
+        if self.journal is not None:
+            self.journal.record_snapshot(merged)
+        self.index.build(self.current_scenario)
+        self.schedule_analysis(build=True)
+        self.tree.populate(self.current_scenario)
+        self.set_scroll_content(DiffView(conflicts=conflicts), f"Fusion avec {os.path.basename(other_path)}")
+
+    def apply_filter(self, text):
+        text = text.strip()
+        if not text or not self.current_scenario:
+            self.tree.apply_filter(None)
+            return
+        try:
+            matches = self.index.search(text)
+        except (KeyError, ValueError):
+            return
+        self.tree.apply_filter({id(n) for n in matches})
+
+    def node_section(self, target_list):
+        """Nom de la section (drones, ZSPs...) correspondant à une liste du scénario."""
+        for section in SECTIONS:
+            if getattr(self.current_scenario, section, None) is target_list:
+                return section
+        return None
+
+    def on_list_changed(self, target_list):
+        section = self.node_section(target_list)
+        if section:
+            self.local_edits.sections.add(section)
+            self.index.sync_section(section, target_list)
+            self.schedule_analysis(section=section)
+
+    # --- Analyse de cohérence ---
+
+    @staticmethod
+    def new_analysis_job():
+        return {"build": False, "layers": False, "world": False, "sections": set(), "nodes": {}}
+
+    def note_edit(self, path):
+        """Modification à `path` (chemin depuis la racine) : planifie la réanalyse concernée."""
+        if not path or self.current_scenario is None:
+            return
+        self.local_edits.note(self.current_scenario, path)
+        if path[0] in LAYER_FIELDS:
+            self.schedule_analysis(layers=True)
+        elif path[0] == "world":
+            self.schedule_analysis(world=True)
+        elif path[0] in SECTIONS and len(path) >= 2 and isinstance(path[1], int):
+            nodes = getattr(self.current_scenario, path[0])
+            if path[1] < len(nodes):
+                self.schedule_analysis(node=nodes[path[1]])
+
+    def schedule_analysis(self, build=False, layers=False, world=False, section=None, node=None):
+        """Accumule le travail ; aucune analyse n'a lieu dans le thread graphique."""
+        job = self.analysis_job
+        if build:
+            self.profile = None   # profil d'un autre scénario : plus affiché jusqu'au nouveau calcul
+        job["build"] |= build
+        job["layers"] |= layers
+        job["world"] |= world
+        if section is not None:
+            job["sections"].add(section)
+        if node is not None:
+            job["nodes"][id(node)] = node
+        self.analysis_timer.start()
+
+    def start_analysis(self):
+        if self.current_scenario is None:
+            return
+        if self.analysis_worker is not None:
+            self.analysis_timer.start()   # une analyse est en cours : nouvel essai plus tard
+            return
+        job, self.analysis_job = self.analysis_job, self.new_analysis_job()
+        scenario = self.current_scenario
+        # Copie des listes (peu coûteuse) : le thread graphique peut les modifier pendant l'analyse
+        if job["build"]:
+            view = analysis_view(scenario)
+        else:
+            view = analysis_view(scenario, job["sections"], job["layers"], job["world"])
+        sections = {s: getattr(view, s) for s in job["sections"]}
+        nodes = [(self.index.section_of(n), n) for n in job["nodes"].values()]
+        nodes = [(s, n) for s, n in nodes if s is not None]
+        analyzer, stats = self.analyzer, self.stats
+
+        def run():
+            if job["build"]:
+                changed = analyzer.build(view)
+                stats.build(view)
+            else:
+                changed = {}
+                if job["layers"]:
+                    changed.update(analyzer.update_layers(view))
+                if job["world"]:
+                    stats.update_world(view)
+                for section, items in sections.items():
+                    changed.update(analyzer.sync_section(section, items))
+                    stats.sync_section(section, items)
+                for section, node in nodes:
+                    changed.update(analyzer.update_node(section, node))
+                    stats.update_node(section, node)
+            return (scenario, job["build"], changed, list(analyzer.layer_issues), analyzer.flagged(),
+                    stats.profile())
+
+        self.analysis_worker = run_in_background(run, on_finished=self.finish_analysis, on_failed=self.analysis_failed)
+
+    def show_stats(self):
+        from ui.widgets.stats_panel import StatsPanel
+
+        if self.current_scenario is None:
+            return
+        panel = StatsPanel(self.profile)
+        self.stats_panel = panel
+        panel.destroyed.connect(lambda: setattr(self, "stats_panel", None) if self.stats_panel is panel else None)
+        self.set_scroll_content(panel, "Statistiques du scénario")
+
+    def analysis_failed(self, message):
+        self.analysis_worker = None
+        self.statusBar().showMessage(f"Analyse impossible : {message}", 5000)
+
+    def finish_analysis(self, outcome):
+        self.analysis_worker = None
+        scenario, full, changed, layer_issues, flagged, profile = outcome
+        if scenario is not self.current_scenario:
+            return
+        self.profile = profile
+        if self.stats_panel is not None:
+            self.stats_panel.set_profile(self.profile)
+        self.tree.set_issues(changed, replace=full)
+        self.tree.set_layer_issues(layer_issues)
+        all_issues = [i for issues in flagged.values() for i in issues] + layer_issues
+        errors = sum(1 for i in all_issues if i.severity == "error")
+        if all_issues:
+            self.statusBar().showMessage(
+                f"Cohérence : {errors} erreur(s), {len(all_issues) - errors} avertissement(s) "
+                f"sur {len(flagged)} nœud(s)", 5000,
+            )
+
+    def show_table(self, target_list, item_type, title):
+        from ui.widgets.table_editor import TableEditor
+
+        editor = TableEditor(target_list, item_type)
+
+        def on_bulk_edited(rows, names_changed):
+            for row in rows:
+                self.local_edits.note_node(target_list[row])
+                self.index.mark_dirty(target_list[row])
+                self.schedule_analysis(node=target_list[row])
+            if names_changed:
+                self.tree.populate(self.current_scenario)
+
+        def on_cells_edited(cells):
+            base = journal.locate(self.current_scenario, target_list)
+            if self.journal is None or base is None:
+                return
+            for row, path, value in cells:
+                self.journal.record_set(base + (row,) + path[:-1], path[-1], value)
+
+        editor.bulk_edited.connect(on_bulk_edited)
+        editor.cells_edited.connect(on_cells_edited)
+        self.set_scroll_content(editor, f"Tableau : {title}")
+
     def on_tree_select(self, item, col):
+        from ui.widgets.list_editor import ListEditor
+        from ui.widgets.auto_form import AutoForm
+
         data = item.data(0, Qt.UserRole)
+
+        # Le nœud affiché peut être modifié : il sera réindexé à la prochaine recherche
+        if self.index.section_of(data):
+            self.index.mark_dirty(data)
+
+        # Chemin dans le scénario, pour journaliser les modifications de l'éditeur
+        target = data["list"] if isinstance(data, dict) and "list" in data else data
+        path = journal.locate(self.current_scenario, target) if self.current_scenario else None
         
+        # Nœud paresseux : décodé à sa première ouverture
+        data = resolve(data)
+
         if isinstance(data, dict) and "list" in data:
             target_list = data["list"]
             item_type = data["type"]
+
+            if self.node_section(target_list):
+                for node in target_list:
+                    self.index.mark_dirty(node)
             
-            editor = ListEditor(target_list, item_type)
+            editor = self.connect_journal(ListEditor(target_list, item_type, path=path))
             
+            editor.data_changed.connect(lambda: self.on_list_changed(target_list))
             editor.data_changed.connect(lambda: self.tree.populate(self.current_scenario))
             
             self.set_scroll_content(editor, f"Édition Liste : {item.text(0)}")
 
         elif is_dataclass(data):
-            form = AutoForm(data)
+            form = self.connect_journal(AutoForm(data, path=path))
             self.set_scroll_content(form, f"Édition : {type(data).__name__}")
             
         else:
@@ -1,7 +1,10 @@
 from dataclasses import fields, is_dataclass
 from typing import List, Union, get_origin, get_args, Literal
 
-from PySide6.QtWidgets import *
+from PySide6.QtWidgets import (
+    QWidget, QFormLayout, QLabel, QGroupBox, QVBoxLayout, QComboBox, QCheckBox,
+    QDoubleSpinBox, QSpinBox, QLineEdit,
+)
 from PySide6.QtCore import Qt, Signal
 
 from ui.utils import get_real_type, create_default_instance
@@ -14,10 +17,16 @@ except ImportError:
 
 class AutoForm(QWidget):
     content_changed = Signal()
+    # Modifications unitaires pour le journal : (chemin, champ, valeur)
+    field_edited = Signal(object, object, object)
+    # Listes imbriquées : (chemin de la liste, index, valeur) / (chemin, index)
+    item_added = Signal(object, int, object)
+    item_removed = Signal(object, int)
 
-    def __init__(self, data_obj, parent=None):
+    def __init__(self, data_obj, parent=None, path=None):
         super().__init__(parent)
         self.data_obj = data_obj
+        self.path = path   # chemin de l'objet dans le scénario (None = non journalisé)
         self.layout = QFormLayout(self)
         self.layout.setLabelAlignment(Qt.AlignRight)
         self.layout.setContentsMargins(5, 5, 5, 5)
@@ -27,6 +36,21 @@ class AutoForm(QWidget):
         else:
             self.layout.addRow(QLabel("Non éditable (Type primitif dans liste)"))
 
+    def sub_path(self, key):
+        return None if self.path is None else self.path + (key,)
+
+    def set_field(self, name, value):
+        setattr(self.data_obj, name, value)
+        if self.path is not None:
+            self.field_edited.emit(self.path, name, value)
+
+    def forward(self, editor):
+        """Relaie les modifications d'un sous-éditeur (AutoForm ou ListEditor)."""
+        editor.field_edited.connect(self.field_edited.emit)
+        editor.item_added.connect(self.item_added.emit)
+        editor.item_removed.connect(self.item_removed.emit)
+        return editor
+
     def setup_ui(self):
         while self.layout.count():
             item = self.layout.takeAt(0)
@@ -45,10 +69,10 @@ class AutoForm(QWidget):
                 current_value = getattr(self.data_obj, field_name)
                 if current_value is None:
                     current_value = []
-                    setattr(self.data_obj, field_name, current_value)
+                    self.set_field(field_name, current_value)
                 
                 item_type = get_args(f.type)[0]
-                editor = ListEditor(current_value, item_type)
+                editor = self.forward(ListEditor(current_value, item_type, path=self.sub_path(field_name)))
                 
                 editor.data_changed.connect(self.content_changed.emit)
 
@@ -88,17 +112,17 @@ class AutoForm(QWidget):
                     cont_ly.addWidget(dynamic_area)
 
                     if current_value:
-                        dynamic_ly.addWidget(AutoForm(current_value))
+                        dynamic_ly.addWidget(self.forward(AutoForm(current_value, path=self.sub_path(field_name))))
 
-                    def on_poly_change(index, obj=self.data_obj, name=field_name, 
+                    def on_poly_change(index, name=field_name, 
                                     types=possible_types, area=dynamic_ly):
                         new_cls = types[index]
                         new_inst = create_default_instance(new_cls)
-                        setattr(obj, name, new_inst)
+                        self.set_field(name, new_inst)
                         while area.count():
                             child = area.takeAt(0)
                             if child.widget(): child.widget().deleteLater()
-                        area.addWidget(AutoForm(new_inst))
+                        area.addWidget(self.forward(AutoForm(new_inst, path=self.sub_path(name))))
 
                     combo.currentIndexChanged.connect(on_poly_change)
                     self.layout.addRow(f"{field_label} (Type)", container)
@@ -112,8 +136,8 @@ class AutoForm(QWidget):
                 widget = QCheckBox()
                 widget.setChecked(bool(current_value))
                 widget.stateChanged.connect(
-                    lambda state, obj=self.data_obj, name=field_name: 
-                    setattr(obj, name, bool(state))
+                    lambda state, name=field_name: 
+                    self.set_field(name, bool(state))
                 )
                 self.layout.addRow(field_label, widget)
 
@@ -132,8 +156,8 @@ class AutoForm(QWidget):
                 
                 widget.setValue(val)
                 widget.valueChanged.connect(
-                    lambda val, obj=self.data_obj, name=field_name: 
-                    setattr(obj, name, val)
+                    lambda val, name=field_name: 
+                    self.set_field(name, val)
                 )
                 self.layout.addRow(field_label, widget)
 
@@ -141,8 +165,8 @@ class AutoForm(QWidget):
             elif field_type is str:
                 widget = QLineEdit(str(current_value) if current_value is not None else "")
                 widget.textChanged.connect(
-                    lambda text, obj=self.data_obj, name=field_name: 
-                    setattr(obj, name, text)
+                    lambda text, name=field_name: 
+                    self.set_field(name, text)
                 )
                 self.layout.addRow(field_label, widget)
 
@@ -154,8 +178,8 @@ class AutoForm(QWidget):
                 if current_value in options:
                     widget.setCurrentText(current_value)
                 widget.currentTextChanged.connect(
-                    lambda text, obj=self.data_obj, name=field_name:
-                    setattr(obj, name, text)
+                    lambda text, name=field_name:
+                    self.set_field(name, text)
                 )
                 self.layout.addRow(field_label, widget)
 
@@ -163,7 +187,7 @@ class AutoForm(QWidget):
             elif is_dataclass(field_type):
                 if current_value is None:
                     current_value = create_default_instance(field_type)
-                    setattr(self.data_obj, field_name, current_value)
+                    self.set_field(field_name, current_value)
                 
                 if current_value is None:
                     self.layout.addRow(field_label, QLabel("Erreur: Impossible de créer l'objet"))
@@ -172,6 +196,6 @@ class AutoForm(QWidget):
                 gb = QGroupBox(field_label)
                 gb.setStyleSheet("QGroupBox { font-weight: bold; border: 1px solid #ccc; margin-top: 10px; }::title { subcontrol-origin: margin; left: 10px; }")
                 gb_ly = QVBoxLayout(gb)
-                sub_form = AutoForm(current_value)
+                sub_form = self.forward(AutoForm(current_value, path=self.sub_path(field_name)))
                 gb_ly.addWidget(sub_form)
                 self.layout.addRow(gb)
\ No newline at end of file
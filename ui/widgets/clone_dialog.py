@@ -0,0 +1,54 @@
+from PySide6.QtWidgets import (
+    QDialog, QFormLayout, QSpinBox, QDoubleSpinBox, QLineEdit, QHBoxLayout, QDialogButtonBox,
+)
+
+class CloneDialog(QDialog):
+    """Paramètres de duplication d'un nœud (nombre, nom, décalage, adresses IP)."""
+
+    def __init__(self, template_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Dupliquer {template_name}")
+        self.layout = QFormLayout(self)
+
+        self.count = QSpinBox()
+        self.count.setRange(1, 100000)
+        self.count.setValue(10)
+        self.layout.addRow("Nombre de copies", self.count)
+
+        self.name_pattern = QLineEdit("{name}_{i}")
+        self.name_pattern.setToolTip("{name} = nom du modèle, {i} = numéro de la copie")
+        self.layout.addRow("Nom", self.name_pattern)
+
+        offset_ly = QHBoxLayout()
+        self.offsets = []
+        for _ in range(3):
+            spin = QDoubleSpinBox()
+            spin.setDecimals(3)
+            spin.setRange(-1e6, 1e6)
+            offset_ly.addWidget(spin)
+            self.offsets.append(spin)
+        self.layout.addRow("Décalage X / Y / Z", offset_ly)
+
+        self.ip_step = QSpinBox()
+        self.ip_step.setRange(0, 65535)
+        self.ip_step.setToolTip(
+            "Incrément cumulé, pour chaque copie, des adresses de destination et distantes "
+            "des applications. Les nœuds n'ont pas d'adresse propre dans le modèle : "
+            "leur adressage (attribué par la couche réseau) ne change pas."
+        )
+        self.layout.addRow("Incrément IP (applications)", self.ip_step)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        self.layout.addRow(buttons)
+
+    def options(self):
+        """Arguments pour `backend.clone.clone_node`."""
+        offset = [spin.value() for spin in self.offsets]
+        return {
+            "count": self.count.value(),
+            "name_pattern": self.name_pattern.text() or "{name}_{i}",
+            "position_offset": offset if any(offset) else None,
+            "ip_step": self.ip_step.value(),
+        }
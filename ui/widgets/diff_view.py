@@ -0,0 +1,57 @@
+from dataclasses import is_dataclass
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem
+from PySide6.QtGui import QColor
+
+from backend.diff import format_path
+
+KIND_COLORS = {
+    "added": "#2e7d32",
+    "removed": "#c62828",
+    "modified": "#1565c0",
+    "conflict": "#ef6c00",
+}
+
+def short_repr(value, limit=80):
+    """Résumé lisible d'une valeur (les objets sont affichés par leur type et leur nom)."""
+    if value is None:
+        return "—"
+    if is_dataclass(value):
+        name = getattr(value, "name", None)
+        return f"{type(value).__name__}({name})" if name else type(value).__name__
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+class DiffView(QWidget):
+    """Liste des changements (diff) ou des conflits (fusion à trois)."""
+
+    def __init__(self, changes=None, conflicts=None, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        self.tree = QTreeWidget()
+        self.tree.setAlternatingRowColors(True)
+        self.tree.setRootIsDecorated(False)
+
+        if conflicts is not None:
+            self.tree.setHeaderLabels(["Chemin", "Base", "Local (conservé)", "Autre"])
+            for c in conflicts:
+                self._add_row(format_path(c.path), "conflict",
+                              [short_repr(c.base), short_repr(c.ours), short_repr(c.theirs)])
+            summary = f"{len(conflicts)} conflit(s)"
+        else:
+            changes = changes or []
+            self.tree.setHeaderLabels(["Chemin", "Type", "Avant", "Après"])
+            for c in changes:
+                self._add_row(format_path(c.path), c.kind, [c.kind, short_repr(c.old), short_repr(c.new)])
+            summary = f"{len(changes)} changement(s)"
+
+        self.layout.addWidget(QLabel(summary))
+        self.layout.addWidget(self.tree)
+        self.tree.resizeColumnToContents(0)
+
+    def _add_row(self, path_str, kind, columns):
+        item = QTreeWidgetItem(self.tree, [path_str] + columns)
+        item.setForeground(0, QColor(KIND_COLORS[kind]))
+        return item
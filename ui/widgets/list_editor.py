@@ -1,17 +1,26 @@
 from dataclasses import is_dataclass
-from PySide6.QtWidgets import *
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox, QLineEdit,
+    QSpinBox, QDoubleSpinBox,
+)
 from PySide6.QtCore import Signal
 
+from backend.serializer import resolve
 from ui.utils import create_default_instance
 
 class ListEditor(QWidget):
     # Signal émis quand la liste change (ajout/suppression/modif primitive)
     data_changed = Signal() 
+    # Modifications unitaires pour le journal (voir AutoForm)
+    field_edited = Signal(object, object, object)
+    item_added = Signal(object, int, object)
+    item_removed = Signal(object, int)
 
-    def __init__(self, data_list: list, item_type, parent=None):
+    def __init__(self, data_list: list, item_type, parent=None, path=None):
         super().__init__(parent)
         self.data_list = data_list
         self.item_type = item_type
+        self.path = path   # chemin de la liste dans le scénario (None = non journalisé)
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -52,7 +61,10 @@ class ListEditor(QWidget):
                 gb.setStyleSheet("QGroupBox { font-weight: bold; color: #333; margin-top: 5px; border: 1px solid #bbb; }")
                 gb_ly = QVBoxLayout(gb)
                 
-                form = AutoForm(item)
+                form = AutoForm(resolve(item), path=None if self.path is None else self.path + (i,))
+                form.field_edited.connect(self.field_edited.emit)
+                form.item_added.connect(self.item_added.emit)
+                form.item_removed.connect(self.item_removed.emit)
                 gb_ly.addWidget(form)
                 
                 container = QWidget()
@@ -102,14 +114,20 @@ class ListEditor(QWidget):
         if new_obj is not None:
             self.data_list.append(new_obj)
             self.refresh_list()
+            if self.path is not None:
+                self.item_added.emit(self.path, len(self.data_list) - 1, new_obj)
             self.data_changed.emit()
 
     def remove_item(self, index):
         if 0 <= index < len(self.data_list):
             self.data_list.pop(index)
             self.refresh_list()
+            if self.path is not None:
+                self.item_removed.emit(self.path, index)
             self.data_changed.emit()
 
     def update_primitive(self, index, value):
         self.data_list[index] = value
+        if self.path is not None:
+            self.field_edited.emit(self.path, index, value)
         self.data_changed.emit()
\ No newline at end of file
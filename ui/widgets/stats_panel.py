@@ -0,0 +1,70 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem
+
+from backend.stats import format_profile
+
+def _number(value, unit=""):
+    return f"{value:,.6g}".replace(",", " ") + (f" {unit}" if unit else "")
+
+class StatsPanel(QWidget):
+    """Profil statistique du scénario (mis à jour après chaque analyse en arrière-plan)."""
+
+    def __init__(self, profile=None, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        self.summary = QLabel("Calcul en cours...")
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Mesure", "Valeur"])
+        self.tree.setAlternatingRowColors(True)
+
+        self.layout.addWidget(self.summary)
+        self.layout.addWidget(self.tree)
+        if profile is not None:
+            self.set_profile(profile)
+
+    def set_profile(self, profile):
+        self.tree.clear()
+        self.summary.setText(f"{profile.nodes} nœud(s), {profile.waypoints} point(s) de passage")
+        # Infobulle : version texte copiable (rapport avant soumission)
+        self.tree.setToolTip(format_profile(profile))
+
+        nodes = self._row(None, "Nœuds", profile.nodes)
+        for section, kinds in profile.counts.items():
+            item = self._row(nodes, section, sum(kinds.values()))
+            for kind, n in kinds.items():
+                if n:
+                    self._row(item, kind, n)
+
+        self._row(None, "Points de passage", profile.waypoints)
+        if profile.bbox is not None:
+            bbox = self._row(None, "Boîte englobante", "")
+            x0, y0, z0, x1, y1, z1 = profile.bbox
+            for axis, low, high in (("x", x0, x1), ("y", y0, y1), ("z", z0, z1)):
+                self._row(bbox, axis, f"{low:g} … {high:g} ({high - low:g} m)")
+
+        traffic = self._row(None, "Charge applicative", _number(profile.traffic * 8 / 1e6, "Mbit/s"))
+        self._row(traffic, "Applications", profile.applications)
+        self._row(traffic, "Octets/s", _number(profile.traffic))
+
+        power = self._row(None, "Puissance des périphériques", _number(profile.power, "W"))
+        self._row(power, "Périphériques", profile.peripherals)
+
+        if profile.regions:
+            buildings = self._row(None, "Densité de bâtiments", "")
+            for region in profile.regions:
+                item = self._row(buildings, region.label, _number(region.density_km2, "/km²"))
+                self._row(item, "Surface", _number(region.area_km2, "km²"))
+                self._row(item, "Bâtiments", region.buildings)
+                self._row(item, "Emprise au sol", f"{region.coverage:.1%}")
+
+        self.tree.expandAll()
+        self.tree.resizeColumnToContents(0)
+
+    def _row(self, parent, label, value):
+        item = QTreeWidgetItem([str(label), str(value)])
+        if parent is None:
+            self.tree.addTopLevelItem(item)
+        else:
+            parent.addChild(item)
+        return item
@@ -0,0 +1,148 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView, QAbstractItemView,
+    QHeaderView, QApplication, QMessageBox,
+)
+from PySide6.QtGui import QKeySequence, QShortcut, QColor
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+
+from backend.table import derive_columns, bulk_assign, fill_down, parse_csv_block
+
+class NodeTableModel(QAbstractTableModel):
+    """
+    Modèle Qt sur une liste de nœuds. Les valeurs sont lues à l'affichage
+    (seules les lignes visibles sont interrogées par la vue).
+    """
+    # Lignes modifiées, True si la colonne "name" est concernée
+    bulk_edited = Signal(list, bool)
+    # Affectations appliquées : [(ligne, chemin de la colonne, valeur)]
+    cells_edited = Signal(list)
+
+    def __init__(self, nodes, node_cls, parent=None):
+        super().__init__(parent)
+        self.nodes = nodes
+        self.columns = derive_columns(node_cls, nodes)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.nodes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section].label
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = self.nodes[index.row()]
+        column = self.columns[index.column()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            # Texte aussi en édition : le délégué par défaut ouvrirait sinon un
+            # QDoubleSpinBox à 2 décimales qui arrondit la valeur (0.0005 -> 0.0) ;
+            # `setData` reconvertit la saisie via `Column.coerce`
+            value = column.get(node)
+            return "" if value is None else str(value)
+        if role == Qt.BackgroundRole and not column.applies(node):
+            return QColor("#eeeeee")
+        return None
+
+    def flags(self, index):
+        base = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.isValid() and self.columns[index.column()].applies(self.nodes[index.row()]):
+            return base | Qt.ItemIsEditable
+        return base
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        column = self.columns[index.column()]
+        try:
+            value = column.coerce(value)
+        except ValueError:
+            return False
+        return bool(self.apply_bulk([(index.row(), index.column(), value)]))
+
+    def apply_bulk(self, assignments):
+        """Applique un lot d'affectations en une passe et notifie la vue une seule fois."""
+        assignments = list(assignments)
+        if not assignments:
+            return []
+        changed = bulk_assign(self.nodes, self.columns, assignments)
+        if changed:
+            cols = [col for _, col, _ in assignments]
+            self.dataChanged.emit(
+                self.index(changed[0], min(cols)),
+                self.index(changed[-1], max(cols)),
+            )
+            names_changed = any(self.columns[col].path == ("name",) for col in cols)
+            self.bulk_edited.emit(changed, names_changed)
+            rows = set(changed)
+            self.cells_edited.emit([
+                (row, self.columns[col].path, value) for row, col, value in assignments if row in rows
+            ])
+        return changed
+
+class TableEditor(QWidget):
+    """Tableau d'édition en masse : sélection multiple, recopie vers le bas, collage CSV."""
+
+    def __init__(self, nodes, node_cls, parent=None):
+        super().__init__(parent)
+        self.model = NodeTableModel(nodes, node_cls, self)
+        self.bulk_edited = self.model.bulk_edited
+        self.cells_edited = self.model.cells_edited
+
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        h_layout = QHBoxLayout()
+        h_layout.addWidget(QLabel(f"Éléments: {len(nodes)}"))
+        btn_fill = QPushButton("Recopier vers le bas (Ctrl+D)")
+        btn_fill.clicked.connect(self.fill_down)
+        btn_paste = QPushButton("Coller CSV (Ctrl+V)")
+        btn_paste.clicked.connect(self.paste_csv)
+        h_layout.addStretch()
+        h_layout.addWidget(btn_fill)
+        h_layout.addWidget(btn_paste)
+        self.layout.addLayout(h_layout)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.view.setAlternatingRowColors(True)
+        # Hauteur de ligne fixe : la vue n'a pas à mesurer les 10k lignes pour défiler
+        v_header = self.view.verticalHeader()
+        v_header.setSectionResizeMode(QHeaderView.Fixed)
+        v_header.setDefaultSectionSize(22)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.view.setMinimumHeight(500)
+        self.layout.addWidget(self.view)
+
+        QShortcut(QKeySequence("Ctrl+D"), self.view, activated=self.fill_down)
+        QShortcut(QKeySequence.Paste, self.view, activated=self.paste_csv)
+
+    def selected_cells(self):
+        return [(idx.row(), idx.column()) for idx in self.view.selectionModel().selectedIndexes()]
+
+    def fill_down(self):
+        cells = self.selected_cells()
+        if cells:
+            self.model.apply_bulk(fill_down(self.model.nodes, self.model.columns, cells))
+
+    def paste_csv(self):
+        text = QApplication.clipboard().text()
+        current = self.view.currentIndex()
+        if not text or not current.isValid():
+            return
+        try:
+            assignments = parse_csv_block(
+                text, self.model.columns, current.row(), current.column(), len(self.model.nodes),
+            )
+        except ValueError as e:
+            QMessageBox.critical(self, "Erreur", f"Collage impossible:\n{e}")
+            return
+        self.model.apply_bulk(assignments)
@@ -0,0 +1,39 @@
+# ui/workers.py
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
+
+class WorkerSignals(QObject):
+    finished = Signal(object)   # résultat de la fonction
+    failed = Signal(str)        # message d'erreur
+
+class Worker(QRunnable):
+    """
+    Exécute `fn(*args, **kwargs)` dans le pool de threads Qt. Le résultat (ou
+    l'erreur) est renvoyé au thread graphique par les signaux.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+def run_in_background(fn, *args, on_finished=None, on_failed=None, **kwargs) -> Worker:
+    """Lance `fn` en arrière-plan ; les callbacks sont appelés dans le thread graphique."""
+    worker = Worker(fn, *args, **kwargs)
+    # Connexion en file d'attente : les callbacks (même des lambdas) s'exécutent
+    # dans le thread qui a créé le worker, pas dans le thread du pool
+    if on_finished is not None:
+        worker.signals.finished.connect(on_finished, Qt.QueuedConnection)
+    if on_failed is not None:
+        worker.signals.failed.connect(on_failed, Qt.QueuedConnection)
+    QThreadPool.globalInstance().start(worker)
+    return worker